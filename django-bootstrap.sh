@@ -1,2 +1,2 @@
 django-admin migrate 
-gunicorn --bind 0.0.0.0 nftmarket.wsgi
+gunicorn --bind 0.0.0.0 -k uvicorn.workers.UvicornWorker nftmarket.asgi
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.0/ref/settings/
 import os
 
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from django.utils.translation import gettext_lazy as _
 
 
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.humanize',
+    'django.contrib.postgres',
     'sorl.thumbnail',
     'nftmarket.core'
 ]
@@ -100,6 +102,49 @@ DATABASES = {
     }
 }
 
+CHAIN_RPC_TIMEOUT = float(
+    os.getenv('FOMORIP_CHAIN_RPC_TIMEOUT', default=10))
+CHAIN_RPC_POOL_SIZE = int(
+    os.getenv('FOMORIP_CHAIN_RPC_POOL_SIZE', default=10))
+CHAIN_INDEXER_BLOCK_RANGE = int(
+    os.getenv('FOMORIP_CHAIN_INDEXER_BLOCK_RANGE', default=2000))
+CHAIN_MULTICALL_BATCH_SIZE = int(
+    os.getenv('FOMORIP_CHAIN_MULTICALL_BATCH_SIZE', default=100))
+
+CACHE_URL = os.getenv('DJANGO_CACHE_URL', default='')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+if CACHE_URL:
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_URL,
+    }
+
+# Server push (/push/) uses Redis pub/sub; empty disables it and the
+# browser falls back to polling.
+PUSH_URL = os.getenv('DJANGO_PUSH_URL', default=CACHE_URL)
+PUSH_HEARTBEAT_SECONDS = 20
+
+# Session storage: db, cached_db, cache or signed_cookies. cached_db reads
+# sessions from the cache and can still revoke them on logout; the cache
+# based ones need the shared DJANGO_CACHE_URL, since a per-process cache
+# would log users out whenever a request reaches another worker.
+SESSION_STORAGES = ('db', 'cached_db', 'cache', 'signed_cookies')
+SESSION_STORAGE = os.getenv('DJANGO_SESSION_STORAGE', default='db')
+if SESSION_STORAGE not in SESSION_STORAGES:
+    raise ImproperlyConfigured(
+        f'DJANGO_SESSION_STORAGE must be one of {", ".join(SESSION_STORAGES)}'
+        f', not {SESSION_STORAGE!r}')
+if SESSION_STORAGE in ('cache', 'cached_db') and not CACHE_URL:
+    raise ImproperlyConfigured(
+        f'DJANGO_SESSION_STORAGE={SESSION_STORAGE} requires DJANGO_CACHE_URL')
+SESSION_ENGINE = f'django.contrib.sessions.backends.{SESSION_STORAGE}'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
@@ -174,10 +219,28 @@ LOGOUT_REDIRECT_URL = '/'
 
 DEAL_STATUS_TIMEOUT_MINUTES = 60
 DEAL_COMPLETION_TIMEOUT_MINUTES = 180
+# A deal whose timeout fails is retried after this delay.
+DEAL_EXPIRE_RETRY_MINUTES = 10
 MAX_UPLOAD_SIZE = 2 * 1024 * 1024
+INDEX_FRAGMENT_CACHE_TIMEOUT = 600
+ACCOUNT_SNAPSHOT_TIMEOUT = int(
+    os.getenv('DJANGO_ACCOUNT_SNAPSHOT_TIMEOUT', default=60))
 
 MIN_PRICE = os.getenv('FOMORIP_MIN_PRICE', 1)
 FEE_PERCENT = os.getenv('FOMORIP_FEE_PERCENT', 1)
+NOTIFICATION_RETENTION_DAYS = int(
+    os.getenv('FOMORIP_NOTIFICATION_RETENTION_DAYS', default=180))
+
+SITE_URL = os.getenv('FOMORIP_SITE_URL', default='https://fomo.rip')
+TELEGRAM_BOT_TOKEN = os.getenv('FOMORIP_TELEGRAM_BOT_TOKEN', default='')
+TELEGRAM_API_URL = os.getenv(
+    'FOMORIP_TELEGRAM_API_URL', default='https://api.telegram.org')
+TELEGRAM_MESSAGES_PER_SECOND = 25
+TELEGRAM_CHAT_MESSAGES_PER_SECOND = 1
+TELEGRAM_DELIVERY_BATCH_SIZE = 200
+# Notifications claimed longer ago are treated as lost by a crashed sender.
+TELEGRAM_SENDING_TIMEOUT = int(
+    os.getenv('FOMORIP_TELEGRAM_SENDING_TIMEOUT', default=600))
 
 PROJECT_PATH = Path('.')
 TEMPLATES_PATH = PROJECT_PATH / 'templates'
@@ -190,35 +253,52 @@ TEMPLATES[0]['DIRS'] = [TEMPLATES_PATH]
 STATIC_ROOT = PROJECT_PATH / 'static'
 MEDIA_ROOT = PROJECT_PATH / 'media'
 
+SIGNER_KEY = os.getenv('FOMORIP_SIGNER_KEY')
+
+# Multicall3 is deployed at the same address on every supported chain.
+MULTICALL3_ADDR = '0xcA11bde05977b3631167028862bE2a173976CA11'
+
 NETWORKS = {
     'bnb': {
         'url': 'https://bsc-dataseed.binance.org',
         'chain_id': 56,
         'escrow_addr': os.getenv('FOMORIP_BNB_ESCROW_ADDR'),
+        'multicall_addr': os.getenv(
+            'FOMORIP_BNB_MULTICALL_ADDR', default=MULTICALL3_ADDR),
         'token_name': 'busd',
         'token_addr': '0xe9e7cea3dedca5984780bafc599bd69add087d56',
         'token_decimals': 18,
         'gaz': os.getenv('FOMORIP_BNB_GAZ_LIMIT', default=1000000),
-        'gaz_price': os.getenv('FOMORIP_BNB_GAZ_PRICE', default=10000000000)
+        'gaz_price': os.getenv('FOMORIP_BNB_GAZ_PRICE', default=10000000000),
+        'confirmations': int(
+            os.getenv('FOMORIP_BNB_CONFIRMATIONS', default=15))
     },
     'arbitrum': {
         'url': 'https://arb1.arbitrum.io/rpc',
         'chain_id': 42161,
         'escrow_addr': os.getenv('FOMORIP_ARBITRUM_ESCROW_ADDR'),
+        'multicall_addr': os.getenv(
+            'FOMORIP_ARBITRUM_MULTICALL_ADDR', default=MULTICALL3_ADDR),
         'token_name': 'usdc',
         'token_addr': '0xFF970A61A04b1cA14834A43f5dE4533eBDDB5CC8',
         'token_decimals': 6,
         'gaz': os.getenv('FOMORIP_ARBITRUM_GAZ_LIMIT', default=1000000),
-        'gaz_price': os.getenv('FOMORIP_ARBITRUM_GAZ_PRICE', default=100000000)
+        'gaz_price': os.getenv('FOMORIP_ARBITRUM_GAZ_PRICE', default=100000000),
+        'confirmations': int(
+            os.getenv('FOMORIP_ARBITRUM_CONFIRMATIONS', default=20))
     },
     'optimism': {
         'url': 'https://mainnet.optimism.io',
         'chain_id': 10,
         'escrow_addr': os.getenv('FOMORIP_OPTIMIZM_ESCROW_ADDR'),
+        'multicall_addr': os.getenv(
+            'FOMORIP_OPTIMIZM_MULTICALL_ADDR', default=MULTICALL3_ADDR),
         'token_name': 'usdc',
         'token_addr': '0x7f5c764cbc14f9669b88837ca1490cca17c31607',
         'token_decimals': 6,
         'gaz': os.getenv('FOMORIP_OPTIMIZM_GAZ_LIMIT', default=2000000),
-        'gaz_price': os.getenv('FOMORIP_OPTIMIZM_GAZ_PRICE', default=1000000)
+        'gaz_price': os.getenv('FOMORIP_OPTIMIZM_GAZ_PRICE', default=1000000),
+        'confirmations': int(
+            os.getenv('FOMORIP_OPTIMIZM_CONFIRMATIONS', default=20))
     }
 }
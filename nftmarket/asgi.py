@@ -0,0 +1,15 @@
+"""
+ASGI config for nftmarket project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+The push stream (``/push/``) needs it; everything else works the same under
+WSGI.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nftmarket.app.settings')
+
+application = get_asgi_application()
@@ -1,9 +1,57 @@
 import json
+from dataclasses import dataclass
+from functools import lru_cache
+
 from django.conf import settings
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector
 
 
-def get_escrow_abi():
-    json_path = settings.BASE_DIR / 'abijson' / 'EscrowContract.json'
+@dataclass(frozen=True)
+class AbiFunction:
+    selector: bytes
+    input_types: tuple
+    output_types: tuple
+
+    def encode_call(self, *args):
+        return self.selector + encode(self.input_types, args)
+
+    def decode_output(self, data):
+        return decode(self.output_types, data)
+
+
+@lru_cache(maxsize=None)
+def load_abi(contract_name):
+    # Parsed once per process; callers must not modify the result.
+    json_path = settings.BASE_DIR / 'abijson' / f'{contract_name}.json'
     with open(json_path) as json_fobj:
         info = json.load(json_fobj)
         return info.get('abi')
+
+
+def get_escrow_abi():
+    return load_abi('EscrowContract')
+
+
+def get_multicall_abi():
+    return load_abi('Multicall3')
+
+
+def abi_type(abi_item):
+    abi_item_type = abi_item['type']
+    if not abi_item_type.startswith('tuple'):
+        return abi_item_type
+    components = ','.join(map(abi_type, abi_item['components']))
+    return f"({components}){abi_item_type[len('tuple'):]}"
+
+
+@lru_cache(maxsize=None)
+def get_escrow_function(name):
+    function_abi = next(
+        abi_item for abi_item in get_escrow_abi()
+        if abi_item['type'] == 'function' and abi_item['name'] == name)
+    input_types = tuple(map(abi_type, function_abi['inputs']))
+    output_types = tuple(map(abi_type, function_abi['outputs']))
+    selector = function_signature_to_4byte_selector(
+        f"{name}({','.join(input_types)})")
+    return AbiFunction(selector, input_types, output_types)
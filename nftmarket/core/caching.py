@@ -0,0 +1,35 @@
+import time
+
+from django.core.cache import cache
+
+
+def get_generations(keys):
+    generations = cache.get_many(keys)
+    missing = {
+        key: time.time_ns() for key in keys if key not in generations
+    }
+    if missing:
+        for key, generation in missing.items():
+            cache.add(key, generation, timeout=None)
+        generations.update(cache.get_many(list(missing)))
+    return generations
+
+
+def get_generation(key):
+    return get_generations([key])[key]
+
+
+def bump_generation(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def index_fragment_key(kind, token_type):
+    return f'index:{kind}:{token_type}'
+
+
+def invalidate_index_fragments(kind, token_types):
+    for token_type in set(token_types):
+        bump_generation(index_fragment_key(kind, token_type))
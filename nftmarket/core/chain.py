@@ -1,7 +1,18 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
 from web3 import Web3
-from eth_account.messages import encode_structured_data
 from dataclasses import dataclass
 from django.conf import settings
+from nftmarket.core.abi import (
+    get_escrow_abi, get_escrow_function, get_multicall_abi)
+
+
+# Web3 clients and contracts shared by the whole process, per network.
+_chains = {}
+_escrow_contracts = {}
+_multicall_contracts = {}
+_registry_lock = threading.Lock()
 
 
 @dataclass
@@ -31,75 +42,92 @@ def is_valid_address(addr: str) -> bool:
 
 
 def recover_message(network: str, message: str, signature: str) -> str:
-    chain_settings = settings.NETWORKS[network]
-    w3_chain = Web3(Web3.HTTPProvider(chain_settings['url']))
+    w3_chain = get_chain(network)
     return w3_chain.eth.account.recover_message(
         message, signature=signature)
 
 
-def make_deal_tx_message(deal: type) -> dict:
-    offer = deal.offer
-    chain_settings = settings.NETWORKS[offer.network]
-    token_decimals = chain_settings['token_decimals']
-    deal_tx_message = {
-        'domain': {
-            'chainId': chain_settings['chain_id'],
-            'name': 'Deal',
-            'verifyingContract': chain_settings['escrow_addr'],
-            'version': '1',
-        },
-        'message': {
-             'seller': offer.seller.wallet,
-             'buyer': offer.buyer.wallet,
-             'price': int(offer.price * pow(10, token_decimals)),
-             'fee': int(deal.fee * pow(10, token_decimals)),
-             'collateral': int(offer.collateral * pow(10, token_decimals)),
-             'timestamp': deal.start_timestamp()
-        },
-        'primaryType': 'Deal',
-        'types': {
-            'EIP712Domain': [
-                {'name': 'name', 'type': 'string'},
-                {'name': 'version', 'type': 'string'},
-                {'name': 'chainId', 'type': 'uint256'},
-                {'name': 'verifyingContract', 'type': 'address'},
-            ],
-            'Deal': [
-                {'name': 'seller', 'type': 'address'},
-                {'name': 'buyer', 'type': 'address'},
-                {'name': 'price', 'type': 'uint256'},
-                {'name': 'fee', 'type': 'uint256'},
-                {'name': 'collateral', 'type': 'uint256'},
-                {'name': 'timestamp', 'type': 'uint256'}
-            ]
-        }
-    }
-    return deal_tx_message
-
-
-def sign_deal(deal: type) -> dict:
-    tx_message = make_deal_tx_message(deal)
-    encoded_message = encode_structured_data(tx_message)
-    chain_settings = settings.NETWORKS[deal.offer.network]
-    w3_chain = Web3(Web3.HTTPProvider(chain_settings['url']))
-    signed_tx_message = w3_chain.eth.account.sign_message(
-        encoded_message, settings.SIGNER_KEY)
-    hash_id = signed_tx_message.messageHash.hex()
-    deal.hash_id = hash_id
-    deal.save()
-    deal_obj = tx_message['message']
-    deal_obj['signature'] = signed_tx_message.signature.hex()
-    deal_obj['price'] = str(deal_obj['price'])
-    deal_obj['collateral'] = str(deal_obj['collateral'])
-    deal_obj['fee'] = str(deal_obj['fee'])
-    return deal_obj
-
-
-def get_contract_deal(deal: type) -> type:
-    escrow_abi = get_escrow_abi()
-    chain_settings = settings.NETWORKS[deal.offer.network]
-    w3_chain = Web3(Web3.HTTPProvider(chain_settings['url']))
-    contract = w3_chain.eth.contract(
-        address=chain_settings['escrow_addr'],  abi=escrow_abi)
-    deal_data = contract.functions.getDeal(deal.hash_id).call()
+def _get_registered(registry: dict, network: str, factory) -> type:
+    registered = registry.get(network)
+    if registered is None:
+        with _registry_lock:
+            registered = registry.get(network)
+            if registered is None:
+                registered = registry[network] = factory(network)
+    return registered
+
+
+def make_chain(network: str) -> Web3:
+    chain_settings = settings.NETWORKS[network]
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=settings.CHAIN_RPC_POOL_SIZE)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return Web3(Web3.HTTPProvider(
+        chain_settings['url'],
+        request_kwargs={'timeout': settings.CHAIN_RPC_TIMEOUT},
+        session=session))
+
+
+def get_chain(network: str) -> Web3:
+    """
+    Returns the Web3 client of the network, created once per process. Its
+    HTTP session keeps connections alive, so calls skip the TLS handshake.
+    """
+    return _get_registered(_chains, network, make_chain)
+
+
+def get_network_escrow_contract(network: str) -> type:
+    return _get_registered(
+        _escrow_contracts, network,
+        lambda network: get_escrow_contract(
+            get_chain(network), settings.NETWORKS[network]['escrow_addr']))
+
+
+def get_network_multicall_contract(network: str) -> type:
+    return _get_registered(
+        _multicall_contracts, network,
+        lambda network: get_multicall_contract(
+            get_chain(network),
+            settings.NETWORKS[network]['multicall_addr']))
+
+
+def get_escrow_contract(w3_chain: Web3, escrow_addr: str) -> type:
+    return w3_chain.eth.contract(
+        address=Web3.to_checksum_address(escrow_addr), abi=get_escrow_abi())
+
+
+def fetch_contract_deal(contract: type, hash_id: str) -> DealClass:
+    deal_data = contract.functions.getDeal(hash_id).call()
     return DealClass(*deal_data)
+
+
+def get_multicall_contract(w3_chain: Web3, multicall_addr: str) -> type:
+    return w3_chain.eth.contract(
+        address=Web3.to_checksum_address(multicall_addr),
+        abi=get_multicall_abi())
+
+
+def fetch_contract_deals(
+        contract: type, multicall: type, hash_ids: list,
+        batch_size: int) -> dict:
+    """
+    Reads getDeal for many deals at once, one Multicall3 aggregate3 call
+    per batch. Hashes whose call reverted are left out of the result.
+    """
+    get_deal = get_escrow_function('getDeal')
+    contract_deals = {}
+    for start in range(0, len(hash_ids), batch_size):
+        batch = hash_ids[start:start + batch_size]
+        calls = [
+            (contract.address, True,
+             get_deal.encode_call(Web3.to_bytes(hexstr=hash_id)))
+            for hash_id in batch
+        ]
+        results = multicall.functions.aggregate3(calls).call()
+        for hash_id, (success, return_data) in zip(batch, results):
+            if success:
+                deal_data, = get_deal.decode_output(return_data)
+                contract_deals[hash_id] = DealClass(*deal_data)
+    return contract_deals
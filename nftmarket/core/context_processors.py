@@ -8,7 +8,7 @@ def settings(request):
 def auth(request):
     auth = dict(account=None, is_authenticated=False)
     account = request.account
-    if account is not None:
+    if account:
         auth = dict(account=account, is_authenticated=True)
     return dict(auth=auth)
 
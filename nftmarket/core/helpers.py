@@ -2,12 +2,30 @@ from functools import wraps
 
 from django.contrib import messages
 from django.shortcuts import redirect
+from django.utils.translation import gettext as _
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def has_account(request):
+    # Evaluates the lazy account, so a deleted account is never accepted.
+    return bool(getattr(request, 'account', None))
+
+
+def is_account_active(request):
+    # Writes always check the stored flag; the session snapshot only saves
+    # the query on reads.
+    snapshot = request.account_snapshot
+    if snapshot is not None and request.method in SAFE_METHODS:
+        return snapshot['is_active']
+    return request.account.is_active
 
 
 def account_required(view_func):
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        if not hasattr(request, 'account') or request.account is None:
+        if not has_account(request):
             return redirect('core:index_page')
         return view_func(request, *args, **kwargs)
     return wrapper
@@ -16,9 +34,9 @@ def account_required(view_func):
 def active_account_required(view_func):
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        if not hasattr(request, 'account') or request.account is None:
+        if not has_account(request):
             return redirect('core:index_page')
-        if not request.account.is_active:
+        if not is_account_active(request):
             messages.error(request, _('Your account was blocked'))
             return redirect('core:index_view')
         return view_func(request, *args, **kwargs)
@@ -0,0 +1,129 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from web3 import Web3
+
+from nftmarket.core.abi import get_escrow_abi
+from nftmarket.core.chain import (
+    get_chain, get_escrow_contract, get_multicall_contract,
+    get_network_escrow_contract, get_network_multicall_contract)
+from nftmarket.core.models import ChainCursor
+from nftmarket.core.reconcile import (
+    confirm_pending_deals, fetch_pending_contract_deals, pending_hash_ids)
+
+
+logger = logging.getLogger(__name__)
+
+ESCROW_DEPOSIT_EVENTS = ('BuyerDeposited', 'SellerDeposited')
+
+
+def event_topic(event_abi):
+    input_types = ','.join(item['type'] for item in event_abi['inputs'])
+    signature = f"{event_abi['name']}({input_types})"
+    return Web3.to_hex(Web3.keccak(text=signature))
+
+
+def escrow_deposit_topics():
+    return [
+        event_topic(item) for item in get_escrow_abi()
+        if item['type'] == 'event' and item['name'] in ESCROW_DEPOSIT_EVENTS
+    ]
+
+
+def deposit_hash_ids(logs):
+    # Both events carry the deal hash as their first indexed argument.
+    return sorted({Web3.to_hex(log['topics'][1]) for log in logs})
+
+
+class EscrowIndexer:
+    """
+    Follows the escrow contract logs of one network from a stored block
+    cursor and confirms the deposits of the deals they refer to. Only
+    blocks at least `confirmations` deep are read, so a short reorg never
+    reaches the deals. A local chain can be used by passing its Web3
+    instance and the address of a deployed escrow contract; without a
+    multicall address the deals are then read one getDeal call at a time.
+    """
+    def __init__(
+            self, network, w3_chain=None, escrow_addr=None,
+            multicall_addr=None, block_range=None, confirmations=None):
+        chain_settings = settings.NETWORKS[network]
+        self.network = network
+        self.w3_chain = w3_chain or get_chain(network)
+        if escrow_addr:
+            self.contract = get_escrow_contract(self.w3_chain, escrow_addr)
+            self.multicall = get_multicall_contract(
+                self.w3_chain, multicall_addr) if multicall_addr else None
+        else:
+            self.contract = get_network_escrow_contract(network)
+            self.multicall = get_network_multicall_contract(network)
+        self.block_range = block_range or settings.CHAIN_INDEXER_BLOCK_RANGE
+        self.confirmations = chain_settings['confirmations']\
+            if confirmations is None else confirmations
+        self.topics = escrow_deposit_topics()
+
+    def safe_head(self):
+        return self.w3_chain.eth.block_number - self.confirmations
+
+    def fetch_contract_deals(self, hash_ids):
+        return fetch_pending_contract_deals(
+            self.contract, self.multicall, hash_ids)
+
+    def confirm_deals(self, hash_ids, contract_deals):
+        result = confirm_pending_deals(self.network, hash_ids, contract_deals)
+        for deal, reason in result.mismatches:
+            logger.warning(
+                '%s: deal %s (%s, %s): %s', self.network, deal.pk,
+                deal.status, deal.hash_id, reason)
+        return result
+
+    def start(self, start_block):
+        """
+        Creates the cursor of a network indexed for the first time. The
+        deposits made before `start_block` never show up in the indexed
+        logs, so every deal waiting for a deposit is checked once here.
+        """
+        hash_ids = pending_hash_ids(self.network)
+        contract_deals = self.fetch_contract_deals(hash_ids)
+        with transaction.atomic():
+            cursor, created = ChainCursor.objects.lock(
+                self.network, start_block)
+            if created:
+                self.confirm_deals(hash_ids, contract_deals)
+        return cursor
+
+    def index_next_range(self, from_block=None):
+        """
+        Indexes the next range of blocks and returns how many were read.
+        `from_block` only applies to a network without a cursor; by default
+        such a network starts at the current safe head. The logs and the
+        deals are read from the chain before any row is locked.
+        """
+        safe_head = self.safe_head()
+        cursor = ChainCursor.objects.filter(network=self.network).first()
+        if cursor is None:
+            cursor = self.start(
+                safe_head if from_block is None else from_block - 1)
+        first_block = cursor.block_number + 1
+        if first_block > safe_head:
+            return 0
+        last_block = min(safe_head, first_block + self.block_range - 1)
+        logs = self.w3_chain.eth.get_logs({
+            'address': self.contract.address,
+            'fromBlock': first_block,
+            'toBlock': last_block,
+            'topics': [self.topics],
+        })
+        hash_ids = deposit_hash_ids(logs)
+        contract_deals = self.fetch_contract_deals(hash_ids)
+        with transaction.atomic():
+            cursor, _ = ChainCursor.objects.lock(
+                self.network, cursor.block_number)
+            if cursor.block_number != first_block - 1:
+                # Another indexer has moved the cursor in the meantime.
+                return 0
+            self.confirm_deals(hash_ids, contract_deals)
+            cursor.block_number = last_block
+            cursor.save(update_fields=['block_number', 'updated_at'])
+        return last_block - first_block + 1
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from nftmarket.core.models import MODERATION_BATCH_SIZE, Offer, WTBRequest
+
+
+class Command(BaseCommand):
+    help = 'Activate offers and WTB offers whose moderation delay has passed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=MODERATION_BATCH_SIZE)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running and wake up when the next listing is due')
+        parser.add_argument(
+            '--max-sleep', type=float, default=60.0,
+            help='Upper bound for a sleep, so new listings are picked up')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total = 0
+        while True:
+            count = Offer.objects.activate_from_moderation(batch_size)\
+                + WTBRequest.objects.activate_from_moderation(batch_size)
+            total += count
+            if count:
+                self.stdout.write(f'{total} listings activated')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(self.seconds_to_next_due(options['max_sleep']))
+        self.stdout.write(self.style.SUCCESS(
+            f'Activated {total} listings'))
+
+    def seconds_to_next_due(self, max_sleep):
+        due_times = [
+            due for due in (
+                Offer.objects.next_moderation_due(),
+                WTBRequest.objects.next_moderation_due())
+            if due is not None
+        ]
+        if not due_times:
+            return max_sleep
+        seconds = (min(due_times) - timezone.now()).total_seconds()
+        return min(max(seconds, 0.1), max_sleep)
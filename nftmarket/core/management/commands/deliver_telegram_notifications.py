@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from nftmarket.core.telegram import TelegramClient, deliver_notifications
+
+
+class Command(BaseCommand):
+    help = 'Deliver new notifications to linked Telegram chats'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.TELEGRAM_DELIVERY_BATCH_SIZE)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for new notifications')
+        parser.add_argument('--interval', type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        if not settings.TELEGRAM_BOT_TOKEN:
+            raise CommandError('FOMORIP_TELEGRAM_BOT_TOKEN is not set')
+        client = TelegramClient()
+        total = 0
+        while True:
+            count = deliver_notifications(client, options['batch_size'])
+            total += count
+            if count:
+                self.stdout.write(f'{total} notifications delivered')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Delivered {total} notifications'))
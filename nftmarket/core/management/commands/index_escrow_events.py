@@ -0,0 +1,37 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from nftmarket.core.indexer import EscrowIndexer
+
+
+class Command(BaseCommand):
+    help = 'Follow escrow contract events of a network and confirm deposits'
+
+    def add_arguments(self, parser):
+        parser.add_argument('network', choices=list(settings.NETWORKS))
+        parser.add_argument(
+            '--from-block', type=int,
+            help='First block to index when the network has no cursor yet')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running and wait for new blocks')
+        parser.add_argument(
+            '--interval', type=float, default=5.0,
+            help='Seconds to wait when the safe head is reached')
+
+    def handle(self, *args, **options):
+        indexer = EscrowIndexer(options['network'])
+        total = 0
+        while True:
+            count = indexer.index_next_range(options['from_block'])
+            total += count
+            if count:
+                self.stdout.write(f'{total} blocks indexed')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {total} blocks of {options["network"]}'))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from nftmarket.core.models import Deal
+
+
+class Command(BaseCommand):
+    help = 'Apply timeouts to deals whose stage has expired'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running and wake up at the next expiry')
+        parser.add_argument(
+            '--max-sleep', type=float, default=60.0,
+            help='Upper bound for a sleep, so new deals are picked up')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            count = Deal.objects.process_expired(options['batch_size'])
+            total += count
+            if count:
+                self.stdout.write(f'{total} deals processed')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(self.seconds_to_next_expiry(options['max_sleep']))
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {total} expired deals'))
+
+    def seconds_to_next_expiry(self, max_sleep):
+        next_expires = Deal.objects.next_expires()
+        if next_expires is None:
+            return max_sleep
+        seconds = (next_expires - timezone.now()).total_seconds()
+        return min(max(seconds, 0.1), max_sleep)
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from nftmarket.core.models import Notification
+
+
+class Command(BaseCommand):
+    help = 'Delete or archive notifications older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.NOTIFICATION_RETENTION_DAYS)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--archive', action='store_true',
+            help='Copy notifications to the archive table before deleting')
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        total = 0
+        while True:
+            count = Notification.objects.prune_batch(
+                before, options['batch_size'], options['archive'])
+            if not count:
+                break
+            total += count
+            self.stdout.write(f'{total} notifications processed')
+        self.stdout.write(self.style.SUCCESS(
+            f'Pruned {total} notifications created before {before:%Y-%m-%d}'))
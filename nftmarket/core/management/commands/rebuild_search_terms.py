@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from nftmarket.core.models import Offer, OfferSearchTerm
+from nftmarket.core.search import invalidate_search_cache
+
+
+class Command(BaseCommand):
+    help = 'Recompute offer search terms and vectors in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        offers = Offer.objects.only('pk', 'name', 'details').order_by('pk')
+        total = 0
+        last_pk = 0
+        while True:
+            batch = list(offers.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            total += OfferSearchTerm.objects.rebuild(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write(f'{total} offers processed')
+        invalidate_search_cache()
+        self.stdout.write(self.style.SUCCESS(
+            f'Search terms rebuilt for {total} offers'))
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from nftmarket.core.reconcile import reconcile_deals
+
+
+class Command(BaseCommand):
+    help = 'Check deals waiting for a deposit against the escrow contract'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'networks', nargs='*',
+            help='Networks to check, all with an escrow address by default')
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.CHAIN_MULTICALL_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        networks = options['networks'] or [
+            network for network, chain_settings in settings.NETWORKS.items()
+            if chain_settings['escrow_addr']
+        ]
+        for network in networks:
+            if network not in settings.NETWORKS:
+                raise CommandError(f'Unknown network {network}')
+        for network in networks:
+            result = reconcile_deals(
+                network, batch_size=options['batch_size'])
+            for deal, reason in result.mismatches:
+                self.stdout.write(self.style.WARNING(
+                    f'{network}: deal {deal.pk} ({deal.status}, '
+                    f'{deal.hash_id}): {reason}'))
+            self.stdout.write(self.style.SUCCESS(
+                f'{network}: {result.checked} deals checked, '
+                f'{len(result.confirmed)} confirmed, '
+                f'{len(result.mismatches)} mismatched'))
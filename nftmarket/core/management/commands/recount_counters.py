@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from nftmarket.core.models import Account, AccountCounters
+
+
+class Command(BaseCommand):
+    help = 'Recount the cached deal and notification counters of accounts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            'accounts', nargs='*', type=int,
+            help='Account ids to recount, all accounts by default')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        accounts = Account.objects.order_by('pk')
+        if options['accounts']:
+            accounts = accounts.filter(pk__in=options['accounts'])
+        total = 0
+        last_pk = 0
+        while True:
+            pk_list = list(accounts.filter(pk__gt=last_pk)
+                           .values_list('pk', flat=True)[:batch_size])
+            if not pk_list:
+                break
+            for account_id in pk_list:
+                AccountCounters.objects.refresh(account_id)
+            total += len(pk_list)
+            last_pk = pk_list[-1]
+            self.stdout.write(f'{total} accounts processed')
+        self.stdout.write(self.style.SUCCESS(
+            f'Counters recounted for {total} accounts'))
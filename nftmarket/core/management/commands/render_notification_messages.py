@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from nftmarket.core.models import Notification
+
+
+class Command(BaseCommand):
+    help = 'Render stored messages for notifications that have none'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Re-render every notification, not only missing ones')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        notifications = Notification.objects.order_by('pk')
+        if not options['all']:
+            notifications = notifications.filter(messages={})
+        total = 0
+        last_pk = 0
+        while True:
+            batch = notifications.filter(pk__gt=last_pk)[:batch_size]
+            pk_list = list(batch.values_list('pk', flat=True))
+            if not pk_list:
+                break
+            total += Notification.objects.refresh_messages(
+                Notification.objects.filter(pk__in=pk_list))
+            last_pk = pk_list[-1]
+            self.stdout.write(f'{total} notifications processed')
+        self.stdout.write(self.style.SUCCESS(
+            f'Messages rendered for {total} notifications'))
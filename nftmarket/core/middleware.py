@@ -1,16 +1,44 @@
+import time
+
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
 from nftmarket.core.models import Account
 
 
-def get_account(request):
-    account_pk = request.session.get('_account_pk')
-    if account_pk:
-        try:
-            return Account.objects.get(pk=account_pk)
-        except Account.DoesNotExist:
-            pass
-    return None
+ACCOUNT_SNAPSHOT_SESSION_KEY = '_account_snapshot'
+
+
+def get_account_snapshot(request, account_pk):
+    snapshot = request.session.get(ACCOUNT_SNAPSHOT_SESSION_KEY)
+    if not snapshot or snapshot.get('pk') != account_pk:
+        return None
+    if snapshot.get('expires', 0) < time.time():
+        return None
+    return snapshot
+
+
+def save_account_snapshot(request, account):
+    timeout = settings.ACCOUNT_SNAPSHOT_TIMEOUT
+    if not timeout:
+        return
+    request.session[ACCOUNT_SNAPSHOT_SESSION_KEY] = dict(
+        pk=account.pk, is_active=account.is_active,
+        expires=time.time() + timeout)
+
+
+def get_account(request, account_pk):
+    try:
+        account = Account.objects\
+            .select_related('rating', 'telegram_link', 'counters')\
+            .get(pk=account_pk)
+    except Account.DoesNotExist:
+        request.session.pop('_account_pk', None)
+        request.session.pop(ACCOUNT_SNAPSHOT_SESSION_KEY, None)
+        return None
+    save_account_snapshot(request, account)
+    return account
 
 
 class AccountMiddleware(MiddlewareMixin):
@@ -18,7 +46,23 @@ class AccountMiddleware(MiddlewareMixin):
         if not hasattr(request, 'session'):
             raise ImproperlyConfigured(
                 'AccountMiddleware requires session')
-        request.account = get_account(request)
+        account_pk = request.session.get('_account_pk')
+        request.account_id = account_pk
+        request.account_snapshot = None
+        request.account = None
+        if not account_pk:
+            return
+        snapshot = get_account_snapshot(request, account_pk)
+        if snapshot is None:
+            # Without a fresh snapshot the account is loaded right away, so
+            # a session pointing to a deleted account ends up as None.
+            request.account = get_account(request, account_pk)
+            if request.account is None:
+                request.account_id = None
+            return
+        request.account_snapshot = snapshot
+        request.account = SimpleLazyObject(
+            lambda: get_account(request, account_pk))
 
 
 class ForceDefaultLanguageMiddleware(MiddlewareMixin):
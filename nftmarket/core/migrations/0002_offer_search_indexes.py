@@ -0,0 +1,86 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:34
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+import django.db.models.functions.text
+
+from nftmarket.core.migrations._search_terms import clean_search_term
+
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def make_offer_search_vector(name, details):
+    return (
+        SearchVector(
+            models.Value(name, output_field=models.TextField()),
+            config='simple', weight='A')
+        + SearchVector(
+            models.Value(details, output_field=models.TextField()),
+            config='simple', weight='B'))
+
+
+def backfill_offer_search_terms(apps, schema_editor):
+    Offer = apps.get_model('core', 'Offer')
+    OfferSearchTerm = apps.get_model('core', 'OfferSearchTerm')
+    search_terms = {
+        search_term.offer_id: search_term
+        for search_term in OfferSearchTerm.objects.all()
+    }
+    to_create = list()
+    to_update = list()
+    offers = Offer.objects.only('pk', 'name', 'details')\
+        .order_by('pk').iterator(chunk_size=BACKFILL_BATCH_SIZE)
+    for offer in offers:
+        search_term = search_terms.get(offer.pk)
+        if search_term is None:
+            search_term = OfferSearchTerm(offer_id=offer.pk)
+            to_create.append(search_term)
+        else:
+            to_update.append(search_term)
+        search_term.term = ''.join(
+            map(clean_search_term, (offer.name, offer.details)))
+        search_term.search_vector =\
+            make_offer_search_vector(offer.name, offer.details)
+    OfferSearchTerm.objects.bulk_create(
+        to_create, batch_size=BACKFILL_BATCH_SIZE)
+    OfferSearchTerm.objects.bulk_update(
+        to_update, ['term', 'search_vector'],
+        batch_size=BACKFILL_BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        migrations.AddField(
+            model_name='offersearchterm',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name='offersearchterm',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('term', name='gin_trgm_ops'), name='core_offer_search_term_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='offersearchterm',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='core_offer_search_term_fts'),
+        ),
+        migrations.AddIndex(
+            model_name='wtbrequest',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='core_wtb_requests_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='wtbrequest',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('name', config='simple'), name='core_wtb_requests_name_fts'),
+        ),
+        migrations.RunPython(
+            backfill_offer_search_terms, migrations.RunPython.noop),
+    ]
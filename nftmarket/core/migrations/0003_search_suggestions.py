@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:36
+
+from django.db import migrations, models
+
+from nftmarket.core.migrations._search_terms import clean_search_term
+
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def backfill_search_suggestions(apps, schema_editor):
+    Offer = apps.get_model('core', 'Offer')
+    WTBRequest = apps.get_model('core', 'WTBRequest')
+    SearchSuggestion = apps.get_model('core', 'SearchSuggestion')
+    sources = (
+        ('wts', Offer.objects.exclude(status='deleted')),
+        ('wtb', WTBRequest.objects.exclude(status='deleted')),
+    )
+    for kind, queryset in sources:
+        rows = queryset.values_list('pk', 'name', 'status')\
+            .order_by('pk').iterator(chunk_size=BACKFILL_BATCH_SIZE)
+        SearchSuggestion.objects.bulk_create([
+            SearchSuggestion(
+                kind=kind, object_id=object_id, name=name,
+                key=clean_search_term(name), is_active=status == 'active')
+            for object_id, name, status in rows
+        ], batch_size=BACKFILL_BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_offer_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.TextField(choices=[('wts', 'WTS offer'), ('wtb', 'WTB offer')])),
+                ('object_id', models.BigIntegerField()),
+                ('name', models.CharField(max_length=128)),
+                ('key', models.CharField(max_length=128)),
+                ('is_active', models.BooleanField(blank=True, default=False)),
+            ],
+            options={
+                'db_table': 'core_search_suggestion',
+                'indexes': [models.Index(condition=models.Q(('is_active', True)), fields=['key'], name='core_search_suggestion_key', opclasses=['varchar_pattern_ops'])],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(
+            backfill_search_suggestions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def backfill_account_counters(apps, schema_editor):
+    Account = apps.get_model('core', 'Account')
+    AccountCounters = apps.get_model('core', 'AccountCounters')
+    Notification = apps.get_model('core', 'Notification')
+    Offer = apps.get_model('core', 'Offer')
+    counters = {
+        account_id: AccountCounters(account_id=account_id)
+        for account_id in Account.objects.values_list('pk', flat=True)
+    }
+    unseen = Notification.objects.filter(is_seen=False)\
+        .values_list('account_id', 'notification_type')\
+        .annotate(count=models.Count('pk')).order_by()
+    for account_id, notification_type, count in unseen:
+        setattr(
+            counters[account_id],
+            f'unseen_{notification_type}_notifications', count)
+    for role in ('seller', 'buyer'):
+        changed = Offer.objects.exclude(**{f'{role}_id': None})\
+            .values_list(f'{role}_id')\
+            .annotate(
+                changed=models.Count('pk', filter=models.Q(
+                    status_changed_at__gt=models.F(f'last_seen_{role}'))),
+                open=models.Count('pk', filter=models.Q(status='deal')))\
+            .order_by()
+        for account_id, changed_count, open_count in changed:
+            counters[account_id].changed_deals += changed_count
+            counters[account_id].open_deals += open_count
+    AccountCounters.objects.bulk_create(
+        counters.values(), batch_size=BACKFILL_BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_search_suggestions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountCounters',
+            fields=[
+                ('account', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counters', serialize=False, to='core.account', verbose_name='Account')),
+                ('unseen_deal_notifications', models.IntegerField(blank=True, default=0)),
+                ('unseen_wts_notifications', models.IntegerField(blank=True, default=0)),
+                ('unseen_wtb_notifications', models.IntegerField(blank=True, default=0)),
+                ('changed_deals', models.IntegerField(blank=True, default=0)),
+                ('open_deals', models.IntegerField(blank=True, default=0)),
+            ],
+            options={
+                'db_table': 'core_account_counters',
+            },
+        ),
+        migrations.RunPython(
+            backfill_account_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_account_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='messages',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Rendered messages'),
+        ),
+    ]
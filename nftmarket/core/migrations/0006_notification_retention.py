@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_notification_messages'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('offer_id', models.BigIntegerField(blank=True, null=True)),
+                ('wtb_request_id', models.BigIntegerField(blank=True, null=True)),
+                ('object_id', models.BigIntegerField()),
+                ('notification_type', models.TextField(choices=[('deal', 'Deal notification'), ('wts', 'WTS offer notification'), ('wtb', 'WTB offer notification')], verbose_name='Notification type')),
+                ('notify_event', models.TextField(choices=[('wts_offer_active', 'WTS offer became active'), ('wtb_request_active', 'WTB offer became active'), ('wtb_request_offer', 'New suggestion for WTB offer'), ('buyer_confirm', 'Buyer confirmed deal'), ('seller_confirm', 'Seller confirmed deal'), ('deal_expired_seller_confirm', 'Deal expired seller confirm'), ('deal_expired_buyer_payment', 'Deal expired buyer payment'), ('deal_expired_seller_payment', 'Deal expired seller payment'), ('buyer_payed', 'Buyer payed'), ('seller_payed', 'Seller payed'), ('deal_completed', 'Deal completed'), ('deal_canceled', 'Deal arbitration created'), ('deal_resolved', 'Deal arbitration resolved'), ('deal_closed', 'Deal closed'), ('deal_feedback', 'Deal feedback created')], verbose_name='Notify event')),
+                ('created_at', models.DateTimeField()),
+                ('is_seen', models.BooleanField(default=False)),
+                ('messages', models.JSONField(blank=True, default=dict)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Archived Notification',
+                'verbose_name_plural': 'Archived Notifications',
+                'db_table': 'core_notification_archive',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['account', 'notification_type', '-id'], name='core_notification_account'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['created_at'], name='core_notification_created'),
+        ),
+        migrations.AddField(
+            model_name='notificationarchive',
+            name='account',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to='core.account', verbose_name='Account'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:52
+
+from django.db import migrations, models
+
+
+def mark_existing_sent(apps, schema_editor):
+    # Nothing was delivered before the Telegram worker existed; do not
+    # flood chats with the whole history on its first run.
+    Notification = apps.get_model('core', 'Notification')
+    Notification.objects.filter(status='new').update(status='sent')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_notification_retention'),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_existing_sent, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('status', 'new')), fields=['id'], name='core_notification_new'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_notification_delivery'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='deal',
+            index=models.Index(condition=models.Q(('expires__isnull', False)), fields=['status', 'expires'], name='core_deal_expires'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_deal_expires_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(condition=models.Q(('status', 'moderation')), fields=['created_at'], name='core_offer_moderation'),
+        ),
+        migrations.AddIndex(
+            model_name='wtbrequest',
+            index=models.Index(condition=models.Q(('status', 'moderation')), fields=['created_at'], name='core_wtb_requests_moderation'),
+        ),
+    ]
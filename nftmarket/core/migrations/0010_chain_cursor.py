@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 07:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_moderation_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChainCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('network', models.TextField(choices=[('bnb', 'BNB Smart Chain'), ('arbitrum', 'Arbitrum One'), ('optimism', 'Optimism')], unique=True, verbose_name='Network')),
+                ('block_number', models.BigIntegerField(verbose_name='Last indexed block')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Chain Cursor',
+                'verbose_name_plural': 'Chain Cursors',
+                'db_table': 'core_chain_cursor',
+            },
+        ),
+    ]
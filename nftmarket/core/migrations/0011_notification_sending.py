@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 08:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_chain_cursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Claimed for delivery'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='status',
+            field=models.TextField(choices=[('new', 'New notification'), ('sending', 'Sending notification'), ('sent', 'Sent notification')], default='new', verbose_name='Notification status'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('status', 'sending')), fields=['claimed_at'], name='core_notification_sending'),
+        ),
+    ]
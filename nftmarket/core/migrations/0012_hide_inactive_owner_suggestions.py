@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def hide_inactive_owner_suggestions(apps, schema_editor):
+    Offer = apps.get_model('core', 'Offer')
+    WTBRequest = apps.get_model('core', 'WTBRequest')
+    SearchSuggestion = apps.get_model('core', 'SearchSuggestion')
+    SearchSuggestion.objects.filter(
+        kind='wts',
+        object_id__in=Offer.objects
+        .filter(seller__is_active=False).values('pk')
+    ).update(is_active=False)
+    SearchSuggestion.objects.filter(
+        kind='wtb',
+        object_id__in=WTBRequest.objects
+        .filter(account__is_active=False).values('pk')
+    ).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_notification_sending'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            hide_inactive_owner_suggestions, migrations.RunPython.noop),
+    ]
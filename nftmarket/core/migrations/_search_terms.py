@@ -0,0 +1,9 @@
+"""
+Helpers shared by the data migrations. They are frozen copies of the app
+code at the time of the migrations and must not follow later changes.
+"""
+import re
+
+
+def clean_search_term(str_val):
+    return re.sub('[^A-Z0-9]+', '', str_val.upper())
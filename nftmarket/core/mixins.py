@@ -1,8 +1,9 @@
 from django.http import HttpResponseRedirect
+from nftmarket.core.helpers import has_account
 
 
 class AccountRequiredMixin:
     def dispatch(self, request, *args, **kwargs):
-        if not hasattr(request, 'account') or request.account is None:
+        if not has_account(request):
             return HttpResponseRedirect('/')
         return super().dispatch(request, *args, **kwargs)
@@ -1,20 +1,48 @@
 import json
+import logging
 import re
 import secrets
+from collections import Counter
 from datetime import timedelta
 from functools import cached_property
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import (
     MinValueValidator, MaxValueValidator, MinLengthValidator, RegexValidator)
-from django.db import models, transaction
-from django.utils import timezone
+from django.db import connection, models, transaction
+from django.db.models.functions import Greatest, RowNumber
+from django.utils import timezone, translation
 from django.utils.translation import gettext as _
+from nftmarket.core.caching import invalidate_index_fragments
 from nftmarket.core.notify_messages import NOTIFICATION_MESSAGES
+from nftmarket.core.push import (
+    publish, PUSH_DEAL, PUSH_NOTIFICATION, PUSH_MESSAGE)
+from nftmarket.core.search import (
+    make_offer_search_vector, make_name_search_vector, make_name_trigram,
+    offer_search_filter, offer_search_rank, name_search_filter,
+    name_search_rank, invalidate_search_cache)
 
 
+logger = logging.getLogger(__name__)
+
 INDEX_PAGE_OBJECTS_LIMIT = 20
+INDEX_FRAGMENT_OFFERS = 'offers'
+INDEX_FRAGMENT_WTB_REQUESTS = 'wtb_requests'
+MODERATION_DELAY = timedelta(hours=1)
+MODERATION_BATCH_SIZE = 500
 NAME_LIMIT = 16
+OFFER_LINK_CLASS_PLACEHOLDER = '{offer_link_class}'
+NOTIFICATION_REFRESH_BATCH_SIZE = 500
+SUGGESTIONS_LIMIT = 8
+SEARCH_PRICE_BUCKETS = (
+    (0, 100),
+    (100, 500),
+    (500, 1000),
+    (1000, 5000),
+    (5000, None),
+)
 
 
 class AccountManager(models.Manager):
@@ -25,6 +53,7 @@ class AccountManager(models.Manager):
             account, created = self.get_or_create(wallet=wallet)
             if created:
                 AccountRating.objects.create(account=account)
+                AccountCounters.objects.create(account=account)
                 AccountNonce.objects.create(
                     account=account,
                     value=secret_nonce
@@ -47,6 +76,26 @@ class AccountManager(models.Manager):
                     )
         return account
 
+    def load_cards(self, accounts):
+        # Skips anonymous slots, including a lazy account that resolved to
+        # None.
+        accounts = [account for account in accounts if account]
+        if not accounts:
+            return
+        cards = self.get_queryset()\
+            .filter(pk__in={account.pk for account in accounts})\
+            .select_related('rating')\
+            .annotate(avatar_image=avatar_image_subquery('pk'))\
+            .in_bulk()
+        rating_rel = Account.rating.related
+        for account in accounts:
+            card = cards.get(account.pk)
+            if card is None:
+                continue
+            rating_rel.set_cached_value(
+                account, rating_rel.get_cached_value(card, None))
+            account.set_avatar_image(card.avatar_image)
+
 
 class Account(models.Model):
     wallet = models.CharField(
@@ -92,15 +141,42 @@ class Account(models.Model):
     class Meta:
         db_table = 'core_account'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'name' in field_names and 'wallet' in field_names:
+            instance._loaded_full_name = instance.full_name()
+        if 'is_active' in field_names:
+            instance._loaded_is_active = instance.is_active
+        return instance
+
     def save(self, *args, **kwargs):
         if not self.created_at:
             self.created_at = timezone.now()
+        loaded_full_name = getattr(self, '_loaded_full_name', None)
+        loaded_is_active = getattr(self, '_loaded_is_active', None)
         super().save(*args, **kwargs)
+        full_name = self.full_name()
+        if loaded_full_name is not None and loaded_full_name != full_name:
+            # Stored notification messages carry the name of the account.
+            Notification.objects.refresh_messages(
+                Notification.objects.mentioning(self))
+        if loaded_is_active is not None and loaded_is_active != self.is_active:
+            SearchSuggestion.objects.update_for_account(self)
+            invalidate_search_cache()
+        self._loaded_full_name = full_name
+        self._loaded_is_active = self.is_active
 
     @cached_property
     def avatar(self):
         return self.avatars.active().first()
 
+    def set_avatar_image(self, image):
+        avatar = None
+        if image:
+            avatar = AccountAvatar(account=self, image=image)
+        self.__dict__['avatar'] = avatar
+
     def short_wallet(self):
         return f'{self.wallet[:5]}...{self.wallet[-4:]}'
 
@@ -117,13 +193,22 @@ class Account(models.Model):
             and bool(self.telegram) and self.telegram.strip()
             and bool(self.twitter) and self.twitter.strip())
 
+    def get_counters(self):
+        try:
+            return self.counters
+        except AccountCounters.DoesNotExist:
+            counters = AccountCounters.objects.refresh(self.pk)
+            self.set_counters(counters)
+            return counters
+
+    def set_counters(self, counters):
+        Account.counters.related.set_cached_value(self, counters)
+
     def new_count_in_my_deals(self):
-        count_for_seller = Offer.objects.changed_for_seller(self)
-        count_for_buyer = Offer.objects.changed_for_buyer(self)
-        return count_for_seller + count_for_buyer
+        return self.get_counters().changed_deals
 
     def has_open_deals(self):
-        return Offer.objects.in_deal().for_account(self).exists()
+        return self.get_counters().open_deals > 0
 
     def num_success_deals(self):
         num_closed_deals = self.sale_offers.closed().count()
@@ -155,13 +240,13 @@ class Account(models.Model):
         return True
 
     def deals_unseen_notifications(self):
-        return self.notifications.for_deals().unseen().count()
+        return self.get_counters().unseen_deal_notifications
 
     def wts_unseen_notifications(self):
-        return self.notifications.for_wts().unseen().count()
+        return self.get_counters().unseen_wts_notifications
 
     def wtb_unseen_notifications(self):
-        return self.notifications.for_wtb().unseen().count()
+        return self.get_counters().unseen_wtb_notifications
 
     def total_unseen_notifications(self):
         total_count = 0
@@ -171,6 +256,19 @@ class Account(models.Model):
 
         return total_count
 
+    def mark_notifications_seen(self, notification_type):
+        count = self.notifications.for_type(notification_type)\
+            .unseen().update(is_seen=True)
+        if not count:
+            return
+        try:
+            counters = self.counters
+        except AccountCounters.DoesNotExist:
+            # A rebuilt row already counts the notifications as seen.
+            self.get_counters()
+            return
+        counters.add_unseen_notifications(notification_type, -count)
+
     def __str__(self):
         name = self.full_name()
         return name
@@ -189,6 +287,14 @@ class AccountAvatarManager(models.Manager):
         return self.get_queryset().active()
 
 
+def avatar_image_subquery(account_ref):
+    avatars = AccountAvatar.objects.active()\
+        .filter(account_id=models.OuterRef(account_ref))\
+        .order_by('pk')\
+        .values('image')[:1]
+    return models.Subquery(avatars)
+
+
 class AccountAvatar(models.Model):
     account = models.ForeignKey(
         Account, verbose_name=_('Account'), related_name='avatars',
@@ -241,6 +347,15 @@ class AccountRating(models.Model):
         return str(self.value)
 
 
+class AccountTelegramLinkManager(models.Manager):
+    def chat_ids(self, account_ids):
+        links = self.get_queryset()\
+            .filter(account_id__in=account_ids, is_active=True)\
+            .exclude(telegram_id=None)\
+            .values_list('account_id', 'telegram_id')
+        return dict(links)
+
+
 class AccountTelegramLink(models.Model):
     account = models.OneToOneField(
         Account, verbose_name=_('Account'), primary_key=True,
@@ -249,6 +364,8 @@ class AccountTelegramLink(models.Model):
         _('Telegram ID'), blank=True, null=True)
     is_active = models.BooleanField(blank=True, default=True)
 
+    objects = AccountTelegramLinkManager()
+
     class Meta:
         db_table = 'core_account_tg_link'
 
@@ -256,6 +373,86 @@ class AccountTelegramLink(models.Model):
         return str(self.telegram_id)
 
 
+class AccountCountersManager(models.Manager):
+    def add_counts(self, increments):
+        """
+        Applies {(account_id, field): delta} increments with one UPDATE per
+        field. Accounts without a counters row get it rebuilt instead.
+        """
+        increments = {key: delta for key, delta in increments.items() if delta}
+        account_ids = {account_id for account_id, field in increments}
+        updates = dict()
+        for field in {field for account_id, field in increments}:
+            field_increments = [
+                models.When(account_id=account_id, then=models.Value(delta))
+                for (account_id, delta_field), delta in increments.items()
+                if delta_field == field
+            ]
+            updates[field] = Greatest(models.F(field) + models.Case(
+                *field_increments, default=models.Value(0)), 0)
+        if not updates:
+            return
+        counters = self.filter(account_id__in=account_ids)
+        if counters.update(**updates) < len(account_ids):
+            existing_ids = set(counters.values_list('account_id', flat=True))
+            for account_id in account_ids - existing_ids:
+                self.refresh(account_id)
+
+    def add_unseen_notifications(self, unseen_counts):
+        self.add_counts({
+            (account_id, AccountCounters.unseen_notifications_field(
+                notification_type)): count
+            for (account_id, notification_type), count
+            in unseen_counts.items()
+        })
+
+    def refresh(self, account_id):
+        # The counters row is locked before the source rows are counted, so
+        # increments of running transactions are neither lost nor counted
+        # twice.
+        with transaction.atomic():
+            counters, is_created = self.select_for_update()\
+                .get_or_create(account_id=account_id)
+            values = Offer.objects.deal_counters(account_id)
+            values.update(Notification.objects.unseen_counters(account_id))
+            for field, value in values.items():
+                setattr(counters, field, value)
+            counters.save(update_fields=list(values))
+        return counters
+
+
+class AccountCounters(models.Model):
+    account = models.OneToOneField(
+        Account, verbose_name=_('Account'), primary_key=True,
+        related_name='counters', on_delete=models.CASCADE)
+    unseen_deal_notifications = models.IntegerField(blank=True, default=0)
+    unseen_wts_notifications = models.IntegerField(blank=True, default=0)
+    unseen_wtb_notifications = models.IntegerField(blank=True, default=0)
+    changed_deals = models.IntegerField(blank=True, default=0)
+    open_deals = models.IntegerField(blank=True, default=0)
+
+    objects = AccountCountersManager()
+
+    class Meta:
+        db_table = 'core_account_counters'
+
+    @staticmethod
+    def unseen_notifications_field(notification_type):
+        return f'unseen_{notification_type}_notifications'
+
+    def add_unseen_notifications(self, notification_type, count):
+        self.add_count(
+            self.unseen_notifications_field(notification_type), count)
+
+    def add_count(self, field, count):
+        AccountCounters.objects.filter(pk=self.pk)\
+            .update(**{field: Greatest(models.F(field) + count, 0)})
+        setattr(self, field, max(getattr(self, field) + count, 0))
+
+    def __str__(self):
+        return str(self.account_id)
+
+
 class BlockchainNetwork(models.TextChoices):
     BNB = 'bnb', 'BNB Smart Chain'
     ARBITRUM = 'arbitrum', 'Arbitrum One'
@@ -278,30 +475,162 @@ class OfferStatus(models.TextChoices):
     REJECTED = 'rejected', 'Rejected'
 
 
-class OfferQuerySet(models.QuerySet):
+class ListingQuerySetMixin:
+    listing_type_field = None
+    listing_owner_field = None
+    listing_status = None
+
+    def filter_facets(
+            self, network=None, token_type=None,
+            price_min=None, price_max=None):
+        queryset = self
+        if network:
+            queryset = queryset.filter(network=network)
+        if token_type:
+            queryset = queryset.filter(**{self.listing_type_field: token_type})
+        if price_min is not None:
+            queryset = queryset.filter(price__gte=price_min)
+        if price_max is not None:
+            queryset = queryset.filter(price__lt=price_max)
+        return queryset
+
+    def with_owner(self):
+        return self.select_related(self.listing_owner_field)
+
+    def activate_moderated(self, created_before, batch_size):
+        """
+        Moves a batch of listings from moderation to active with a single
+        UPDATE ... RETURNING, so the activated rows come back without a
+        second read. Rows locked by a concurrent worker are skipped.
+        """
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        listings = list(self.raw(f'''
+            UPDATE {table} SET status = %s
+            WHERE id IN (
+                SELECT id FROM {table}
+                WHERE status = %s AND created_at < %s
+                ORDER BY created_at
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED)
+            RETURNING *''', [
+                self.listing_status.ACTIVE, self.listing_status.MODERATION,
+                created_before, batch_size]))
+        owner_field = self.listing_owner_field
+        owners = Account.objects.in_bulk({
+            getattr(listing, f'{owner_field}_id') for listing in listings})
+        for listing in listings:
+            setattr(listing, owner_field, owners[
+                getattr(listing, f'{owner_field}_id')])
+        return listings
+
+    def next_moderation_due(self):
+        oldest = self.filter(status=self.listing_status.MODERATION)\
+            .aggregate(oldest=models.Min('created_at'))['oldest']
+        return oldest + MODERATION_DELAY if oldest else None
+
+    def load_owner_cards(self, listings):
+        Account.objects.load_cards(
+            getattr(listing, self.listing_owner_field)
+            for listing in listings)
+
+    def with_owner_card(self):
+        owner_field = self.listing_owner_field
+        return self.select_related(owner_field, f'{owner_field}__rating')\
+            .annotate(owner_avatar_image=avatar_image_subquery(
+                f'{owner_field}_id'))
+
+    def latest_by_type(self, limit=INDEX_PAGE_OBJECTS_LIMIT):
+        type_field = self.listing_type_field
+        latest_ids = self.annotate(type_row_number=models.Window(
+                RowNumber(),
+                partition_by=models.F(type_field),
+                order_by=models.F('pk').desc()))\
+            .filter(type_row_number__lte=limit)\
+            .values('pk')
+        listings = self.model.objects.filter(pk__in=latest_ids)\
+            .with_owner_card()\
+            .order_by(type_field, '-pk')
+        listings_by_type = {token_type: [] for token_type in TokenType.values}
+        for listing in listings:
+            owner = getattr(listing, self.listing_owner_field)
+            owner.set_avatar_image(listing.owner_avatar_image)
+            listings_by_type[getattr(listing, type_field)].append(listing)
+        return listings_by_type
+
+    def facets(self):
+        aggregates = dict()
+        for value, _label in BlockchainNetwork.choices:
+            aggregates[f'network_{value}'] = models.Count(
+                'pk', filter=models.Q(network=value))
+        for value, _label in TokenType.choices:
+            aggregates[f'type_{value}'] = models.Count(
+                'pk', filter=models.Q(**{self.listing_type_field: value}))
+        for index, (price_min, price_max) in enumerate(SEARCH_PRICE_BUCKETS):
+            price_filter = models.Q(price__gte=price_min)
+            if price_max is not None:
+                price_filter &= models.Q(price__lt=price_max)
+            aggregates[f'price_{index}'] = models.Count(
+                'pk', filter=price_filter)
+        counts = self.order_by().aggregate(**aggregates)
+        return {
+            'networks': [
+                dict(value=value, label=label,
+                     count=counts[f'network_{value}'])
+                for value, label in BlockchainNetwork.choices
+            ],
+            'types': [
+                dict(value=value, label=label,
+                     count=counts[f'type_{value}'])
+                for value, label in TokenType.choices
+            ],
+            'prices': [
+                dict(price_min=price_min, price_max=price_max,
+                     count=counts[f'price_{index}'])
+                for index, (price_min, price_max)
+                in enumerate(SEARCH_PRICE_BUCKETS)
+            ],
+        }
+
+
+class OfferQuerySet(ListingQuerySetMixin, models.QuerySet):
+    listing_status = OfferStatus
+    listing_type_field = 'offer_type'
+    listing_owner_field = 'seller'
+
     def not_deleted(self):
         return self.exclude(status=OfferStatus.DELETED)
 
-    def changed_for_seller(self, account):
-        return self.exclude(status_changed_at=None)\
-            .filter(seller=account)\
-            .filter(status_changed_at__gt=models.F('last_seen_seller'))\
-            .count()
-
-    def changed_for_buyer(self, account):
-        return self.exclude(status_changed_at=None)\
-            .filter(buyer=account)\
-            .filter(status_changed_at__gt=models.F('last_seen_buyer'))\
-            .count()
+    def deal_counters(self, account_id):
+        is_seller = models.Q(seller_id=account_id)
+        is_buyer = models.Q(buyer_id=account_id)
+        return self.filter(is_seller | is_buyer).aggregate(
+            changed_deals=models.Count('pk', filter=(
+                is_seller
+                & models.Q(status_changed_at__gt=models.F('last_seen_seller'))
+            ) | (
+                is_buyer
+                & models.Q(status_changed_at__gt=models.F('last_seen_buyer'))
+            )),
+            open_deals=models.Count(
+                'pk', filter=models.Q(status=OfferStatus.DEAL)))
 
     def update_last_seen_for(self, account, offers):
+        # Only changed offers need a new mark, and their number is exactly
+        # how much the changed deals counter drops.
         pk_list = [offer.pk for offer in offers]
-        self.filter(seller=account)\
+        now = timezone.now()
+        seen_count = self.filter(seller=account)\
             .filter(pk__in=pk_list)\
-            .update(last_seen_seller=timezone.now())
-        self.filter(buyer=account)\
+            .filter(status_changed_at__gt=models.F('last_seen_seller'))\
+            .update(last_seen_seller=now)
+        seen_count += self.filter(buyer=account)\
             .filter(pk__in=pk_list)\
-            .update(last_seen_buyer=timezone.now())
+            .filter(status_changed_at__gt=models.F('last_seen_buyer'))\
+            .update(last_seen_buyer=now)
+        if seen_count:
+            account.get_counters().add_count('changed_deals', -seen_count)
+        for offer in offers:
+            offer.mark_seen_by(account, now)
 
     def active(self):
         return self.filter(status=OfferStatus.ACTIVE)\
@@ -322,12 +651,14 @@ class OfferQuerySet(models.QuerySet):
     def closed(self):
         return self.filter(status=OfferStatus.CLOSED)
 
-    def latest_for_type(self, offer_type):
-        return self.filter(offer_type=offer_type)
-
     def search(self, search_text, order_by):
-        offers_ids = OfferSearchTerm.objects.search(search_text)
-        return self.filter(id__in=offers_ids).order_by(order_by)
+        search_term = clean_search_term(search_text)
+        return self.filter(
+                offer_search_filter(
+                    search_text, search_term, prefix='search_term__'))\
+            .annotate(search_rank=offer_search_rank(
+                search_text, search_term, prefix='search_term__'))\
+            .order_by(order_by, '-search_rank')
 
     def for_account(self, account):
         return self.filter(
@@ -358,25 +689,8 @@ class OfferManager(models.Manager):
     def rejected(self):
         return self.get_queryset().rejected()
 
-    def latest_nft(self):
-        return self.get_queryset()\
-            .active()\
-            .latest_for_type(TokenType.NFT)[:INDEX_PAGE_OBJECTS_LIMIT]
-
-    def latest_ido(self):
-        return self.get_queryset()\
-            .active()\
-            .latest_for_type(TokenType.IDO)[:INDEX_PAGE_OBJECTS_LIMIT]
-
-    def latest_other(self):
-        return self.get_queryset()\
-            .active()\
-            .latest_for_type(TokenType.OTHER)[:INDEX_PAGE_OBJECTS_LIMIT]
-
-    def latest_worker(self):
-        return self.get_queryset()\
-            .active()\
-            .latest_for_type(TokenType.WORKER)[:INDEX_PAGE_OBJECTS_LIMIT]
+    def latest_by_type(self):
+        return self.get_queryset().active().latest_by_type()
 
     def search(self, search_text, order_by):
         return self.get_queryset().active().search(search_text, order_by)
@@ -384,25 +698,36 @@ class OfferManager(models.Manager):
     def for_account(self, account):
         return self.get_queryset().for_account(account)
 
-    def changed_for_seller(self, account):
-        return self.get_queryset().changed_for_seller(account)
-
-    def changed_for_buyer(self, account):
-        return self.get_queryset().changed_for_buyer(account)
+    def deal_counters(self, account_id):
+        return self.get_queryset().deal_counters(account_id)
 
     def update_last_seen_for(self, account, offers):
         return self.get_queryset().update_last_seen_for(account, offers)
 
-    def activate_from_moderation(self):
-        hour_ago = timezone.now() - timezone.timedelta(hours=1)
-        offers_to_activate = self.get_queryset()\
-            .filter(status=OfferStatus.MODERATION, created_at__lt=hour_ago)
-        id_list = list(offers_to_activate.values_list('id', flat=True))
-        offers_to_activate.update(status=OfferStatus.ACTIVE)
-        for offer_id in id_list:
-            offer = Offer.objects.get(pk=offer_id)
-            Notification.add_event(
-                NotifyEvent.WTS_OFFER_ACTIVE, offer.seller, offer=offer)
+    def activate_from_moderation(self, batch_size=MODERATION_BATCH_SIZE):
+        with transaction.atomic():
+            offers = self.get_queryset().activate_moderated(
+                timezone.now() - MODERATION_DELAY, batch_size)
+            SearchSuggestion.objects\
+                .filter(
+                    kind=SearchSuggestionKind.WTS,
+                    object_id__in=[
+                        offer.pk for offer in offers
+                        if offer.seller.is_active])\
+                .update(is_active=True)
+            Notification.add_events([
+                Notification.make_event(
+                    NotifyEvent.WTS_OFFER_ACTIVE, offer.seller, offer=offer)
+                for offer in offers
+            ])
+        if offers:
+            invalidate_search_cache()
+            invalidate_index_fragments(
+                INDEX_FRAGMENT_OFFERS, TokenType.values)
+        return len(offers)
+
+    def next_moderation_due(self):
+        return self.get_queryset().next_moderation_due()
 
     def latest_closed(self):
         return self.get_queryset().latest_closed()
@@ -414,6 +739,11 @@ class Offer(models.Model):
         verbose_name = _('Offer')
         verbose_name_plural = _('Offers')
         ordering = ['-pk']
+        indexes = [
+            models.Index(
+                fields=['created_at'], name='core_offer_moderation',
+                condition=models.Q(status=OfferStatus.MODERATION)),
+        ]
 
     objects = OfferManager()
 
@@ -458,13 +788,136 @@ class Offer(models.Model):
     created_at = models.DateTimeField(
         _('Created at'), auto_now_add=True, blank=True, null=True)
 
+    TRACKED_FIELDS = (
+        'name', 'details', 'status', 'price', 'network', 'offer_type',
+        'seller_id', 'buyer_id', 'status_changed_at', 'last_seen_seller',
+        'last_seen_buyer')
+    LISTING_FIELDS = {
+        'name', 'details', 'status', 'price', 'network', 'offer_type'}
+    DEAL_COUNTER_FIELDS = {
+        'status', 'seller_id', 'buyer_id', 'status_changed_at',
+        'last_seen_seller', 'last_seen_buyer'}
+    SEARCH_TERM_FIELDS = {'name', 'details'}
+    SEARCH_SUGGESTION_FIELDS = {'name', 'status'}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            field: value for field, value in zip(field_names, values)
+            if field in cls.TRACKED_FIELDS
+        }
+        return instance
+
+    @staticmethod
+    def deal_counts(values):
+        counts = Counter()
+        seller_id = values['seller_id']
+        buyer_id = values['buyer_id']
+        changed_at = values['status_changed_at']
+        if values['status'] == OfferStatus.DEAL:
+            counts[(seller_id, 'open_deals')] += 1
+            if buyer_id:
+                counts[(buyer_id, 'open_deals')] += 1
+        last_seen_seller = values['last_seen_seller']
+        if changed_at and last_seen_seller and changed_at > last_seen_seller:
+            counts[(seller_id, 'changed_deals')] += 1
+        last_seen_buyer = values['last_seen_buyer']
+        if (
+            buyer_id and changed_at and last_seen_buyer
+            and changed_at > last_seen_buyer
+        ):
+            counts[(buyer_id, 'changed_deals')] += 1
+        return counts
+
+    def update_deal_counters(self, stored_values, saved_fields):
+        """
+        Moves the deal counters of the involved accounts by the difference
+        between the stored and the saved state of this offer. stored_values
+        is empty for a new offer and otherwise read from the locked row,
+        so concurrent saves of a stale instance never count twice.
+        """
+        saved_values = {
+            field: getattr(self, field)
+            if saved_fields is None or field in saved_fields
+            else stored_values.get(field)
+            for field in self.DEAL_COUNTER_FIELDS
+        }
+        increments = self.deal_counts(saved_values)
+        if stored_values:
+            increments.subtract(self.deal_counts(stored_values))
+        AccountCounters.objects.add_counts(increments)
+
+    def get_changed_fields(self):
+        loaded_values = getattr(self, '_loaded_values', None)
+        if self._state.adding or loaded_values is None:
+            return set(self.TRACKED_FIELDS)
+        return {
+            field for field, value in loaded_values.items()
+            if getattr(self, field) != value
+        }
+
     def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        search_term = self.get_search_term()
-        search_term_model, _ =\
-            OfferSearchTerm.objects.get_or_create(offer_id=self.pk)
-        search_term_model.term = search_term
-        search_term_model.save()
+        changed_fields = self.get_changed_fields()
+        update_fields = kwargs.get('update_fields')
+        saved_fields = None
+        if update_fields is not None:
+            saved_fields = {
+                self._meta.get_field(field).attname
+                for field in update_fields}
+            changed_fields &= saved_fields
+        loaded_values = getattr(self, '_loaded_values', None) or dict()
+        was_active = loaded_values.get('status') == OfferStatus.ACTIVE
+        is_adding = self._state.adding
+        with transaction.atomic():
+            stored_values = dict()
+            if not is_adding and (
+                    saved_fields is None
+                    or saved_fields & self.DEAL_COUNTER_FIELDS):
+                stored_values = Offer.objects\
+                    .select_for_update()\
+                    .filter(pk=self.pk)\
+                    .values(*self.DEAL_COUNTER_FIELDS)\
+                    .first() or dict()
+            super().save(*args, **kwargs)
+            if is_adding or stored_values:
+                self.update_deal_counters(stored_values, saved_fields)
+        if changed_fields & self.DEAL_COUNTER_FIELDS:
+            deal_account_ids = [
+                self.seller_id, self.buyer_id, loaded_values.get('buyer_id')]
+            publish(deal_account_ids, PUSH_DEAL, dict(offer=self.pk))
+        listing_changed_fields = changed_fields & self.LISTING_FIELDS
+        if listing_changed_fields and (was_active or self.is_active()):
+            invalidate_index_fragments(INDEX_FRAGMENT_OFFERS, [
+                self.offer_type,
+                loaded_values.get('offer_type', self.offer_type)
+            ])
+        if changed_fields & self.SEARCH_TERM_FIELDS:
+            OfferSearchTerm.objects.update_for_offer(self)
+        if changed_fields & self.SEARCH_SUGGESTION_FIELDS:
+            SearchSuggestion.objects.update_for(
+                SearchSuggestionKind.WTS, self.pk, self.name,
+                self.is_active() and self.seller.is_active)
+        if 'name' in changed_fields and loaded_values:
+            Notification.objects.refresh_messages(self.notifications.all())
+        if listing_changed_fields:
+            invalidate_search_cache()
+        self._loaded_values = {
+            field: getattr(self, field) for field in self.TRACKED_FIELDS}
+
+    def mark_seen_by(self, account, seen_at):
+        loaded_values = getattr(self, '_loaded_values', None) or dict()
+        for field, owner_id in (
+                ('last_seen_seller', self.seller_id),
+                ('last_seen_buyer', self.buyer_id)):
+            last_seen = getattr(self, field)
+            if (
+                owner_id == account.pk and self.status_changed_at
+                and last_seen and self.status_changed_at > last_seen
+            ):
+                setattr(self, field, seen_at)
+                if field in loaded_values:
+                    loaded_values[field] = seen_at
 
     def calc_fee(self, percent):
         return (self.price / 100.0) * float(percent)
@@ -635,19 +1088,118 @@ class OfferSearchTermManager(models.Manager):
     def search(self, search_text):
         search_term = clean_search_term(search_text)
         return self.get_queryset()\
-            .filter(term__contains=search_term)\
+            .filter(offer_search_filter(search_text, search_term))\
             .values_list('offer_id', flat=True)
 
+    def update_for_offer(self, offer):
+        self.update_or_create(offer_id=offer.pk, defaults=dict(
+            term=offer.get_search_term(),
+            search_vector=make_offer_search_vector(
+                offer.name, offer.details)))
+
+    def rebuild(self, offers):
+        offers = list(offers)
+        search_terms = self.get_queryset()\
+            .filter(offer_id__in=[offer.pk for offer in offers])\
+            .in_bulk(field_name='offer_id')
+        to_create = list()
+        to_update = list()
+        for offer in offers:
+            search_term = search_terms.get(offer.pk)
+            if search_term is None:
+                search_term = OfferSearchTerm(offer_id=offer.pk)
+                to_create.append(search_term)
+            else:
+                to_update.append(search_term)
+            search_term.term = offer.get_search_term()
+            search_term.search_vector =\
+                make_offer_search_vector(offer.name, offer.details)
+        self.bulk_create(to_create)
+        self.bulk_update(to_update, ['term', 'search_vector'])
+        return len(offers)
+
 
 class OfferSearchTerm(models.Model):
     offer = models.OneToOneField(
         Offer, related_name='search_term', on_delete=models.CASCADE)
     term = models.TextField()
+    search_vector = SearchVectorField(null=True)
 
     objects = OfferSearchTermManager()
 
     class Meta:
         db_table = 'core_offer_search_term'
+        indexes = [
+            GinIndex(
+                OpClass('term', name='gin_trgm_ops'),
+                name='core_offer_search_term_trgm'),
+            GinIndex(
+                fields=['search_vector'],
+                name='core_offer_search_term_fts'),
+        ]
+
+
+class SearchSuggestionKind(models.TextChoices):
+    WTS = 'wts', 'WTS offer'
+    WTB = 'wtb', 'WTB offer'
+
+
+class SearchSuggestionManager(models.Manager):
+    def update_for(self, kind, object_id, name, is_active):
+        self.update_or_create(
+            kind=kind, object_id=object_id,
+            defaults=dict(
+                name=name,
+                key=clean_search_term(name),
+                is_active=is_active))
+
+    def update_for_account(self, account):
+        # A suggestion is only active while both the listing and its owner
+        # are, so blocking an account hides its listings here as well.
+        offers = Offer.objects\
+            .filter(seller_id=account.pk, status=OfferStatus.ACTIVE)\
+            .values('pk')
+        wtb_requests = WTBRequest.objects\
+            .filter(account_id=account.pk, status=WTBRequestStatus.ACTIVE)\
+            .values('pk')
+        return self.filter(
+            models.Q(kind=SearchSuggestionKind.WTS, object_id__in=offers)
+            | models.Q(kind=SearchSuggestionKind.WTB,
+                       object_id__in=wtb_requests)
+        ).update(is_active=account.is_active)
+
+    def suggest(self, prefix, limit=SUGGESTIONS_LIMIT):
+        key = clean_search_term(prefix)
+        if not key:
+            return list()
+        return list(
+            self.get_queryset()
+            .filter(is_active=True, key__startswith=key)
+            .order_by('key', 'kind', 'object_id')
+            .values('kind', 'object_id', 'name')[:limit])
+
+
+class SearchSuggestion(models.Model):
+    kind = models.TextField(choices=SearchSuggestionKind.choices)
+    object_id = models.BigIntegerField()
+    name = models.CharField(max_length=128)
+    key = models.CharField(max_length=128)
+    is_active = models.BooleanField(blank=True, default=False)
+
+    objects = SearchSuggestionManager()
+
+    class Meta:
+        db_table = 'core_search_suggestion'
+        unique_together = ['kind', 'object_id']
+        indexes = [
+            models.Index(
+                fields=['key'], opclasses=['varchar_pattern_ops'],
+                condition=models.Q(is_active=True),
+                name='core_search_suggestion_key'),
+        ]
+
+    def __str__(self):
+        return self.name
 
 
 class DealStatus(models.TextChoices):
@@ -686,6 +1238,24 @@ class DealQuerySet(models.QuerySet):
     def expired(self):
         return self.filter(expires__lt=timezone.now())
 
+    def expiring(self):
+        return self.filter(status__in=Deal.EXPIRING_STATUSES)\
+            .exclude(expires=None)
+
+    def claim_expired(self, batch_size):
+        deals = self.expiring()\
+            .filter(expires__lte=timezone.now())\
+            .select_related('offer', 'offer__seller', 'offer__buyer')\
+            .order_by('expires')\
+            .select_for_update(skip_locked=True, of=('self',))[:batch_size]
+        return list(deals)
+
+    def next_expires(self):
+        return self.expiring()\
+            .order_by('expires')\
+            .values_list('expires', flat=True)\
+            .first()
+
     def closed(self):
         return self.filter(status=DealStatus.CLOSED)
 
@@ -704,6 +1274,9 @@ class DealQuerySet(models.QuerySet):
             DealStatus.WAITING_SELLER_COLLATERAL_CONFIRM
         ])
 
+    def awaiting_deposit(self):
+        return self.filter(status__in=Deal.DEPOSIT_STATUSES)
+
     def waiting_for_completion(self):
         return self.filter(status=DealStatus.WAITING_FOR_COMPLETION)
 
@@ -730,6 +1303,9 @@ class DealQuerySet(models.QuerySet):
     def closed_without_arbitrage(self):
         return self.filter(arbitration__id=None).closed()
 
+    def with_account_cards(self):
+        return self.select_related('offer', 'offer__seller', 'offer__buyer')
+
 
 class DealManager(models.Manager):
     def get_queryset(self):
@@ -744,6 +1320,28 @@ class DealManager(models.Manager):
     def expired(self):
         return self.get_queryset().expired()
 
+    def expiring(self):
+        return self.get_queryset().expiring()
+
+    def next_expires(self):
+        return self.get_queryset().next_expires()
+
+    def process_expired(self, batch_size):
+        with transaction.atomic():
+            deals = self.get_queryset().claim_expired(batch_size)
+            for deal in deals:
+                try:
+                    with transaction.atomic():
+                        deal.process_expire()
+                except Exception:
+                    # The failing deal is parked for a while, so it does
+                    # not block the batch or the deals behind it.
+                    logger.exception('Cannot expire deal %s', deal.pk)
+                    retry_at = timezone.now() + timedelta(
+                        minutes=settings.DEAL_EXPIRE_RETRY_MINUTES)
+                    self.filter(pk=deal.pk).update(expires=retry_at)
+        return len(deals)
+
     def waiting_for_buyer_deposit_confirm(self):
         return self.get_queryset().waiting_for_buyer_deposit_confirm()
 
@@ -753,6 +1351,9 @@ class DealManager(models.Manager):
     def waiting_for_sides_claim(self):
         return self.get_queryset().waiting_for_sides_claim()
 
+    def awaiting_deposit(self):
+        return self.get_queryset().awaiting_deposit()
+
     def waiting_for_completion(self):
         return self.get_queryset().waiting_for_completion()
 
@@ -768,6 +1369,12 @@ class DealManager(models.Manager):
     def closed_without_arbitrage(self):
         return self.get_queryset().closed_without_arbitrage()
 
+    def load_account_cards(self, deals, *accounts):
+        Account.objects.load_cards(
+            list(accounts)
+            + [deal.offer.seller for deal in deals]
+            + [deal.offer.buyer for deal in deals])
+
 
 class Deal(models.Model):
     offer = models.ForeignKey(
@@ -784,12 +1391,30 @@ class Deal(models.Model):
     is_seller_approved = models.BooleanField(
         _('Seller approved'), blank=True, default=False)
 
+    EXPIRING_STATUSES = (
+        DealStatus.WAITING_SELLER_CONFIRM,
+        DealStatus.WAITING_BUYER_PAYMENT,
+        DealStatus.WAITING_SELLER_COLLATERAL,
+        DealStatus.COMPLETION_DELAY,
+    )
+    DEPOSIT_STATUSES = (
+        DealStatus.WAITING_BUYER_PAYMENT,
+        DealStatus.WAITING_BUYER_PAYMENT_CONFIRM,
+        DealStatus.WAITING_SELLER_COLLATERAL,
+        DealStatus.WAITING_SELLER_COLLATERAL_CONFIRM,
+    )
+
     objects = DealManager()
 
     class Meta:
         db_table = 'core_deal'
         verbose_name = _('Deal')
         verbose_name_plural = _('Deals')
+        indexes = [
+            models.Index(
+                fields=['status', 'expires'], name='core_deal_expires',
+                condition=models.Q(expires__isnull=False)),
+        ]
 
     @staticmethod
     def total_summary():
@@ -874,10 +1499,9 @@ class Deal(models.Model):
         return self.status == DealStatus.WAITING_BUYER_PAYMENT
 
     def buyer_deposited(self):
-        with transaction.atomic():
-            self.status = DealStatus.WAITING_BUYER_PAYMENT_CONFIRM
-            self.save()
-            self.offer.set_update()
+        self.set_status_from(
+            DealStatus.WAITING_BUYER_PAYMENT,
+            DealStatus.WAITING_BUYER_PAYMENT_CONFIRM)
 
     def is_buyer_deposited(self):
         return self.status == DealStatus.WAITING_BUYER_PAYMENT_CONFIRM
@@ -895,10 +1519,9 @@ class Deal(models.Model):
         return self.status == DealStatus.WAITING_SELLER_COLLATERAL
 
     def seller_payed_collateral(self):
-        with transaction.atomic():
-            self.status = DealStatus.WAITING_SELLER_COLLATERAL_CONFIRM
-            self.save()
-            self.offer.set_update()
+        self.set_status_from(
+            DealStatus.WAITING_SELLER_COLLATERAL,
+            DealStatus.WAITING_SELLER_COLLATERAL_CONFIRM)
 
     def is_seller_deposited(self):
         return self.status == DealStatus.WAITING_SELLER_COLLATERAL_CONFIRM
@@ -912,6 +1535,54 @@ class Deal(models.Model):
             Notification.add_event(
                 NotifyEvent.SELLER_PAYED, self.offer.buyer, offer=self.offer)
 
+    def set_status_from(self, from_status, to_status):
+        # The escrow indexer may confirm the deposit concurrently, so the
+        # status only moves if nobody has moved it already.
+        with transaction.atomic():
+            updated = Deal.objects\
+                .filter(pk=self.pk, status=from_status)\
+                .update(status=to_status)
+            if updated:
+                self.status = to_status
+                self.offer.set_update()
+
+    def confirm_deposit(self, contract_deal):
+        if not contract_deal.exists:
+            return False
+        if (
+            self.status in (
+                DealStatus.WAITING_BUYER_PAYMENT,
+                DealStatus.WAITING_BUYER_PAYMENT_CONFIRM)
+            and contract_deal.buyer_deposited == contract_deal.price
+        ):
+            self.buyer_deposit_confirmed()
+            return True
+        if (
+            self.status in (
+                DealStatus.WAITING_SELLER_COLLATERAL,
+                DealStatus.WAITING_SELLER_COLLATERAL_CONFIRM)
+            and contract_deal.seller_deposited == contract_deal.collateral
+        ):
+            self.seller_collateral_confirmed()
+            return True
+        return False
+
+    def contract_mismatch(self, contract_deal):
+        if not contract_deal.exists:
+            if self.status == DealStatus.WAITING_BUYER_PAYMENT:
+                return None
+            return 'deal does not exist on chain'
+        if contract_deal.closed:
+            return 'deal is closed on chain'
+        if contract_deal.arbitration:
+            return 'deal is in arbitration on chain'
+        if contract_deal.buyer_deposited not in (0, contract_deal.price):
+            return 'buyer deposit differs from the price'
+        if contract_deal.seller_deposited not in (
+                0, contract_deal.collateral):
+            return 'seller deposit differs from the collateral'
+        return None
+
     def is_waiting_for_completion(self):
         return self.status == DealStatus.WAITING_FOR_COMPLETION
 
@@ -949,12 +1620,11 @@ class Deal(models.Model):
                 self.expires = None
                 self.save()
                 self.offer.set_update()
-                Notification.add_event(
-                    NotifyEvent.DEAL_COMPLETED, self.offer.seller,
-                    offer=self.offer)
-                Notification.add_event(
-                    NotifyEvent.DEAL_COMPLETED, self.offer.buyer,
-                    offer=self.offer)
+                Notification.add_events([
+                    Notification.make_event(
+                        NotifyEvent.DEAL_COMPLETED, account, offer=self.offer)
+                    for account in (self.offer.seller, self.offer.buyer)
+                ])
 
     def is_waiting_seller_claim(self):
         return self.status == DealStatus.WAITING_SELLER_CLAIM
@@ -981,10 +1651,11 @@ class Deal(models.Model):
             self.expires = None
             self.save()
             self.offer.close()
-            Notification.add_event(
-                NotifyEvent.DEAL_CLOSED, self.offer.buyer, offer=self.offer)
-            Notification.add_event(
-                NotifyEvent.DEAL_CLOSED, self.offer.seller, offer=self.offer)
+            Notification.add_events([
+                Notification.make_event(
+                    NotifyEvent.DEAL_CLOSED, account, offer=self.offer)
+                for account in (self.offer.buyer, self.offer.seller)
+            ])
 
     def cancel_and_reopen_offer(self):
         with transaction.atomic():
@@ -1029,10 +1700,11 @@ class Deal(models.Model):
             self.status = DealStatus.WAITING_SIDES_CLAIM
             self.save()
             self.offer.set_update()
-            Notification.add_event(
-                NotifyEvent.DEAL_RESOLVED, self.offer.buyer, offer=self.offer)
-            Notification.add_event(
-                NotifyEvent.DEAL_RESOLVED, self.offer.seller, offer=self.offer)
+            Notification.add_events([
+                Notification.make_event(
+                    NotifyEvent.DEAL_RESOLVED, account, offer=self.offer)
+                for account in (self.offer.buyer, self.offer.seller)
+            ])
 
     @cached_property
     def current_arbitration(self):
@@ -1177,6 +1849,10 @@ class AccountBackendMessage(models.Model):
     message = models.CharField(_('Message'), max_length=128)
     tag = models.CharField(max_length=16)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        publish([self.account_id], PUSH_MESSAGE)
+
     @staticmethod
     def add_info(account, message):
         AccountBackendMessage.objects.create(
@@ -1228,7 +1904,11 @@ class WTBRequestStatus(models.TextChoices):
     DELETED = 'deleted', 'Deleted'
 
 
-class WTBRequestQuerySet(models.QuerySet):
+class WTBRequestQuerySet(ListingQuerySetMixin, models.QuerySet):
+    listing_type_field = 'token_type'
+    listing_owner_field = 'account'
+    listing_status = WTBRequestStatus
+
     def not_deleted(self):
         return self.exclude(status=WTBRequestStatus.DELETED)
 
@@ -1236,9 +1916,6 @@ class WTBRequestQuerySet(models.QuerySet):
         return self.filter(status=WTBRequestStatus.ACTIVE)\
             .filter(account__is_active=True)
 
-    def latest_for_type(self, token_type):
-        return self.filter(token_type=token_type)
-
     def active_or_moderation(self):
         return self.filter(status__in=[
             WTBRequestStatus.MODERATION,
@@ -1247,7 +1924,13 @@ class WTBRequestQuerySet(models.QuerySet):
 
     def search(self, search_text, order_by):
         search_term = clean_search_term(search_text)
-        return self.filter(name__icontains=search_term).order_by(order_by)
+        return self.annotate(
+                search_name_trigram=make_name_trigram('name'),
+                search_name_vector=make_name_search_vector('name'))\
+            .filter(name_search_filter(search_text, search_term))\
+            .annotate(
+                search_rank=name_search_rank(search_text, search_term))\
+            .order_by(order_by, '-search_rank')
 
 
 class WTBRequestManager(models.Manager):
@@ -1260,39 +1943,34 @@ class WTBRequestManager(models.Manager):
     def active_or_moderation(self):
         return self.get_queryset().active_or_moderation()
 
-    def activate_from_moderation(self):
-        hour_ago = timezone.now() - timezone.timedelta(hours=1)
-        wtb_requests_to_activate = self.get_queryset()\
-            .filter(
-                status=WTBRequestStatus.MODERATION,
-                created_at__lt=hour_ago)
-        id_list = list(wtb_requests_to_activate.values_list('id', flat=True))
-        wtb_requests_to_activate.update(status=WTBRequestStatus.ACTIVE)
-        for wtb_request_id in id_list:
-            wtb_request = WTBRequest.objects.get(pk=wtb_request_id)
-            Notification.add_event(
-                NotifyEvent.WTB_REQUEST_ACTIVE, wtb_request.account,
-                wtb_request=wtb_request)
-
-    def latest_nft(self):
-        return self.get_queryset()\
-            .active()\
-            .latest_for_type(TokenType.NFT)[:INDEX_PAGE_OBJECTS_LIMIT]
-
-    def latest_ido(self):
-        return self.get_queryset()\
-            .active()\
-            .latest_for_type(TokenType.IDO)[:INDEX_PAGE_OBJECTS_LIMIT]
-
-    def latest_other(self):
-        return self.get_queryset()\
-            .active()\
-            .latest_for_type(TokenType.OTHER)[:INDEX_PAGE_OBJECTS_LIMIT]
-
-    def latest_worker(self):
-        return self.get_queryset()\
-            .active()\
-            .latest_for_type(TokenType.WORKER)[:INDEX_PAGE_OBJECTS_LIMIT]
+    def activate_from_moderation(self, batch_size=MODERATION_BATCH_SIZE):
+        with transaction.atomic():
+            wtb_requests = self.get_queryset().activate_moderated(
+                timezone.now() - MODERATION_DELAY, batch_size)
+            SearchSuggestion.objects\
+                .filter(
+                    kind=SearchSuggestionKind.WTB,
+                    object_id__in=[
+                        wtb_request.pk for wtb_request in wtb_requests
+                        if wtb_request.account.is_active])\
+                .update(is_active=True)
+            Notification.add_events([
+                Notification.make_event(
+                    NotifyEvent.WTB_REQUEST_ACTIVE, wtb_request.account,
+                    wtb_request=wtb_request)
+                for wtb_request in wtb_requests
+            ])
+        if wtb_requests:
+            invalidate_search_cache()
+            invalidate_index_fragments(
+                INDEX_FRAGMENT_WTB_REQUESTS, TokenType.values)
+        return len(wtb_requests)
+
+    def next_moderation_due(self):
+        return self.get_queryset().next_moderation_due()
+
+    def latest_by_type(self):
+        return self.get_queryset().active().latest_by_type()
 
     def search(self, search_text, order_by):
         return self.get_queryset().search(search_text, order_by)
@@ -1329,11 +2007,71 @@ class WTBRequest(models.Model):
         verbose_name = _('WTB Offer')
         verbose_name_plural = _('WTB Offers')
         ordering = ['-pk']
+        indexes = [
+            GinIndex(
+                OpClass(make_name_trigram('name'), name='gin_trgm_ops'),
+                name='core_wtb_requests_name_trgm'),
+            GinIndex(
+                make_name_search_vector('name'),
+                name='core_wtb_requests_name_fts'),
+            models.Index(
+                fields=['created_at'], name='core_wtb_requests_moderation',
+                condition=models.Q(status=WTBRequestStatus.MODERATION)),
+        ]
+
+    TRACKED_FIELDS = ('name', 'status', 'price', 'network', 'token_type')
+    LISTING_FIELDS = {'name', 'status', 'price', 'network', 'token_type'}
+    SEARCH_SUGGESTION_FIELDS = {'name', 'status'}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            field: value for field, value in zip(field_names, values)
+            if field in cls.TRACKED_FIELDS
+        }
+        return instance
+
+    def get_changed_fields(self):
+        loaded_values = getattr(self, '_loaded_values', None)
+        if self._state.adding or loaded_values is None:
+            return set(self.TRACKED_FIELDS)
+        return {
+            field for field, value in loaded_values.items()
+            if getattr(self, field) != value
+        }
+
+    def save(self, *args, **kwargs):
+        changed_fields = self.get_changed_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            changed_fields &= {
+                self._meta.get_field(field).attname
+                for field in update_fields}
+        loaded_values = getattr(self, '_loaded_values', None) or dict()
+        was_active = loaded_values.get('status') == WTBRequestStatus.ACTIVE
+        super().save(*args, **kwargs)
+        if changed_fields & self.SEARCH_SUGGESTION_FIELDS:
+            SearchSuggestion.objects.update_for(
+                SearchSuggestionKind.WTB, self.pk, self.name,
+                self.is_active() and self.account.is_active)
+        listing_changed_fields = changed_fields & self.LISTING_FIELDS
+        if listing_changed_fields and (was_active or self.is_active()):
+            invalidate_search_cache()
+            invalidate_index_fragments(INDEX_FRAGMENT_WTB_REQUESTS, [
+                self.token_type,
+                loaded_values.get('token_type', self.token_type)
+            ])
+        self._loaded_values = {
+            field: getattr(self, field) for field in self.TRACKED_FIELDS}
 
     def set_deleted(self):
         self.status = WTBRequestStatus.DELETED
         self.save()
 
+    def is_active(self):
+        return self.status == WTBRequestStatus.ACTIVE
+
     def is_long_name(self):
         return len(self.name) > NAME_LIMIT
 
@@ -1411,6 +2149,7 @@ class NotifyEvent(models.TextChoices):
 
 class NotificationStatus(models.TextChoices):
     NEW = 'new', 'New notification'
+    SENDING = 'sending', 'Sending notification'
     SENT = 'sent', 'Sent notification'
 
 
@@ -1436,6 +2175,23 @@ class NotificationQuerySet(models.QuerySet):
     def unseen(self):
         return self.filter(is_seen=False)
 
+    def with_offer_status(self):
+        return self.annotate(offer_status=models.F('offer__status'))
+
+    def mentioning(self, account):
+        return self.exclude(notification_type=NotificationType.WTS)\
+            .filter(models.Q(offer__seller=account)
+                    | models.Q(offer__buyer=account))
+
+    def unseen_counters(self, account_id):
+        unseen = self.filter(account_id=account_id).unseen()
+        return unseen.aggregate(**{
+            AccountCounters.unseen_notifications_field(notification_type):
+                models.Count('pk', filter=models.Q(
+                    notification_type=notification_type))
+            for notification_type in NotificationType.values
+        })
+
 
 class NotificationManager(models.Manager):
     def get_queryset(self):
@@ -1456,6 +2212,120 @@ class NotificationManager(models.Manager):
     def unseen(self):
         return self.get_queryset().unseen()
 
+    def with_offer_status(self):
+        return self.get_queryset().with_offer_status()
+
+    def mentioning(self, account):
+        return self.get_queryset().mentioning(account)
+
+    def load_contragents(self, notifications, account):
+        offer_ids = {
+            notification.get_contragent_offer_id()
+            for notification in notifications
+        }
+        offers = Offer.objects.filter(pk__in=offer_ids - {None})\
+            .only('pk', 'seller_id', 'buyer_id')\
+            .in_bulk()
+        contragent_ids = {
+            notification: notification.get_contragent_id(
+                offers.get(notification.get_contragent_offer_id()), account)
+            for notification in notifications
+        }
+        cards = Account.objects\
+            .filter(pk__in=set(contragent_ids.values()) | {account.pk})\
+            .annotate(avatar_image=avatar_image_subquery('pk'))\
+            .in_bulk()
+        if account.pk in cards:
+            account.set_avatar_image(cards[account.pk].avatar_image)
+            cards[account.pk] = account
+        for notification, contragent_id in contragent_ids.items():
+            contragent = cards.get(contragent_id, account)
+            if contragent is not account:
+                contragent.set_avatar_image(contragent.avatar_image)
+            notification.contragent = contragent
+
+    def refresh_messages(
+            self, notifications,
+            batch_size=NOTIFICATION_REFRESH_BATCH_SIZE):
+        notifications = notifications\
+            .select_related(
+                'account', 'offer', 'offer__seller', 'offer__buyer',
+                'wtb_request')\
+            .order_by('pk')
+        total = 0
+        last_pk = 0
+        while True:
+            batch = list(notifications.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            for notification in batch:
+                notification.messages = notification.build_messages()
+            self.bulk_update(batch, ['messages'])
+            total += len(batch)
+            last_pk = batch[-1].pk
+        return total
+
+    def unseen_counters(self, account_id):
+        return self.get_queryset().unseen_counters(account_id)
+
+    def claim_new(self, batch_size):
+        # The claimed rows are committed as being sent, so no lock is held
+        # while they are delivered.
+        with transaction.atomic():
+            notifications = self.get_queryset()\
+                .filter(status=NotificationStatus.NEW)\
+                .with_offer_status()\
+                .order_by('pk')\
+                .select_for_update(
+                    skip_locked=True, of=('self',))[:batch_size]
+            notifications = list(notifications)
+            self.filter(pk__in=[
+                notification.pk for notification in notifications
+            ]).update(
+                status=NotificationStatus.SENDING,
+                claimed_at=timezone.now())
+        return notifications
+
+    def release(self, notifications):
+        return self.filter(pk__in=[
+            notification.pk for notification in notifications
+        ]).update(status=NotificationStatus.NEW, claimed_at=None)
+
+    def release_stale(self, before):
+        return self.filter(
+            status=NotificationStatus.SENDING, claimed_at__lt=before
+        ).update(status=NotificationStatus.NEW, claimed_at=None)
+
+    def mark_sent(self, notifications):
+        return self.filter(pk__in=[
+            notification.pk for notification in notifications
+        ]).update(status=NotificationStatus.SENT, claimed_at=None)
+
+    def prune_batch(self, before, batch_size, archive=False):
+        with transaction.atomic():
+            notifications = self.get_queryset()\
+                .filter(created_at__lt=before)\
+                .order_by('pk')\
+                .select_for_update(skip_locked=True)[:batch_size]
+            notifications = list(notifications)
+            if not notifications:
+                return 0
+            if archive:
+                NotificationArchive.objects.bulk_create([
+                    NotificationArchive.from_notification(notification)
+                    for notification in notifications
+                ])
+            self.filter(pk__in=[
+                notification.pk for notification in notifications
+            ]).delete()
+            unseen_counts = Counter(
+                (notification.account_id, notification.notification_type)
+                for notification in notifications
+                if not notification.is_seen)
+            AccountCounters.objects.add_unseen_notifications({
+                key: -count for key, count in unseen_counts.items()})
+        return len(notifications)
+
 
 class Notification(models.Model):
     class Meta:
@@ -1463,6 +2333,19 @@ class Notification(models.Model):
         verbose_name = _('Notification')
         verbose_name_plural = _('Notifications')
         ordering = ['-pk']
+        indexes = [
+            models.Index(
+                fields=['account', 'notification_type', '-id'],
+                name='core_notification_account'),
+            models.Index(
+                fields=['created_at'], name='core_notification_created'),
+            models.Index(
+                fields=['id'], name='core_notification_new',
+                condition=models.Q(status='new')),
+            models.Index(
+                fields=['claimed_at'], name='core_notification_sending',
+                condition=models.Q(status='sending')),
+        ]
 
     offer = models.ForeignKey(
         Offer, verbose_name=_('Offer'), related_name='notifications',
@@ -1483,14 +2366,18 @@ class Notification(models.Model):
     status = models.TextField(
         _('Notification status'), choices=NotificationStatus.choices,
         default=NotificationStatus.NEW)
+    claimed_at = models.DateTimeField(
+        _('Claimed for delivery'), blank=True, null=True)
     created_at = models.DateTimeField(auto_now=True)
     is_seen = models.BooleanField(
         _('Notification is seen'), blank=True, default=False)
+    messages = models.JSONField(
+        _('Rendered messages'), blank=True, default=dict)
 
     objects = NotificationManager()
 
     @staticmethod
-    def add_event(notify_event, account, **kwargs):
+    def make_event(notify_event, account, **kwargs):
         offer = kwargs.get('offer')
         wtb_request = kwargs.get('wtb_request')
         if offer:
@@ -1504,15 +2391,65 @@ class Notification(models.Model):
             notification_type = NotificationType.WTS
         if notify_event in NotifyEvent.wtb_events():
             notification_type = NotificationType.WTB
+        notification = Notification(
+            account=account, notify_event=notify_event,
+            notification_type=notification_type,
+            offer=offer, wtb_request=wtb_request,
+            object_id=object_id
+        )
+        return notification
+
+    @staticmethod
+    def add_event(notify_event, account, **kwargs):
+        Notification.add_events([
+            Notification.make_event(notify_event, account, **kwargs)])
+
+    @staticmethod
+    def create_events(notifications):
+        # The rows and their counters are written in one savepoint, so an
+        # error leaves neither of them behind.
         try:
-            Notification.objects.create(
-                account=account, notify_event=notify_event,
-                notification_type=notification_type,
-                offer=offer, wtb_request=wtb_request,
-                object_id=object_id
-            )
+            with transaction.atomic():
+                Notification.objects.bulk_create(notifications)
+                AccountCounters.objects.add_unseen_notifications(Counter(
+                    (notification.account_id, notification.notification_type)
+                    for notification in notifications))
         except Exception:
-            pass
+            for notification in notifications:
+                notification.pk = None
+                notification._state.adding = True
+            raise
+
+    @staticmethod
+    def add_events(notifications):
+        """
+        Stores the notifications without breaking the action that emitted
+        them. When the batch fails, every notification is retried on its
+        own; the ones that still fail are logged and dropped. Only the
+        accounts of stored notifications are pushed.
+        """
+        for notification in notifications:
+            notification.prerender_messages()
+        created = []
+        try:
+            Notification.create_events(notifications)
+            created = notifications
+        except Exception:
+            logger.exception(
+                'Cannot add a batch of %d notifications', len(notifications))
+            for notification in notifications:
+                try:
+                    Notification.create_events([notification])
+                except Exception:
+                    logger.exception(
+                        'Dropped %s notification of account %s',
+                        notification.notify_event, notification.account_id)
+                else:
+                    created.append(notification)
+        publish([
+            notification.account_id for notification in created
+        ], PUSH_NOTIFICATION)
+        return created
 
     def is_wtb(self):
         return self.notification_type == NotificationType.WTB
@@ -1520,10 +2457,19 @@ class Notification(models.Model):
     def is_wtb_offer(self):
         return self.notify_event == NotifyEvent.WTB_REQUEST_OFFER
 
-    def render_message(self):
+    def prerender_messages(self):
+        # Rendering problems must not break the action that emitted the
+        # event; messages left empty are rendered when they are read.
+        try:
+            self.messages = self.build_messages()
+        except Exception:
+            logger.exception(
+                'Cannot render %s notification', self.notify_event)
+            self.messages = dict()
+
+    def build_messages(self):
         profile_id = None
         username = None
-        offer_link_class = 'default'
         if self.notification_type == NotificationType.WTB:
             obj = self.wtb_request
             if self.offer_id:
@@ -1531,12 +2477,8 @@ class Notification(models.Model):
                 seller = obj.seller
                 profile_id = seller.pk
                 username = str(seller)
-                if obj.is_deleted():
-                    offer_link_class = 'js-deleted-offer-link'
         if self.notification_type == NotificationType.WTS:
             obj = self.offer
-            if obj.is_deleted():
-                offer_link_class = 'js-deleted-offer-link'
         if self.notification_type == NotificationType.DEAL:
             obj = self.offer
             seller = obj.seller
@@ -1550,13 +2492,103 @@ class Notification(models.Model):
             else:
                 profile_id = seller.pk
                 username = str(seller)
-            if obj.is_deleted():
-                offer_link_class = 'js-deleted-offer-link'
         name = str(obj)
-        return NOTIFICATION_MESSAGES[self.notify_event].format(
-            offer_id=self.offer_id,
-            name=name,
-            profile_id=profile_id,
-            username=username,
-            offer_link_class=offer_link_class
-        )
+        messages = dict()
+        for language, language_name in settings.LANGUAGES:
+            with translation.override(language):
+                messages[language] = _(
+                    NOTIFICATION_MESSAGES[self.notify_event]).format(
+                        offer_id=self.offer_id,
+                        name=name,
+                        profile_id=profile_id,
+                        username=username,
+                        offer_link_class=OFFER_LINK_CLASS_PLACEHOLDER
+                    )
+        return messages
+
+    def get_contragent_offer_id(self):
+        if self.is_wtb():
+            return self.offer_id if self.is_wtb_offer() else None
+        return self.object_id
+
+    def get_contragent_id(self, offer, account):
+        if offer is None:
+            return account.pk
+        if self.is_wtb():
+            return offer.seller_id
+        if offer.seller_id == account.pk:
+            return offer.buyer_id or account.pk
+        return offer.seller_id or account.pk
+
+    def get_offer_status(self):
+        if hasattr(self, 'offer_status'):
+            return self.offer_status
+        return self.offer.status
+
+    def render_message(self):
+        messages = self.messages or self.build_messages()
+        message = messages.get(translation.get_language())\
+            or messages[settings.LANGUAGE_CODE]
+        offer_link_class = 'default'
+        if (
+                self.offer_id
+                and self.get_offer_status() == OfferStatus.DELETED):
+            offer_link_class = 'js-deleted-offer-link'
+        return message.replace(OFFER_LINK_CLASS_PLACEHOLDER, offer_link_class)
+
+
+class NotificationArchive(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    account = models.ForeignKey(
+        Account, verbose_name=_('Account'),
+        related_name='archived_notifications', on_delete=models.CASCADE)
+    offer_id = models.BigIntegerField(blank=True, null=True)
+    wtb_request_id = models.BigIntegerField(blank=True, null=True)
+    object_id = models.BigIntegerField()
+    notification_type = models.TextField(
+        _('Notification type'), choices=NotificationType.choices)
+    notify_event = models.TextField(
+        _('Notify event'), choices=NotifyEvent.choices)
+    created_at = models.DateTimeField()
+    is_seen = models.BooleanField(default=False)
+    messages = models.JSONField(blank=True, default=dict)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'core_notification_archive'
+        verbose_name = _('Archived Notification')
+        verbose_name_plural = _('Archived Notifications')
+
+    @staticmethod
+    def from_notification(notification):
+        return NotificationArchive(
+            id=notification.pk,
+            account_id=notification.account_id,
+            offer_id=notification.offer_id,
+            wtb_request_id=notification.wtb_request_id,
+            object_id=notification.object_id,
+            notification_type=notification.notification_type,
+            notify_event=notification.notify_event,
+            created_at=notification.created_at,
+            is_seen=notification.is_seen,
+            messages=notification.messages)
+
+
+class ChainCursorManager(models.Manager):
+    def lock(self, network, start_block):
+        return self.select_for_update().get_or_create(
+            network=network, defaults={'block_number': start_block})
+
+
+class ChainCursor(models.Model):
+    network = models.TextField(
+        _('Network'), choices=BlockchainNetwork.choices, unique=True)
+    block_number = models.BigIntegerField(_('Last indexed block'))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ChainCursorManager()
+
+    class Meta:
+        db_table = 'core_chain_cursor'
+        verbose_name = _('Chain Cursor')
+        verbose_name_plural = _('Chain Cursors')
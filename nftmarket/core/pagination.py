@@ -0,0 +1,135 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.core.exceptions import SuspiciousOperation, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: str
+    has_more: bool
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def encode_cursor(values):
+    # DjangoJSONEncoder cuts datetimes to milliseconds, which would break
+    # the equality steps of the keyset filter.
+    values = [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in values
+    ]
+    cursor_json = json.dumps(values, cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(cursor_json.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        cursor_json = base64.urlsafe_b64decode(cursor.encode())
+        values = json.loads(cursor_json)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise SuspiciousOperation('invalid cursor')
+    if not isinstance(values, list):
+        raise SuspiciousOperation('invalid cursor')
+    return values
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over a fixed ordering. Every page is fetched with a
+    WHERE clause on the last seen row of the previous page, so the cost
+    does not grow with the page number and rows inserted meanwhile are
+    neither skipped nor repeated. The ordering must end with a unique
+    non-null field (usually pk). NULL values of the other fields, e.g.
+    behind a LEFT JOIN, sort last in both directions.
+    """
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = [
+            (field.lstrip('-'), field.startswith('-')) for field in ordering]
+        self.per_page = per_page
+
+    def _key_name(self, index):
+        return f'keyset_{index}'
+
+    def _keyed_queryset(self):
+        annotations = {
+            self._key_name(index): models.F(field)
+            for index, (field, _) in enumerate(self.ordering)
+        }
+        order_by = [
+            models.F(self._key_name(index)).desc(nulls_last=True)
+            if descending
+            else models.F(self._key_name(index)).asc(nulls_last=True)
+            for index, (_, descending) in enumerate(self.ordering)
+        ]
+        return self.queryset.annotate(**annotations).order_by(*order_by)
+
+    def _cursor_values(self, queryset, cursor):
+        # Every value is checked against the field it is compared with, so
+        # a forged cursor fails here instead of inside the query.
+        values = decode_cursor(cursor)
+        if len(values) != len(self.ordering):
+            raise SuspiciousOperation('invalid cursor')
+        annotations = queryset.query.annotations
+        try:
+            return [
+                None if value is None
+                else annotations[self._key_name(index)].output_field
+                .to_python(value)
+                for index, value in enumerate(values)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise SuspiciousOperation('invalid cursor')
+
+    def _equal_filter(self, index, value):
+        if value is None:
+            return models.Q(**{f'{self._key_name(index)}__isnull': True})
+        return models.Q(**{self._key_name(index): value})
+
+    def _after_filter(self, values):
+        after_filter = models.Q(pk__in=[])
+        for index, (_, descending) in enumerate(self.ordering):
+            if values[index] is None:
+                # Nothing sorts after NULL on this key.
+                continue
+            lookup = 'lt' if descending else 'gt'
+            step_filter = models.Q(**{
+                f'{self._key_name(index)}__{lookup}': values[index]})
+            if index < len(self.ordering) - 1:
+                # The last, unique key is never NULL.
+                step_filter |= models.Q(**{
+                    f'{self._key_name(index)}__isnull': True})
+            for prev_index in range(index):
+                step_filter &= self._equal_filter(
+                    prev_index, values[prev_index])
+            after_filter |= step_filter
+        return after_filter
+
+    def get_page(self, cursor=None):
+        queryset = self._keyed_queryset()
+        if cursor:
+            queryset = queryset.filter(self._after_filter(
+                self._cursor_values(queryset, cursor)))
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        if has_more:
+            object_list = object_list[:-1]
+        next_cursor = None
+        if has_more:
+            last_object = object_list[-1]
+            next_cursor = encode_cursor([
+                getattr(last_object, self._key_name(index))
+                for index in range(len(self.ordering))
+            ])
+        return KeysetPage(object_list, next_cursor, has_more)
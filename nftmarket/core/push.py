@@ -0,0 +1,59 @@
+import json
+from functools import lru_cache
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.db import transaction
+
+
+PUSH_DEAL = 'deal'
+PUSH_NOTIFICATION = 'notification'
+PUSH_MESSAGE = 'backend_message'
+
+
+def push_channel(account_id):
+    return f'push:account:{account_id}'
+
+
+@lru_cache(maxsize=None)
+def _get_client():
+    return redis.Redis.from_url(settings.PUSH_URL)
+
+
+def _publish(account_ids, event, data):
+    client = _get_client()
+    payload = json.dumps(dict(event=event, data=data))
+    for account_id in account_ids:
+        try:
+            client.publish(push_channel(account_id), payload)
+        except redis.RedisError:
+            pass
+
+
+def publish(account_ids, event, data=None):
+    if not settings.PUSH_URL:
+        return
+    account_ids = set(filter(None, account_ids))
+    if account_ids:
+        transaction.on_commit(
+            lambda: _publish(account_ids, event, data or dict()))
+
+
+async def account_events(account_id):
+    client = redis.asyncio.Redis.from_url(settings.PUSH_URL)
+    pubsub = client.pubsub()
+    await pubsub.subscribe(push_channel(account_id))
+    try:
+        while True:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True,
+                timeout=settings.PUSH_HEARTBEAT_SECONDS)
+            if message is None:
+                yield None
+            else:
+                yield json.loads(message['data'])
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
+        await client.aclose()
@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import transaction
+from web3.exceptions import ContractLogicError
+
+from nftmarket.core.chain import (
+    fetch_contract_deal, fetch_contract_deals, get_chain,
+    get_escrow_contract, get_multicall_contract, get_network_escrow_contract,
+    get_network_multicall_contract)
+from nftmarket.core.models import Deal
+
+
+@dataclass
+class ReconcileResult:
+    checked: int = 0
+    confirmed: list = field(default_factory=list)
+    mismatches: list = field(default_factory=list)
+
+
+def pending_hash_ids(network):
+    return list(
+        Deal.objects.awaiting_deposit()
+        .filter(offer__network=network)
+        .exclude(hash_id=None)
+        .exclude(hash_id='')
+        .values_list('hash_id', flat=True))
+
+
+def fetch_pending_contract_deals(
+        contract, multicall, hash_ids, batch_size=None):
+    """
+    Reads the on-chain state of the deals, in Multicall3 batches when a
+    multicall contract is given and one getDeal call per deal otherwise.
+    Hashes whose call reverted are left out of the result.
+    """
+    if multicall is not None:
+        return fetch_contract_deals(
+            contract, multicall, hash_ids,
+            batch_size or settings.CHAIN_MULTICALL_BATCH_SIZE)
+    contract_deals = {}
+    for hash_id in hash_ids:
+        try:
+            contract_deals[hash_id] = fetch_contract_deal(contract, hash_id)
+        except ContractLogicError:
+            pass
+    return contract_deals
+
+
+def confirm_pending_deals(network, hash_ids, contract_deals):
+    """
+    Applies the on-chain state read beforehand to the deals that still
+    wait for a deposit. Must run in a transaction: the deals are locked,
+    and every deposit found is confirmed, so a deal whose buyer and seller
+    both deposited moves past both steps at once.
+    """
+    result = ReconcileResult(checked=len(hash_ids))
+    deals = Deal.objects.awaiting_deposit()\
+        .filter(hash_id__in=hash_ids, offer__network=network)\
+        .select_related('offer', 'offer__seller', 'offer__buyer')\
+        .select_for_update(of=('self',))\
+        .order_by('pk')
+    for deal in deals:
+        contract_deal = contract_deals.get(deal.hash_id)
+        if contract_deal is None:
+            result.mismatches.append((deal, 'getDeal call failed'))
+            continue
+        confirmed = False
+        while deal.confirm_deposit(contract_deal):
+            confirmed = True
+        if confirmed:
+            result.confirmed.append(deal)
+        else:
+            mismatch = deal.contract_mismatch(contract_deal)
+            if mismatch:
+                result.mismatches.append((deal, mismatch))
+    return result
+
+
+def reconcile_deals(
+        network, w3_chain=None, escrow_addr=None, multicall_addr=None,
+        batch_size=None):
+    """
+    Checks every deal of the network that waits for a deposit against the
+    escrow contract. The getDeal results are read in Multicall3 batches,
+    deposits found on chain are confirmed and deals whose on-chain state
+    contradicts the database are reported as (deal, reason) pairs.
+    """
+    w3_chain = w3_chain or get_chain(network)
+    contract = get_escrow_contract(w3_chain, escrow_addr)\
+        if escrow_addr else get_network_escrow_contract(network)
+    multicall = get_multicall_contract(w3_chain, multicall_addr)\
+        if multicall_addr else get_network_multicall_contract(network)
+    hash_ids = pending_hash_ids(network)
+    contract_deals = fetch_pending_contract_deals(
+        contract, multicall, hash_ids, batch_size)
+    with transaction.atomic():
+        return confirm_pending_deals(network, hash_ids, contract_deals)
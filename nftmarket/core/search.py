@@ -0,0 +1,95 @@
+import hashlib
+import json
+
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity)
+from django.db import models
+from django.db.models.functions import Cast, Coalesce, Upper
+
+from nftmarket.core.caching import bump_generation, get_generation
+
+
+SEARCH_CONFIG = 'simple'
+TRIGRAM_MIN_LENGTH = 3
+SEARCH_CACHE_TIMEOUT = 300
+SEARCH_CACHE_GENERATION_KEY = 'search:generation'
+
+
+def make_search_query(search_text):
+    return SearchQuery(
+        search_text, config=SEARCH_CONFIG, search_type='websearch')
+
+
+def make_offer_search_vector(name, details):
+    return (
+        SearchVector(
+            models.Value(name, output_field=models.TextField()),
+            config=SEARCH_CONFIG, weight='A')
+        + SearchVector(
+            models.Value(details, output_field=models.TextField()),
+            config=SEARCH_CONFIG, weight='B'))
+
+
+def make_name_search_vector(field_name):
+    return SearchVector(field_name, config=SEARCH_CONFIG)
+
+
+def make_name_trigram(field_name):
+    return Upper(field_name)
+
+
+def offer_search_filter(search_text, search_term, prefix=''):
+    term_field = f'{prefix}term'
+    vector_field = f'{prefix}search_vector'
+    search_filter = models.Q(**{f'{term_field}__contains': search_term})
+    if search_text.strip():
+        search_filter |= models.Q(
+            **{vector_field: make_search_query(search_text)})
+    if len(search_term) >= TRIGRAM_MIN_LENGTH:
+        search_filter |= models.Q(
+            **{f'{term_field}__trigram_word_similar': search_term})
+    return search_filter
+
+
+def offer_search_rank(search_text, search_term, prefix=''):
+    rank = Coalesce(
+        SearchRank(
+            models.F(f'{prefix}search_vector'),
+            make_search_query(search_text)),
+        0.0, output_field=models.FloatField()
+    ) + TrigramWordSimilarity(search_term, f'{prefix}term')
+    return Cast(rank, models.FloatField())
+
+
+def name_search_filter(search_text, search_term):
+    search_filter = models.Q(search_name_trigram__contains=search_term)
+    if search_text.strip():
+        search_filter |= models.Q(
+            search_name_vector=make_search_query(search_text))
+    if len(search_term) >= TRIGRAM_MIN_LENGTH:
+        search_filter |= models.Q(
+            search_name_trigram__trigram_word_similar=search_term)
+    return search_filter
+
+
+def name_search_rank(search_text, search_term):
+    rank = SearchRank(
+        models.F('search_name_vector'), make_search_query(search_text)
+    ) + TrigramWordSimilarity(search_term, 'search_name_trigram')
+    return Cast(rank, models.FloatField())
+
+
+def invalidate_search_cache():
+    bump_generation(SEARCH_CACHE_GENERATION_KEY)
+
+
+def normalize_search_text(search_text):
+    return ' '.join(search_text.lower().split())
+
+
+def search_cache_key(kind, search_text, *params):
+    key_params = json.dumps(
+        [normalize_search_text(search_text), *params], sort_keys=True)
+    key_hash = hashlib.md5(key_params.encode()).hexdigest()
+    generation = get_generation(SEARCH_CACHE_GENERATION_KEY)
+    return f'search:{generation}:{kind}:{key_hash}'
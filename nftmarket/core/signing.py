@@ -0,0 +1,91 @@
+from functools import lru_cache
+
+from django.conf import settings
+from eth_abi import encode
+from eth_keys import keys
+from eth_utils import keccak, to_bytes, to_hex
+
+from nftmarket.core.models import Deal
+
+
+DEAL_DOMAIN_NAME = 'Deal'
+DEAL_DOMAIN_VERSION = '1'
+EIP712_DOMAIN_TYPE = 'EIP712Domain(string name,string version,' \
+    'uint256 chainId,address verifyingContract)'
+DEAL_TYPE = 'Deal(address seller,address buyer,uint256 price,uint256 fee,' \
+    'uint256 collateral,uint256 timestamp)'
+DEAL_TYPE_HASH = keccak(text=DEAL_TYPE)
+DEAL_STRUCT_TYPES = (
+    'bytes32', 'address', 'address',
+    'uint256', 'uint256', 'uint256', 'uint256')
+
+
+@lru_cache(maxsize=None)
+def get_domain_separator(network):
+    chain_settings = settings.NETWORKS[network]
+    return keccak(encode(
+        ('bytes32', 'bytes32', 'bytes32', 'uint256', 'address'),
+        (keccak(text=EIP712_DOMAIN_TYPE),
+         keccak(text=DEAL_DOMAIN_NAME),
+         keccak(text=DEAL_DOMAIN_VERSION),
+         chain_settings['chain_id'],
+         chain_settings['escrow_addr'])))
+
+
+@lru_cache(maxsize=None)
+def get_signer_key():
+    return keys.PrivateKey(to_bytes(hexstr=settings.SIGNER_KEY))
+
+
+def make_deal_message(deal):
+    offer = deal.offer
+    token_decimals = settings.NETWORKS[offer.network]['token_decimals']
+    return {
+        'seller': offer.seller.wallet,
+        'buyer': offer.buyer.wallet,
+        'price': int(offer.price * pow(10, token_decimals)),
+        'fee': int(deal.fee * pow(10, token_decimals)),
+        'collateral': int(offer.collateral * pow(10, token_decimals)),
+        'timestamp': deal.start_timestamp()
+    }
+
+
+def deal_digest(network, message):
+    """
+    EIP-712 hash of a Deal message. Only the struct is encoded per call;
+    the domain separator and the type hash are computed once.
+    """
+    struct_hash = keccak(encode(DEAL_STRUCT_TYPES, (
+        DEAL_TYPE_HASH, message['seller'], message['buyer'],
+        message['price'], message['fee'], message['collateral'],
+        message['timestamp'])))
+    return keccak(b'\x19\x01' + get_domain_separator(network) + struct_hash)
+
+
+def sign_digest(digest):
+    signature = get_signer_key().sign_msg_hash(digest)
+    return signature.to_bytes()[:64] + bytes([signature.v + 27])
+
+
+def sign_deals(deals):
+    """
+    Signs the deals for the escrow contract and stores their hash ids with
+    a single UPDATE. Returns the signed deal objects in the same order.
+    """
+    deal_objs = []
+    for deal in deals:
+        deal_obj = make_deal_message(deal)
+        digest = deal_digest(deal.offer.network, deal_obj)
+        deal.hash_id = to_hex(digest)
+        deal_obj['signature'] = to_hex(sign_digest(digest))
+        deal_obj['price'] = str(deal_obj['price'])
+        deal_obj['collateral'] = str(deal_obj['collateral'])
+        deal_obj['fee'] = str(deal_obj['fee'])
+        deal_objs.append(deal_obj)
+    Deal.objects.bulk_update(deals, ['hash_id'])
+    return deal_objs
+
+
+def sign_deal(deal):
+    deal_obj, = sign_deals([deal])
+    return deal_obj
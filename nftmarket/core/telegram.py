@@ -0,0 +1,166 @@
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+import bleach
+import requests
+from django.conf import settings
+from django.utils import timezone
+
+from nftmarket.core.models import AccountTelegramLink, Notification
+
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+TELEGRAM_TIMEOUT_SECONDS = 10
+TELEGRAM_CHAT_BUCKETS_LIMIT = 10000
+
+
+class TokenBucket:
+    """
+    Allows `rate` calls per second on average with bursts up to
+    `capacity`; take() sleeps until a token is available.
+    """
+    def __init__(self, rate, capacity=None, clock=time.monotonic,
+                 sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated_at = clock()
+
+    def refill(self):
+        now = self.clock()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def is_full(self):
+        self.refill()
+        return self.tokens >= self.capacity
+
+    def take(self):
+        while True:
+            self.refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            self.sleep((1 - self.tokens) / self.rate)
+
+
+class TelegramClient:
+    def __init__(self, token=None, api_url=None, bucket=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.token = token or settings.TELEGRAM_BOT_TOKEN
+        self.api_url = api_url or settings.TELEGRAM_API_URL
+        self.clock = clock
+        self.sleep = sleep
+        self.bucket = bucket or TokenBucket(
+            settings.TELEGRAM_MESSAGES_PER_SECOND, clock=clock, sleep=sleep)
+        self.chat_buckets = dict()
+        self.session = requests.Session()
+
+    def chat_bucket(self, chat_id):
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self.chat_buckets) >= TELEGRAM_CHAT_BUCKETS_LIMIT:
+                # A full bucket has no effect, so it can be dropped.
+                self.chat_buckets = {
+                    chat_id: bucket
+                    for chat_id, bucket in self.chat_buckets.items()
+                    if not bucket.is_full()
+                }
+            bucket = self.chat_buckets[chat_id] = TokenBucket(
+                settings.TELEGRAM_CHAT_MESSAGES_PER_SECOND, capacity=1,
+                clock=self.clock, sleep=self.sleep)
+        return bucket
+
+    def send_message(self, chat_id, text):
+        """
+        Returns True when the message is delivered or can never be (chat
+        blocked or gone), False when it should be retried later.
+        """
+        url = f'{self.api_url}/bot{self.token}/sendMessage'
+        payload = dict(
+            chat_id=chat_id, text=text, parse_mode='HTML',
+            disable_web_page_preview=True)
+        for attempt in range(2):
+            self.chat_bucket(chat_id).take()
+            self.bucket.take()
+            try:
+                response = self.session.post(
+                    url, json=payload, timeout=TELEGRAM_TIMEOUT_SECONDS)
+            except requests.RequestException:
+                return False
+            if response.status_code == 429 and attempt == 0:
+                retry_after = response.json()\
+                    .get('parameters', dict()).get('retry_after', 1)
+                self.sleep(retry_after)
+                continue
+            if response.status_code in (400, 403):
+                return True
+            return response.ok
+        return False
+
+
+def telegram_text(notification):
+    text = bleach.clean(
+        notification.render_message(), tags=['a'],
+        attributes={'a': ['href']}, strip=True)
+    return text.replace('href="/', f'href="{settings.SITE_URL}/')
+
+
+def telegram_chunks(notifications):
+    """
+    Joins the notification texts into messages under the Telegram limit
+    and yields (text, notifications of the message) pairs.
+    """
+    chunk = ''
+    chunk_notifications = list()
+    for notification in notifications:
+        line = telegram_text(notification)
+        if chunk and len(chunk) + len(line) + 1 > TELEGRAM_MESSAGE_LIMIT:
+            yield chunk, chunk_notifications
+            chunk = ''
+            chunk_notifications = list()
+        chunk = f'{chunk}\n{line}' if chunk else line
+        chunk_notifications.append(notification)
+    if chunk:
+        yield chunk, chunk_notifications
+
+
+def deliver_notifications(client, batch_size):
+    """
+    Claims a batch of new notifications and sends them grouped per chat,
+    outside of any transaction. Every message is marked as sent once
+    Telegram accepts it; after a failed message the rest of its chat goes
+    back to new, so a later batch never repeats what was delivered. Rows
+    left claimed by a crashed sender are released after
+    TELEGRAM_SENDING_TIMEOUT. Returns the number marked as sent.
+    """
+    Notification.objects.release_stale(
+        timezone.now() - timedelta(seconds=settings.TELEGRAM_SENDING_TIMEOUT))
+    notifications = Notification.objects.claim_new(batch_size)
+    if not notifications:
+        return 0
+    chat_ids = AccountTelegramLink.objects.chat_ids({
+        notification.account_id for notification in notifications})
+    unlinked = list()
+    by_chat = defaultdict(list)
+    for notification in notifications:
+        chat_id = chat_ids.get(notification.account_id)
+        if chat_id is None:
+            unlinked.append(notification)
+        else:
+            by_chat[chat_id].append(notification)
+    sent = Notification.objects.mark_sent(unlinked)
+    for chat_id, chat_notifications in by_chat.items():
+        delivered = 0
+        for text, chunk_notifications in telegram_chunks(chat_notifications):
+            if not client.send_message(chat_id, text):
+                Notification.objects.release(chat_notifications[delivered:])
+                break
+            sent += Notification.objects.mark_sent(chunk_notifications)
+            delivered += len(chunk_notifications)
+    return sent
@@ -3,13 +3,29 @@ from django.utils import timezone
 from django.template.defaultfilters import stringfilter
 from django.utils.translation import gettext as _
 
-from nftmarket.core.models import Offer
 from nftmarket.core.utils import fix_words
 
 
 register = template.Library()
 
 
+SEARCH_CURSOR_PARAMS = ('after', 'wtb_after')
+
+
+@register.simple_tag(takes_context=True)
+def search_querystring(context, **kwargs):
+    params = context['request'].GET.copy()
+    for param in SEARCH_CURSOR_PARAMS:
+        if param not in kwargs:
+            params.pop(param, None)
+    for param, value in kwargs.items():
+        if value is None or value == '':
+            params.pop(param, None)
+        else:
+            params[param] = value
+    return params.urlencode()
+
+
 @stringfilter
 @register.filter
 def priceformat(price_val):
@@ -73,20 +89,3 @@ def naturaltimefix(text):
         ago_text = _('ago')
         text = f'{text} {ago_text}'
     return text
-
-
-@register.filter
-def notification_contragent(notification, account):
-    if notification.is_wtb():
-        if notification.is_wtb_offer():
-            return notification.offer.seller
-        else:
-            return account
-    offer = Offer.objects.get(pk=notification.object_id)
-    if offer.seller_id == account.pk:
-        if offer.buyer_id:
-            return offer.buyer
-    else:
-        if offer.seller_id:
-            return offer.seller
-    return account
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from nftmarket.core.models import (
+    Account, AccountCounters, Offer, OfferStatus, TokenType)
+
+
+class DealCountersTest(TestCase):
+    def setUp(self):
+        self.seller = Account.objects.get_wallet('0x' + '01' * 20)
+        self.buyer = Account.objects.get_wallet('0x' + '02' * 20)
+        self.offer = Offer.objects.create(
+            seller=self.seller, buyer=self.buyer, status=OfferStatus.DEAL,
+            offer_type=TokenType.NFT, name='test offer', price=10,
+            collateral=5)
+        seen_at = timezone.now() + timedelta(minutes=1)
+        Offer.objects.filter(pk=self.offer.pk).update(
+            last_seen_seller=seen_at, last_seen_buyer=seen_at)
+        AccountCounters.objects.refresh(self.seller.pk)
+        AccountCounters.objects.refresh(self.buyer.pk)
+
+    def counters(self, account):
+        return AccountCounters.objects.get(account=account)
+
+    def assert_counts(self, account, open_deals, changed_deals):
+        counters = self.counters(account)
+        self.assertEqual(
+            (counters.open_deals, counters.changed_deals),
+            (open_deals, changed_deals))
+        self.assertEqual(
+            Offer.objects.deal_counters(account.pk),
+            dict(open_deals=open_deals, changed_deals=changed_deals))
+
+    def test_stale_saves_count_once(self):
+        # Two requests load the offer before either of them saves it.
+        first = Offer.objects.get(pk=self.offer.pk)
+        second = Offer.objects.get(pk=self.offer.pk)
+        later = timezone.now() + timedelta(minutes=2)
+        first.status_changed_at = later
+        first.save()
+        second.status_changed_at = later + timedelta(seconds=1)
+        second.save()
+        self.assert_counts(self.seller, 1, 1)
+        self.assert_counts(self.buyer, 1, 1)
+
+        Offer.objects.update_last_seen_for(
+            self.buyer, [Offer.objects.get(pk=self.offer.pk)])
+        self.assert_counts(self.buyer, 1, 0)
+
+    def test_stale_status_change_counts_once(self):
+        first = Offer.objects.get(pk=self.offer.pk)
+        second = Offer.objects.get(pk=self.offer.pk)
+        first.status = OfferStatus.CLOSED
+        first.save()
+        second.status = OfferStatus.CLOSED
+        second.save()
+        self.assert_counts(self.seller, 0, 0)
+        self.assert_counts(self.buyer, 0, 0)
+
+    def test_recount_counters(self):
+        AccountCounters.objects.filter(account=self.seller)\
+            .update(open_deals=7, changed_deals=3)
+        call_command('recount_counters', verbosity=0)
+        self.assert_counts(self.seller, 1, 0)
+        self.assert_counts(self.buyer, 1, 0)
@@ -0,0 +1,127 @@
+from unittest import mock, skipUnless
+
+from django.test import TestCase
+from web3 import Web3
+
+from nftmarket.core.abi import get_escrow_abi
+from nftmarket.core.chain import DealClass
+from nftmarket.core.indexer import EscrowIndexer, event_topic
+from nftmarket.core.models import (
+    Account, ChainCursor, Deal, DealStatus, Offer, OfferStatus, TokenType)
+
+try:
+    from web3 import EthereumTesterProvider
+    import eth_tester  # noqa: F401
+except ImportError:
+    EthereumTesterProvider = None
+
+
+# Emits LOG2 with the two calldata words as topics: the event topic and
+# the deal hash. It stands in for the escrow contract events.
+LOG_EMITTER_RUNTIME = '60203560003560006000a200'
+LOG_EMITTER_BYTECODE = '0x600c600c600039600c6000f3' + LOG_EMITTER_RUNTIME
+
+PRICE = 10 * 10 ** 18
+COLLATERAL = 5 * 10 ** 18
+
+
+def contract_deal(buyer_deposited=0, seller_deposited=0, exists=True):
+    return DealClass(
+        seller='', buyer='', price=PRICE, fee=0, collateral=COLLATERAL,
+        timestamp=0, buyer_deposited=buyer_deposited,
+        seller_deposited=seller_deposited, buyer_claim=0, seller_claim=0,
+        claim_time=0, signature=b'', exists=exists, arbitration=False,
+        buyer_completed=False, closed=False)
+
+
+def escrow_event_topic(name):
+    event_abi, = [
+        item for item in get_escrow_abi()
+        if item['type'] == 'event' and item['name'] == name]
+    return event_topic(event_abi)
+
+
+@skipUnless(EthereumTesterProvider, 'eth-tester is not installed')
+class EscrowIndexerTest(TestCase):
+    network = 'bnb'
+
+    def setUp(self):
+        self.w3_chain = Web3(EthereumTesterProvider())
+        self.sender = self.w3_chain.eth.accounts[0]
+        tx_hash = self.w3_chain.eth.send_transaction({
+            'from': self.sender, 'data': LOG_EMITTER_BYTECODE})
+        self.emitter_addr = self.w3_chain.eth\
+            .wait_for_transaction_receipt(tx_hash)['contractAddress']
+        self.indexer = EscrowIndexer(
+            self.network, w3_chain=self.w3_chain,
+            escrow_addr=self.emitter_addr, confirmations=0)
+        seller = Account.objects.create(wallet='0x' + '01' * 20)
+        buyer = Account.objects.create(wallet='0x' + '02' * 20)
+        offer = Offer.objects.create(
+            network=self.network, offer_type=TokenType.NFT, seller=seller,
+            buyer=buyer, status=OfferStatus.DEAL, name='test offer',
+            price=10, collateral=5)
+        self.deal = Deal.objects.create(
+            offer=offer, status=DealStatus.WAITING_BUYER_PAYMENT, fee=0,
+            hash_id='0x' + '11' * 32)
+        self.contract_deals = {}
+
+    def fetch_contract_deals(self, hash_ids):
+        return {
+            hash_id: self.contract_deals[hash_id] for hash_id in hash_ids
+            if hash_id in self.contract_deals
+        }
+
+    def index_next_range(self):
+        with mock.patch.object(
+                self.indexer, 'fetch_contract_deals',
+                side_effect=self.fetch_contract_deals) as fetch:
+            count = self.indexer.index_next_range()
+        return count, fetch
+
+    def emit(self, event_name, hash_id):
+        data = Web3.to_bytes(hexstr=escrow_event_topic(event_name))\
+            + Web3.to_bytes(hexstr=hash_id)
+        tx_hash = self.w3_chain.eth.send_transaction({
+            'from': self.sender, 'to': self.emitter_addr,
+            'data': Web3.to_hex(data)})
+        self.w3_chain.eth.wait_for_transaction_receipt(tx_hash)
+
+    def test_first_run_checks_open_deals(self):
+        # Both deposits were made before the network had a cursor.
+        self.contract_deals[self.deal.hash_id] = contract_deal(
+            buyer_deposited=PRICE, seller_deposited=COLLATERAL)
+        count, fetch = self.index_next_range()
+        self.assertEqual(count, 0)
+        fetch.assert_called_once_with([self.deal.hash_id])
+        cursor = ChainCursor.objects.get(network=self.network)
+        self.assertEqual(cursor.block_number, self.w3_chain.eth.block_number)
+        self.deal.refresh_from_db()
+        self.assertEqual(self.deal.status, DealStatus.WAITING_FOR_COMPLETION)
+
+    def test_both_deposits_in_one_range(self):
+        self.contract_deals[self.deal.hash_id] = contract_deal()
+        self.index_next_range()
+        self.deal.refresh_from_db()
+        self.assertEqual(self.deal.status, DealStatus.WAITING_BUYER_PAYMENT)
+
+        self.emit('BuyerDeposited', self.deal.hash_id)
+        self.emit('SellerDeposited', self.deal.hash_id)
+        self.contract_deals[self.deal.hash_id] = contract_deal(
+            buyer_deposited=PRICE, seller_deposited=COLLATERAL)
+        count, fetch = self.index_next_range()
+        self.assertEqual(count, 2)
+        fetch.assert_called_once_with([self.deal.hash_id])
+        self.deal.refresh_from_db()
+        self.assertEqual(self.deal.status, DealStatus.WAITING_FOR_COMPLETION)
+        cursor = ChainCursor.objects.get(network=self.network)
+        self.assertEqual(cursor.block_number, self.w3_chain.eth.block_number)
+
+    def test_range_without_deposits(self):
+        self.index_next_range()
+        self.w3_chain.provider.ethereum_tester.mine_blocks(3)
+        count, fetch = self.index_next_range()
+        self.assertEqual(count, 3)
+        fetch.assert_called_once_with([])
+        self.deal.refresh_from_db()
+        self.assertEqual(self.deal.status, DealStatus.WAITING_BUYER_PAYMENT)
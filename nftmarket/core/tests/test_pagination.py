@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+
+from django.core.exceptions import SuspiciousOperation
+from django.test import SimpleTestCase, TestCase
+
+from nftmarket.core.models import (
+    Account, AccountRating, Deal, Offer, OfferStatus, TokenType)
+from nftmarket.core.pagination import KeysetPaginator, encode_cursor
+
+
+class KeysetCursorTest(SimpleTestCase):
+    def setUp(self):
+        self.paginator = KeysetPaginator(
+            Deal.objects.all(), ['-offer__status_changed_at', '-pk'], 10)
+        self.queryset = self.paginator._keyed_queryset()
+
+    def cursor_values(self, values):
+        return self.paginator._cursor_values(
+            self.queryset, encode_cursor(values))
+
+    def test_values_are_coerced_to_their_fields(self):
+        changed_at = datetime(2024, 5, 1, 12, 30, 15, 123456, timezone.utc)
+        self.assertEqual(
+            self.cursor_values([changed_at, '42']), [changed_at, 42])
+
+    def test_null_values_are_kept(self):
+        self.assertEqual(self.cursor_values([None, '42']), [None, 42])
+
+    def test_rejects_wrong_length(self):
+        with self.assertRaises(SuspiciousOperation):
+            self.cursor_values([42])
+
+    def test_rejects_values_of_wrong_type(self):
+        for values in (
+                ['yesterday', 42],
+                ['2024-05-01T12:30:15+00:00', 'forty-two'],
+                ['2024-05-01T12:30:15+00:00', [42]]):
+            with self.subTest(values=values):
+                with self.assertRaises(SuspiciousOperation):
+                    self.cursor_values(values)
+
+    def test_rejects_malformed_cursor(self):
+        with self.assertRaises(SuspiciousOperation):
+            self.paginator._cursor_values(self.queryset, 'not a cursor')
+
+
+class KeysetNullOrderingTest(TestCase):
+    def setUp(self):
+        offers = list()
+        for index, rating in enumerate((5, None, 3, None)):
+            seller = Account.objects.create(wallet=f'0x{index:040x}')
+            if rating is not None:
+                AccountRating.objects.create(account=seller, value=rating)
+            offers.append(Offer.objects.create(
+                seller=seller, status=OfferStatus.ACTIVE,
+                offer_type=TokenType.NFT, name=f'offer {index}', price=10,
+                collateral=5))
+        # Rated sellers first, then the sellers without a rating row.
+        self.expected = [offers[0], offers[2], offers[3], offers[1]]
+
+    def pages(self, ordering, per_page):
+        paginator = KeysetPaginator(
+            Offer.objects.all(), ordering, per_page)
+        page = paginator.get_page()
+        object_list = list(page)
+        while page.has_more:
+            page = paginator.get_page(page.next_cursor)
+            object_list.extend(page)
+        return object_list
+
+    def test_null_rating_on_page_boundary(self):
+        for per_page in (1, 2, 3):
+            with self.subTest(per_page=per_page):
+                self.assertEqual(
+                    self.pages(['-seller__rating__value', '-pk'], per_page),
+                    self.expected)
+
+    def test_null_rating_sorts_last_ascending(self):
+        self.assertEqual(
+            self.pages(['seller__rating__value', '-pk'], 1),
+            [self.expected[1], self.expected[0]] + self.expected[2:])
@@ -0,0 +1,165 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase
+
+from nftmarket.core.models import (
+    Account, AccountTelegramLink, Notification, NotificationStatus,
+    NotifyEvent)
+from nftmarket.core.telegram import (
+    TELEGRAM_MESSAGE_LIMIT, TelegramClient, deliver_notifications)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = list()
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class StubTelegramServer:
+    """
+    Answers sendMessage calls with the queued (status, body) responses,
+    200 once they run out, and records the posted payloads.
+    """
+    def __init__(self, responses=()):
+        self.responses = list(responses)
+        self.payloads = list()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers['Content-Length'])
+                stub.payloads.append(json.loads(self.rfile.read(length)))
+                status, body = stub.responses.pop(0)\
+                    if stub.responses else (200, {'ok': True})
+                content = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+def too_many_requests(retry_after):
+    return 429, {
+        'ok': False, 'error_code': 429,
+        'parameters': {'retry_after': retry_after}}
+
+
+def make_client(server, clock):
+    return TelegramClient(
+        token='token', api_url=server.url, clock=clock, sleep=clock.sleep)
+
+
+class TelegramClientTest(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_retries_after_too_many_requests(self):
+        with StubTelegramServer([too_many_requests(3)]) as server:
+            client = make_client(server, self.clock)
+            self.assertTrue(client.send_message(1, 'text'))
+        self.assertEqual(len(server.payloads), 2)
+        self.assertIn(3, self.clock.sleeps)
+
+    def test_gives_up_after_second_too_many_requests(self):
+        with StubTelegramServer([
+                too_many_requests(1), too_many_requests(1)]) as server:
+            client = make_client(server, self.clock)
+            self.assertFalse(client.send_message(1, 'text'))
+        self.assertEqual(len(server.payloads), 2)
+
+    def test_blocked_chat_is_not_retried(self):
+        with StubTelegramServer([(403, {'ok': False})]) as server:
+            client = make_client(server, self.clock)
+            self.assertTrue(client.send_message(1, 'text'))
+        self.assertEqual(len(server.payloads), 1)
+
+    def test_limits_messages_per_chat(self):
+        with StubTelegramServer() as server:
+            client = make_client(server, self.clock)
+            client.send_message(1, 'first')
+            client.send_message(2, 'other chat')
+            self.assertEqual(self.clock.now, 0)
+            client.send_message(1, 'second')
+        self.assertAlmostEqual(
+            self.clock.now, 1 / settings.TELEGRAM_CHAT_MESSAGES_PER_SECOND)
+
+
+class DeliverNotificationsTest(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.account = Account.objects.create(wallet='0x' + '01' * 20)
+        AccountTelegramLink.objects.create(
+            account=self.account, telegram_id=1001)
+        # Every notification fills a Telegram message of its own.
+        self.notifications = [
+            Notification.objects.create(
+                account=self.account, object_id=index,
+                notify_event=NotifyEvent.WTS_OFFER_ACTIVE,
+                messages={
+                    language: f'{index}' * (TELEGRAM_MESSAGE_LIMIT - 100)
+                    for language, _label in settings.LANGUAGES
+                })
+            for index in range(1, 4)
+        ]
+
+    def statuses(self):
+        return [
+            Notification.objects.get(pk=notification.pk).status
+            for notification in self.notifications
+        ]
+
+    def test_partial_failure_resends_only_undelivered(self):
+        with StubTelegramServer([(200, {'ok': True}), (500, {'ok': False})])\
+                as server:
+            client = make_client(server, self.clock)
+            self.assertEqual(deliver_notifications(client, 10), 1)
+        self.assertEqual(len(server.payloads), 2)
+        self.assertEqual(self.statuses(), [
+            NotificationStatus.SENT, NotificationStatus.NEW,
+            NotificationStatus.NEW])
+
+        with StubTelegramServer() as server:
+            client = make_client(server, self.clock)
+            self.assertEqual(deliver_notifications(client, 10), 2)
+        self.assertEqual(
+            [payload['text'][0] for payload in server.payloads], ['2', '3'])
+        self.assertEqual(self.statuses(), [NotificationStatus.SENT] * 3)
+
+    def test_retry_after_is_honoured(self):
+        with StubTelegramServer([too_many_requests(2)]) as server:
+            client = make_client(server, self.clock)
+            self.assertEqual(deliver_notifications(client, 10), 3)
+        self.assertEqual(len(server.payloads), 4)
+        self.assertIn(2, self.clock.sleeps)
+        self.assertEqual(self.statuses(), [NotificationStatus.SENT] * 3)
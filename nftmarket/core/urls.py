@@ -9,6 +9,9 @@ app_name = 'core'
 urlpatterns = [
     path('', core_views.index_view, name='index_page'),
     path('search/', core_views.search_view, name='search_page'),
+    path(
+        'search/suggestions/', core_views.search_suggestions_view,
+        name='search_suggestions'),
     path(
         'my-wts-offers/', core_views.my_wts_offers_view,
         name='my_wts_offers'),
@@ -99,11 +102,14 @@ urlpatterns = [
     path('auth/nonce', core_views.auth_nonce_view),
     path('auth/validate', core_views.auth_validate_view),
     path('logout/', core_views.logout_view, name='logout'),
+    path('push/', core_views.push_view, name='push'),
     path(
         'notifications/', core_views.notifications_view, name='notifications'),
     path(
         'notifications/<slug:notification_type>/<int:page>/',
         core_views.notifications_page_view),
+    path(
+        'notifications/refresh/', core_views.notifications_refresh_view),
     path(
         'notifications/update-seen/<slug:notification_type>/',
         core_views.notifications_update_seen_view),
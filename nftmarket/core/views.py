@@ -1,9 +1,12 @@
 import json
+from functools import cached_property
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import SuspiciousOperation, PermissionDenied
-from django.http import JsonResponse, Http404
+from django.http import JsonResponse, Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.template import loader
 from django.views.decorators.csrf import csrf_exempt
@@ -11,33 +14,118 @@ from eth_account.messages import encode_defunct
 from sorl.thumbnail import get_thumbnail
 from django.utils.translation import gettext as _
 
-from nftmarket.core.chain import (
-    is_valid_address, recover_message, sign_deal, get_contract_deal)
+from nftmarket.core.chain import is_valid_address, recover_message
 from nftmarket.core.forms import AccountForm, OfferForm, WTBRequestForm
 from nftmarket.core.generic import (
     context_view, redirect_view, form_view, json_view)
-from nftmarket.core.helpers import account_required, active_account_required
+from nftmarket.core.helpers import (
+    account_required, active_account_required, has_account)
 from nftmarket.core.models import (
-    Account, AccountAvatar, Offer, Deal, DealFeedback, Notification,
-    NotifyEvent, WTBRequest, NotificationType)
+    Account, AccountAvatar, AccountBackendMessage, Offer, Deal, DealFeedback,
+    Notification, NotifyEvent, WTBRequest, NotificationType,
+    BlockchainNetwork, TokenType, SearchSuggestion, SUGGESTIONS_LIMIT,
+    INDEX_FRAGMENT_OFFERS, INDEX_FRAGMENT_WTB_REQUESTS)
+from nftmarket.core.caching import get_generations, index_fragment_key
+from nftmarket.core.pagination import KeysetPage, KeysetPaginator
+from nftmarket.core.push import account_events
+from nftmarket.core.search import search_cache_key, SEARCH_CACHE_TIMEOUT
+from nftmarket.core.signing import sign_deal
 from nftmarket.core.utils import clean_text
 from nftmarket.core.click_api import get_pixel
 
 
+class _LazyListings:
+    def __init__(self, manager):
+        self.manager = manager
+
+    @cached_property
+    def by_type(self):
+        return self.manager.latest_by_type()
+
+    def __getitem__(self, token_type):
+        return self.by_type[token_type]
+
+
 @context_view('core/index.html')
 def index_view(request):
+    fragment_keys = {
+        f'{kind}_{token_type}': index_fragment_key(kind, token_type)
+        for kind in (INDEX_FRAGMENT_OFFERS, INDEX_FRAGMENT_WTB_REQUESTS)
+        for token_type in TokenType.values
+    }
+    generations = get_generations(list(fragment_keys.values()))
     return {
-        'nft_offers': Offer.objects.latest_nft(),
-        'ido_offers': Offer.objects.latest_ido(),
-        'worker_offers': Offer.objects.latest_worker(),
-        'other_offers': Offer.objects.latest_other(),
-        'nft_wtb_requests': WTBRequest.objects.latest_nft(),
-        'ido_wtb_requests': WTBRequest.objects.latest_ido(),
-        'worker_wtb_requests': WTBRequest.objects.latest_worker(),
-        'other_wtb_requests': WTBRequest.objects.latest_other()
+        'offers': _LazyListings(Offer.objects),
+        'wtb_requests': _LazyListings(WTBRequest.objects),
+        'fragment_generations': {
+            name: generations[key] for name, key in fragment_keys.items()
+        }
     }
 
 
+SEARCH_RESULTS_ON_PAGE = 20
+
+
+def _search_ordering(order_by):
+    if order_by.lstrip('-') == 'pk':
+        return [order_by]
+    return [order_by, '-search_rank', '-pk']
+
+
+def _search_price(params, name):
+    try:
+        price = float(params[name])
+        if price < 0:
+            raise ValueError
+    except (KeyError, ValueError):
+        return None
+    return price
+
+
+def _search_filters(params):
+    network = params.get('network', '')
+    if network not in BlockchainNetwork.values:
+        network = None
+    token_type = params.get('type', '')
+    if token_type not in TokenType.values:
+        token_type = None
+    return {
+        'network': network,
+        'token_type': token_type,
+        'price_min': _search_price(params, 'price_min'),
+        'price_max': _search_price(params, 'price_max')
+    }
+
+
+def _search_page(model, search_text, order_by, search_filters, cursor):
+    cache_key = search_cache_key(
+        model._meta.model_name, search_text, order_by, search_filters, cursor)
+    cached_page = cache.get(cache_key)
+    if cached_page is not None:
+        objects = model.objects.all().with_owner()\
+            .in_bulk(cached_page['ids'])
+        object_list = [
+            objects[pk] for pk in cached_page['ids'] if pk in objects]
+        model.objects.all().load_owner_cards(object_list)
+        page = KeysetPage(
+            object_list, cached_page['next_cursor'], cached_page['has_more'])
+        return page, cached_page['facets']
+    results = model.objects.search(search_text, order_by)
+    page = KeysetPaginator(
+        results.filter_facets(**search_filters).with_owner(),
+        _search_ordering(order_by), SEARCH_RESULTS_ON_PAGE
+    ).get_page(cursor)
+    model.objects.all().load_owner_cards(page)
+    facets = results.facets()
+    cache.set(cache_key, {
+        'ids': [obj.pk for obj in page],
+        'next_cursor': page.next_cursor,
+        'has_more': page.has_more,
+        'facets': facets
+    }, SEARCH_CACHE_TIMEOUT)
+    return page, facets
+
+
 @context_view('core/search.html')
 def search_view(request):
     search_text = request.GET.get('q', '')
@@ -47,20 +135,62 @@ def search_view(request):
     ]:
         search_order = '-date'
     order_by = search_order.replace('date', 'pk')
-    order_by = order_by.replace('rating', 'seller__rating__value')
+    offer_order_by = order_by.replace('rating', 'seller__rating__value')
+    wtb_order_by = order_by.replace('rating', 'account__rating__value')
+    search_filters = _search_filters(request.GET)
+    offer_page, offer_facets = _search_page(
+        Offer, search_text, offer_order_by, search_filters,
+        request.GET.get('after'))
+    wtb_request_page, wtb_request_facets = _search_page(
+        WTBRequest, search_text, wtb_order_by, search_filters,
+        request.GET.get('wtb_after'))
     return {
-        'offer_list': Offer.objects.search(search_text, order_by),
-        'wtb_request_list': WTBRequest.objects.search(search_text, order_by),
+        'offer_list': offer_page.object_list,
+        'offer_page': offer_page,
+        'offer_facets': offer_facets,
+        'wtb_request_list': wtb_request_page.object_list,
+        'wtb_request_page': wtb_request_page,
+        'wtb_request_facets': wtb_request_facets,
+        'search_filters': search_filters,
         'search_text': search_text,
         'search_order': search_order
     }
 
 
+@json_view
+def search_suggestions_view(request):
+    limit = SUGGESTIONS_LIMIT
+    try:
+        limit = min(int(request.GET['n']), SUGGESTIONS_LIMIT)
+        if limit < 1:
+            raise ValueError
+    except (KeyError, ValueError):
+        limit = SUGGESTIONS_LIMIT
+    prefix = request.GET.get('q', '')
+    return {
+        'suggestions': SearchSuggestion.objects.suggest(prefix, limit)
+    }
+
+
 @context_view('core/profile.html')
 def profile_view(request, *args, **kwargs):
     account = get_object_or_404(Account, **kwargs)
+    sale_offers = account.sale_offers.select_related('buyer')
+    active_offers = list(sale_offers.active())
+    in_deal_offers = list(sale_offers.in_deal())
+    closed_offers = list(sale_offers.closed())
+    feedbacks = list(
+        account.received_feedbacks.select_related('account'))
+    Account.objects.load_cards(
+        [account, request.account]
+        + [offer.buyer for offer in in_deal_offers + closed_offers]
+        + [feedback.account for feedback in feedbacks])
     return {
-        'object': account
+        'object': account,
+        'active_offers': active_offers,
+        'in_deal_offers': in_deal_offers,
+        'closed_offers': closed_offers,
+        'feedbacks': feedbacks
     }
 
 
@@ -72,50 +202,61 @@ def my_wts_offers_view(request, *args, **kwargs):
     }
 
 
+NOTIFICATIONS_ON_PAGE = 5
+DEALS_ON_PAGE = 5
+
+
+def _next_page_cursor(request):
+    cursor = request.GET.get('after', '')
+    if not cursor:
+        raise SuspiciousOperation('invalid cursor')
+    return cursor
+
+
+def _notifications_page(notifications, cursor=None):
+    return KeysetPaginator(
+        notifications.with_offer_status(), ['-pk'], NOTIFICATIONS_ON_PAGE
+    ).get_page(cursor)
+
+
+def _deals_page(deals, cursor=None):
+    return KeysetPaginator(deals, ['-pk'], DEALS_ON_PAGE).get_page(cursor)
+
+
+def _latest_deals_page(cursor=None):
+    return KeysetPaginator(
+        Deal.objects.latest_closed().with_account_cards(),
+        ['-offer__status_changed_at', '-pk'], DEALS_ON_PAGE
+    ).get_page(cursor)
+
+
 @account_required
 @context_view('core/notifications.html')
 def notifications_view(request, *args, **kwargs):
     account = request.account
 
-    notifications_on_page = 5
-
-    deals_notifications = account.notifications.for_deals().prefetch_related()
-    deals_notifications = list(deals_notifications[:notifications_on_page+1])
-    has_more_deal_notifications =\
-        len(deals_notifications) > notifications_on_page
-    if has_more_deal_notifications:
-        deals_notifications = deals_notifications[:-1]
-
-    wts_notifications = account.notifications.for_wts().prefetch_related()
-    wts_notifications = list(wts_notifications[:notifications_on_page+1])
-    has_more_wts_notifications =\
-        len(wts_notifications) > notifications_on_page
-    if has_more_wts_notifications:
-        wts_notifications = wts_notifications[:-1]
-
-    wtb_notifications = account.notifications.for_wtb().prefetch_related()
-    wtb_notifications = list(wtb_notifications[:notifications_on_page+1])
-    has_more_wtb_notifications =\
-        len(wtb_notifications) > notifications_on_page
-    if has_more_wtb_notifications:
-        wtb_notifications = wtb_notifications[:-1]
+    deals_notifications = _notifications_page(
+        account.notifications.for_deals())
+    wts_notifications = _notifications_page(account.notifications.for_wts())
+    wtb_notifications = _notifications_page(account.notifications.for_wtb())
+    Notification.objects.load_contragents(
+        deals_notifications.object_list
+        + wts_notifications.object_list
+        + wtb_notifications.object_list, account)
 
     deals_unseen_notifications = account.deals_unseen_notifications()
     wts_unseen_notifications = account.wts_unseen_notifications()
     wtb_unseen_notifications = account.wtb_unseen_notifications()
 
-    account.notifications.for_deals().unseen().update(is_seen=True)
+    account.mark_notifications_seen(NotificationType.DEAL)
 
     return {
         'deals_unseen_notifications': deals_unseen_notifications,
         'wts_unseen_notifications': wts_unseen_notifications,
         'wtb_unseen_notifications': wtb_unseen_notifications,
         'deals_notifications': deals_notifications,
-        'has_more_deal_notifications': has_more_deal_notifications,
         'wts_notifications': wts_notifications,
-        'has_more_wts_notifications': has_more_wts_notifications,
-        'wtb_notifications': wtb_notifications,
-        'has_more_wtb_notifications': has_more_wtb_notifications
+        'wtb_notifications': wtb_notifications
     }
 
 
@@ -123,12 +264,7 @@ def notifications_view(request, *args, **kwargs):
 @json_view
 def notifications_page_view(request, *args, **kwargs):
     account = request.account
-    page = kwargs['page']
     notification_type = kwargs['notification_type']
-    if page < 2:
-        raise SuspiciousOperation('invalid request')
-    notifications_on_page = 5
-    offset = notifications_on_page * (page - 1)
     notifications = Notification.objects.none()
     if notification_type == NotificationType.DEAL:
         notifications = account.notifications.for_deals()
@@ -136,10 +272,13 @@ def notifications_page_view(request, *args, **kwargs):
         notifications = account.notifications.for_wtb()
     if notification_type == NotificationType.WTS:
         notifications = account.notifications.for_wts()
-    notifications = list(notifications[offset:offset+notifications_on_page+1])
-    has_more_notifications = len(notifications) > notifications_on_page
-    if has_more_notifications:
-        notifications = notifications[:-1]
+    notifications = _notifications_page(
+        notifications, _next_page_cursor(request))
+    return _render_notifications(account, notifications)
+
+
+def _render_notifications(account, notifications):
+    Notification.objects.load_contragents(notifications.object_list, account)
     template = loader.get_template('core/notifications-list.html')
     context = {
         'auth': {
@@ -150,17 +289,46 @@ def notifications_page_view(request, *args, **kwargs):
     html_block = template.render(context)
     return {
         'html': html_block,
-        'has_more_notifications': has_more_notifications
+        'has_more_notifications': notifications.has_more,
+        'next_cursor': notifications.next_cursor
     }
 
 
+@account_required
+@json_view
+def notifications_refresh_view(request):
+    """
+    Called by the browser on a pushed notification event: returns the
+    header counter and, for the notifications page, the first page of
+    every list.
+    """
+    account = request.account
+    result = dict()
+    if request.GET.get('lists') == '1':
+        result['lists'] = {
+            NotificationType.DEAL: _render_notifications(
+                account,
+                _notifications_page(account.notifications.for_deals())),
+            NotificationType.WTS: _render_notifications(
+                account,
+                _notifications_page(account.notifications.for_wts())),
+            NotificationType.WTB: _render_notifications(
+                account,
+                _notifications_page(account.notifications.for_wtb())),
+        }
+        # The deals tab is open, as when the page is loaded.
+        account.mark_notifications_seen(NotificationType.DEAL)
+    result['total_unseen_notifications'] =\
+        account.total_unseen_notifications()
+    return result
+
+
 @account_required
 @json_view
 def notifications_update_seen_view(request, *args, **kwargs):
     account = request.account
     notification_type = kwargs['notification_type']
-    account.notifications.for_type(notification_type)\
-        .unseen().update(is_seen=True)
+    account.mark_notifications_seen(notification_type)
     return {
         'total_unseen_notifications': account.total_unseen_notifications()
     }
@@ -169,7 +337,8 @@ def notifications_update_seen_view(request, *args, **kwargs):
 @account_required
 @json_view
 def account_messages_view(request):
-    messages = request.account.backend_messages.all()
+    messages = AccountBackendMessage.objects.filter(
+        account_id=request.account_id)
     result = list()
     for message in messages:
         result.append({
@@ -177,7 +346,7 @@ def account_messages_view(request):
             'message': message.message,
             'tag': message.tag
         })
-    request.account.backend_messages.all().delete()
+    messages.filter(pk__in=[message.pk for message in messages]).delete()
     return dict(messages=result)
 
 
@@ -441,7 +610,7 @@ def logout_view(request):
 def confirm_offer_view(request):
     if request.method != 'POST':
         raise SuspiciousOperation(_('invalid method'))
-    if not hasattr(request, 'account') or request.account is None:
+    if not has_account(request):
         return redirect('core:index_view')
     offer_pk = None
     try:
@@ -479,29 +648,18 @@ def confirm_offer_view(request):
 @context_view('core/my-deals.html')
 def my_deals_view(request):
     account = request.account
-    deals_on_page = 5
     # active deals
-    deals = Offer.objects.in_deal().for_account(account)
-    deals = list(deals[:deals_on_page+1])
-    has_more_deals = len(deals) > deals_on_page
-    if has_more_deals:
-        deals = deals[:-1]
+    deals = _deals_page(Offer.objects.in_deal().for_account(account))
     Offer.objects.update_last_seen_for(account, deals)
     # closed deals
-    closed_deals = Offer.objects.closed().for_account(account)
-    closed_deals = list(closed_deals[:deals_on_page+1])
-    has_more_closed_deals = len(closed_deals) > deals_on_page
-    if has_more_closed_deals:
-        closed_deals = closed_deals[:-1]
+    closed_deals = _deals_page(Offer.objects.closed().for_account(account))
     Offer.objects.update_last_seen_for(account, closed_deals)
     return {
         'num_deals': Offer.objects.in_deal().for_account(account).count(),
         'deals': deals,
-        'has_more_deals': has_more_deals,
         'num_closed_deals':
             Offer.objects.closed().for_account(account).count(),
-        'closed_deals': closed_deals,
-        'has_more_closed_deals': has_more_closed_deals
+        'closed_deals': closed_deals
     }
 
 
@@ -509,16 +667,9 @@ def my_deals_view(request):
 @json_view
 def my_deals_page_view(request, *args, **kwargs):
     account = request.account
-    page = kwargs['page']
-    if page < 2:
-        raise SuspiciousOperation('invalid request')
-    deals_on_page = 5
-    offset = deals_on_page * (page - 1)
-    deals = Offer.objects.in_deal().for_account(account)
-    deals = list(deals[offset:offset+deals_on_page+1])
-    has_more_deals = len(deals) > deals_on_page
-    if has_more_deals:
-        deals = deals[:-1]
+    deals = _deals_page(
+        Offer.objects.in_deal().for_account(account),
+        _next_page_cursor(request))
     Offer.objects.update_last_seen_for(account, deals)
     template = loader.get_template('core/my-deals-page.html')
     context = {
@@ -530,7 +681,8 @@ def my_deals_page_view(request, *args, **kwargs):
     html_block = template.render(context)
     return {
         'html': html_block,
-        'has_more_deals': has_more_deals
+        'has_more_deals': deals.has_more,
+        'next_cursor': deals.next_cursor
     }
 
 
@@ -538,16 +690,9 @@ def my_deals_page_view(request, *args, **kwargs):
 @json_view
 def my_closed_deals_page_view(request, *args, **kwargs):
     account = request.account
-    page = kwargs['page']
-    if page < 2:
-        raise SuspiciousOperation('invalid request')
-    deals_on_page = 5
-    offset = deals_on_page * (page - 1)
-    closed_deals = Offer.objects.closed().for_account(account)
-    closed_deals = list(closed_deals[offset:offset+deals_on_page+1])
-    has_more_closed_deals = len(closed_deals) > deals_on_page
-    if has_more_closed_deals:
-        closed_deals = closed_deals[:-1]
+    closed_deals = _deals_page(
+        Offer.objects.closed().for_account(account),
+        _next_page_cursor(request))
     Offer.objects.update_last_seen_for(account, closed_deals)
     template = loader.get_template('core/my-closed-deals-page.html')
     context = {
@@ -559,14 +704,19 @@ def my_closed_deals_page_view(request, *args, **kwargs):
     html_block = template.render(context)
     return {
         'html': html_block,
-        'has_more_closed_deals': has_more_closed_deals
+        'has_more_closed_deals': closed_deals.has_more,
+        'next_cursor': closed_deals.next_cursor
     }
 
 
 @account_required
 @context_view('core/favorites.html')
 def favorites_view(request):
-    favorites = request.account.favorites.all()
+    favorites = list(
+        request.account.favorites.select_related('offer', 'offer__seller'))
+    Account.objects.load_cards(
+        [request.account]
+        + [favorite.offer.seller for favorite in favorites])
     return {
         'favorites': favorites
     }
@@ -583,31 +733,18 @@ def my_wtb_requests_view(request):
 @context_view('core/latest-deals.html')
 def latest_deals_view(request):
     summary = Deal.total_summary()
-    deals_on_page = 5
-    latest_deals = Deal.objects.latest_closed()
-    latest_deals = list(latest_deals[:deals_on_page+1])
-    has_more_deals = len(latest_deals) > deals_on_page
-    if has_more_deals:
-        latest_deals = latest_deals[:-1]
+    latest_deals = _latest_deals_page()
+    Deal.objects.load_account_cards(latest_deals, request.account)
     return {
         'summary': summary,
-        'latest_deals': list(latest_deals),
-        'has_more_deals': has_more_deals
+        'latest_deals': latest_deals
     }
 
 
 @json_view
 def latest_deals_page_view(request, *args, **kwargs):
-    page = kwargs['page']
-    if page < 2:
-        raise SuspiciousOperation('invalid request')
-    deals_on_page = 5
-    offset = deals_on_page * (page - 1)
-    latest_deals = Deal.objects.latest_closed()
-    latest_deals = list(latest_deals[offset:offset+deals_on_page+1])
-    has_more_deals = len(latest_deals) > deals_on_page
-    if has_more_deals:
-        latest_deals = latest_deals[:-1]
+    latest_deals = _latest_deals_page(_next_page_cursor(request))
+    Deal.objects.load_account_cards(latest_deals)
     template = loader.get_template('include/latest-deals.html')
     context = {
         'latest_deals': latest_deals
@@ -615,7 +752,8 @@ def latest_deals_page_view(request, *args, **kwargs):
     html_block = template.render(context)
     return {
         'html': html_block,
-        'has_more_deals': has_more_deals
+        'has_more_deals': latest_deals.has_more,
+        'next_cursor': latest_deals.next_cursor
     }
 
 
@@ -660,7 +798,7 @@ def ajax_action_with_deal(func):
     def wrapper(request):
         if request.method != 'POST':
             raise SuspiciousOperation('invalid method')
-        if not hasattr(request, 'account') or request.account is None:
+        if not has_account(request):
             raise SuspiciousOperation('account required')
         deal_pk = None
         try:
@@ -669,7 +807,9 @@ def ajax_action_with_deal(func):
             pass
         if not deal_pk:
             raise SuspiciousOperation('invalid deal')
-        deal = Deal.objects.get(pk=deal_pk)
+        deal = Deal.objects\
+            .select_related('offer', 'offer__seller', 'offer__buyer')\
+            .get(pk=deal_pk)
         result = func(request.account, deal, request)
         if result is None:
             result = dict(result='OK')
@@ -704,17 +844,8 @@ def buyer_deposited(account, deal, request):
         raise SuspiciousOperation('invalid deal')
     if not deal.is_waiting_buyer_payment():
         return {'action': 'reload', 'supress_message': 'on'}
-    deal_class = get_contract_deal(deal)
-    response_obj = {'action': 'wait'}
-    if (
-        deal_class.exists
-        and deal_class.buyer_deposited == deal_class.price
-    ):
-        deal.buyer_deposit_confirmed()
-        response_obj = {'action': 'reload'}
-    else:
-        deal.buyer_deposited()
-    return response_obj
+    deal.buyer_deposited()
+    return {'action': 'wait'}
 
 
 @ajax_action_with_deal
@@ -724,17 +855,8 @@ def seller_payed_collateral(account, deal, request):
         raise SuspiciousOperation('invalid deal')
     if not deal.is_waiting_seller_collateral():
         return {'action': 'reload', 'supress_message': 'on'}
-    deal_class = get_contract_deal(deal)
-    response_obj = {'action': 'wait'}
-    if (
-        deal_class.exists
-        and deal_class.seller_deposited == deal_class.collateral
-    ):
-        deal.seller_collateral_confirmed()
-        response_obj = {'action': 'reload'}
-    else:
-        deal.seller_payed_collateral()
-    return response_obj
+    deal.seller_payed_collateral()
+    return {'action': 'wait'}
 
 
 @ajax_action_with_deal
@@ -844,6 +966,40 @@ def deal_offer_stage_view(request, *args, **kwargs):
     })
 
 
+async def _push_stream(account_id):
+    yield 'retry: 5000\n\n'
+    async for event in account_events(account_id):
+        if event is None:
+            yield ': ping\n\n'
+            continue
+        data = json.dumps(event['data'])
+        yield f'event: {event["event"]}\ndata: {data}\n\n'
+
+
+def _push_account_id(request):
+    account_pk = request.session.get('_account_pk')
+    if not account_pk:
+        return None
+    return Account.objects.filter(pk=account_pk)\
+        .values_list('pk', flat=True).first()
+
+
+async def push_view(request):
+    if not settings.PUSH_URL:
+        raise Http404
+    # The account is resolved here rather than taken from the sync
+    # AccountMiddleware, whose lazy account must not be touched from an
+    # async view.
+    account_id = await sync_to_async(_push_account_id)(request)
+    if not account_id:
+        raise PermissionDenied('account required')
+    response = StreamingHttpResponse(
+        _push_stream(account_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 def _nonce_text(nonce):
     return f'Your nonce is: {nonce}'
 
@@ -4,4 +4,4 @@
 
 $(document).ready((function(){$(".js-confirm-deal-rules").click(onClickConfirmDealRules);$('.set-rating input[name="star"]').change((function(){if(this.checked){$(".set-rating .active").removeClass("active");$(".set-rating span").not($(this).parent()).find("input:checked").prop("checked",false);$(this).parent().addClass("active");$(this).closest(".set-rating").find("> input").val($(this).val())}}));$(".scroll").click((function(){var scroll_el=$(this).attr("href");if($(scroll_el).length!=0){$("html, body").animate({scrollTop:$(scroll_el).offset().top-100},500)}return false}));$(".main-page__toggle-video").click((function(){$(".main-page__video").slideToggle(300)}));$(".tabs").each((function(){var newTab=$(this).find(`.tab[data-tab="${$(this).find(".tabs__choose button.active").attr("data-tab")}`);newTab.addClass("active")}));$(".tabs__choose button").click((function(){var tab=$(this).attr("data-tab"),newTab=$(this).closest(".tabs").find(`.tab[data-tab="${tab}"]`);$(this).addClass("active").siblings(".active").removeClass("active");$(this).closest(".tabs").find(".tab.active").removeClass("active");newTab.addClass("active")}));$(".popup").each((function(){$(this).wrapInner(`<div class="popup__inner"></div>`);if(!$(this).hasClass("_block-close")){$(this).find(".popup__inner").append(`<button class="popup__close"><svg width="10" height="10" viewBox="0 0 10 10" fill="none" xmlns="http://www.w3.org/2000/svg"><path d="M9.19998 0.806663C8.93998 0.546663 8.51998 0.546663 8.25998 0.806663L4.99998 4.06L1.73998 0.799996C1.47998 0.539996 1.05998 0.539996 0.79998 0.799996C0.53998 1.06 0.53998 1.48 0.79998 1.74L4.05998 5L0.79998 8.26C0.53998 8.52 0.53998 8.94 0.79998 9.2C1.05998 9.46 1.47998 9.46 1.73998 9.2L4.99998 5.94L8.25998 9.2C8.51998 9.46 8.93998 9.46 9.19998 9.2C9.45998 8.94 9.45998 8.52 9.19998 8.26L5.93998 5L9.19998 1.74C9.45331 1.48666 9.45331 1.06 9.19998 0.806663Z" fill="#141736"/></svg></button>`);$(this).find(".popup__close,.js-close-popup").click((function(){closePopup()}));$(this).click((function(){closePopup()}))}$(this).find(".popup__inner").click((function(e){e.stopPropagation()}))}));$(".popup").click((function(){closePopup()}));$(".js-close-popup").click((function(){closePopup()}));$("[data-popup]").click((function(e){e.preventDefault();openPopup($(this))}));$(".js-confirm-button").click((function(eventObj){const redirect=$(this).data("redirect");if(redirect){location.href=`${location.origin}${redirect}`}}));$(".header__profile").click((function(){$(this).toggleClass("active")}));$(document).click((function(e){if(e.target.closest(".header__profile")==null){$(".header__profile").removeClass("active")}}));$(".fake-select").each((function(){$(this).append(`<div class="fake-select__inner"></div>`);if($(this).find("option:disabled").length!=0){if($(this).find("select").attr("name")=="network"){$(this).append(`<div class="fake-select__selected _initial">\n                        <span><i>${$(this).find("option:selected").text()}</i></span>\n                        <svg width="13" height="13" viewBox="0 0 13 13" fill="none" xmlns="http://www.w3.org/2000/svg">\n                            <path d="M10.2913 4.60449L6.49967 8.39616L2.70801 4.60449" stroke="#141736" stroke-width="1.5" stroke-linecap="round" stroke-linejoin="round"/>\n                        </svg>\n                    </div>`)}else{$(this).append(`<div class="fake-select__selected _initial">\n                    <span>${$(this).find("option:disabled").text()}</span>\n                    <svg width="6" height="4" viewBox="0 0 6 4" fill="none" xmlns="http://www.w3.org/2000/svg">\n                        <path d="M0.80666 1.80667L2.53333 3.53334C2.79333 3.79334 3.21333 3.79334 3.47333 3.53334L5.19999 1.80667C5.61999 1.38667 5.31999 0.666672 4.72666 0.666672H1.27333C0.679994 0.666672 0.38666 1.38667 0.80666 1.80667Z" fill="#141736"/>\n                    </svg>\n                    </div>`);$(this).find("option:disabled").remove()}}else{if($(this).find("select").attr("name")=="network"&&$(this).find("select").data("standart-arrow")!==1){$(this).append(`<div class="fake-select__selected">\n                    <span><i>${$(this).find("option:selected").text()}</i></span>\n                    <svg width="13" height="13" viewBox="0 0 13 13" fill="none" xmlns="http://www.w3.org/2000/svg">\n                        <path d="M10.2913 4.60449L6.49967 8.39616L2.70801 4.60449" stroke="#141736" stroke-width="1.5" stroke-linecap="round" stroke-linejoin="round"/>\n                    </svg>\n                    </div>`)}else{$(this).append(`<div class="fake-select__selected">\n                    <span>${$(this).find("option:selected").text()}</span>\n                    <svg width="6" height="4" viewBox="0 0 6 4" fill="none" xmlns="http://www.w3.org/2000/svg">\n                        <path d="M0.80666 1.80667L2.53333 3.53334C2.79333 3.79334 3.21333 3.79334 3.47333 3.53334L5.19999 1.80667C5.61999 1.38667 5.31999 0.666672 4.72666 0.666672H1.27333C0.679994 0.666672 0.38666 1.38667 0.80666 1.80667Z" fill="#141736"/>\n                    </svg>\n                    </div>`)}}var inner=$(this).find(".fake-select__inner");if($(this).find("select").attr("name")=="language"){$(".fake-select__selected").prepend(`<img src="img/flag_${$(this).find("option:selected").attr("value")}.svg" alt="">`);$(this).find("option").each((function(){inner.append(`<div class="fake-select__option${$(this).is(":selected")?" active":""}" data-value="${$(this).attr("value")}"><img src="img/flag_${$(this).attr("value")}.svg" alt=""><i>${$(this).text()}</i></div>`)}))}else if($(this).find("select").attr("name")=="network"){$(this).find("option").each((function(){let badge="";let soon=false;let disabled=false;if($(this).data("label")&&$(this).data("label")=="soon"){badge=`<div class="fake-select__badge">${$(this).data("label")}</div>`;disabled=true;soon=true}inner.append(`<div class="fake-select__option${$(this).is(":selected")?" active":""} fake-select__option-disabled-${disabled} fake-select__option-soon-${soon}" data-value="${$(this).attr("value")}"><img src="/static/img/network_${$(this).attr("value")}.svg" alt=""><i>${$(this).text()} ${badge}</i></div>`)}))}else{$(this).find("option").each((function(){inner.append(`<div class="fake-select__option" data-value="${$(this).attr("value")}">${$(this).text()}</div>`)}))}$(this).click((function(){$(this).toggleClass("active")}));$(this).find(".fake-select__option").click((function(){if($(this).hasClass("fake-select__option-disabled-true")){return false}$(this).closest(".fake-select").find("select").val($(this).attr("data-value")).change();$(this).siblings(".active").removeClass("active");$(this).addClass("active");$(this).closest(".fake-select").find(".fake-select__selected").removeClass("_initial").find("span").html($(this).html())}))}));var windowWidth=$(window).width();$(window).resize((function(){windowWidth=$(window).width()}));$(".steps .next").click((function(){let par=$(this).closest(".steps");if(par.find(".step.active").next().hasClass("step")){par.find(".step.active").removeClass("active").next().addClass("active")}else{$(document).trigger("tutorial:shown");closePopup()}}));$(".steps .skip").click((function(){$(document).trigger("tutorial:shown");closePopup()}));if($(".deal._seller").length!=0){if($(".deal__progress__block._current").length!=0){let h=$(".deal__progress__block._current")[0].offsetTop;$(".deal__progress .progress").height(h-17)}else{$(".deal__progress .progress").height("100%")}}$(".header__hamburger").click((function(){$(this).toggleClass("active");$(".header__menu").toggleClass("active")}));$(".header__mobile-search").click((function(){$(".header__search").slideToggle(300)}));$(".js-search-sort").change((function(){const searchUrl=new URL(location.href);searchUrl.searchParams.set("o",this.value);location.href=searchUrl.href}));$(".js-toggle-favorite").click((function(eventObj){eventObj.preventDefault();const $link=$(this);const url=$link.data("url");$.ajax({url:url}).then((function(data){if(data.in_favorites){$link.html('<svg width="38" height="38" viewBox="0 0 38 38" fill="none" xmlns="http://www.w3.org/2000/svg"><rect width="16" height="16" transform="translate(11 11)" fill="white"/><path d="M19 26.1099C18.7722 26.1099 18.5526 26.0273 18.3815 25.8774C17.7351 25.3123 17.1119 24.7811 16.5621 24.3126L16.5593 24.3102C14.9474 22.9365 13.5554 21.7502 12.5869 20.5817C11.5043 19.2753 11 18.0366 11 16.6835C11 15.3688 11.4508 14.1559 12.2693 13.2681C13.0975 12.3698 14.234 11.875 15.4697 11.875C16.3933 11.875 17.2391 12.167 17.9836 12.7428C18.3594 13.0334 18.6999 13.3892 19 13.8041C19.3002 13.3892 19.6406 13.0334 20.0165 12.7428C20.761 12.167 21.6068 11.875 22.5304 11.875C23.766 11.875 24.9026 12.3698 25.7308 13.2681C26.5493 14.1559 27 15.3688 27 16.6835C27 18.0366 26.4958 19.2753 25.4132 20.5815C24.4447 21.7502 23.0528 22.9364 21.4411 24.3099C20.8904 24.7792 20.2662 25.3112 19.6184 25.8777C19.4474 26.0273 19.2276 26.1099 19 26.1099Z" fill="#FF7878"/><circle cx="19" cy="19" r="18.5" stroke="#ECECEF"/></svg>');$link.addClass("active")}else{$link.html('<svg width="40" height="40" viewBox="0 0 40 40" fill="none" xmlns="http://www.w3.org/2000/svg"><path d="M20 27.2349C19.7722 27.2349 19.5526 27.1523 19.3815 27.0024C18.7351 26.4373 18.1119 25.9061 17.5621 25.4376L17.5593 25.4352C15.9474 24.0615 14.5554 22.8752 13.5869 21.7067C12.5043 20.4003 12 19.1616 12 17.8085C12 16.4938 12.4508 15.2809 13.2693 14.3931C14.0975 13.4948 15.234 13 16.4697 13C17.3933 13 18.2391 13.292 18.9836 13.8678C19.3594 14.1584 19.6999 14.5142 20 14.9291C20.3002 14.5142 20.6406 14.1584 21.0165 13.8678C21.761 13.292 22.6068 13 23.5304 13C24.766 13 25.9026 13.4948 26.7308 14.3931C27.5493 15.2809 28 16.4938 28 17.8085C28 19.1616 27.4958 20.4003 26.4132 21.7065C25.4447 22.8752 24.0528 24.0614 22.4411 25.4349C21.8904 25.9042 21.2662 26.4362 20.6184 27.0027C20.4474 27.1523 20.2276 27.2349 20 27.2349ZM16.4697 13.9373C15.4989 13.9373 14.6071 14.3247 13.9582 15.0283C13.2998 15.7426 12.9371 16.7299 12.9371 17.8085C12.9371 18.9465 13.3601 19.9644 14.3085 21.1086C15.2251 22.2147 16.5885 23.3766 18.1671 24.7219L18.17 24.7244C18.7219 25.1947 19.3475 25.7279 19.9986 26.2972C20.6537 25.7268 21.2803 25.1927 21.8332 24.7217C23.4117 23.3763 24.775 22.2147 25.6916 21.1086C26.6399 19.9644 27.0628 18.9465 27.0628 17.8085C27.0628 16.7299 26.7002 15.7426 26.0417 15.0283C25.393 14.3247 24.5011 13.9373 23.5304 13.9373C22.8192 13.9373 22.1662 14.1633 21.5897 14.6091C21.0759 15.0066 20.718 15.509 20.5082 15.8606C20.4003 16.0414 20.2103 16.1493 20 16.1493C19.7897 16.1493 19.5997 16.0414 19.4918 15.8606C19.2821 15.509 18.9242 15.0066 18.4103 14.6091C17.8337 14.1633 17.1808 13.9373 16.4697 13.9373Z" fill="#141736"/><circle cx="20" cy="20" r="19.5" stroke="#ECECEF"/></svg>');$link.removeClass("active")}}))}));$(".js-toggle-theme").on("change",(function(){if($(this).is(":checked")){$("body").addClass("theme-dark");$(".js-theme-switcher-text").text("Switch to light mode")}else{$("body").removeClass("theme-dark");$(".js-theme-switcher-text").text("Switch to dark mode")}$.ajax({url:"/toggle-theme/"})}));$(".js-toggle-type").on("change",(function(){if($(this).is(":checked")){$(".js-type-switcher-content").hide();$(".js-type-switcher-content--WTB").show()}else{$(".js-type-switcher-content").hide();$(".js-type-switcher-content--WTS").show()}}));$(".js-radio-make-offer").on("change",(function(){$(".popup__offers-item").removeClass("active");$(this).closest(".popup__offers-item").addClass("active")}));$(".js-scroll-to-top").on("click",(function(){$("html,body").stop().animate({scrollTop:0},1e3)}));if(window.innerWidth<768){$(".header__menu__item--has-children").on("click",(function(){$(".header__menu__item").not(this).removeClass("opened");$(this).toggleClass("opened")}))}$(".js-wts-wtb-form-type").on("change",(function(){const $form=$(this).parents("form");const $collateral=$(".js-wts-wtb-collateral>input",$form);const $details=$(".js-wts-wtb-details>textarea",$form);if($(this).val()=="wts"){$collateral.prop("required",true).prop("disabled",false);$details.prop("disabled",false)}else{$collateral.prop("required",false).prop("disabled",true).val("");$details.prop("disabled",true).val("")}}));$(".js-no-auth-message").on("click",(function(){showNotification("Error","Please connect your wallet","fail")}));const $addOfferForm=$(".js-wts-wtb-submit").parents("form");$addOfferForm.on("submit",(function(eventObj){eventObj.preventDefault();const formData={};$addOfferForm.serializeArray().forEach((function(item){formData[item.name]=item.value||""}));csrfmiddlewaretoken=formData.csrfmiddlewaretoken;delete formData.csrfmiddlewaretoken;$.ajax({method:"post",url:"/add-wts-or-wtb-offer/",beforeSend:function(request){request.setRequestHeader("X-CSRFToken",csrfmiddlewaretoken)},contentType:"application/json; charset=utf-8",dataType:"text",data:JSON.stringify(formData)}).then((function(response){response=JSON.parse(response);if(response.errors!==undefined){for(const errorProp in response.errors){const $err=$(`<div class="errorlist">${response.errors[errorProp]}</div>`);const $inputBlock=$(`[name="${errorProp}"]`,$addOfferForm).parent();$inputBlock.find(".errorlist").remove();$inputBlock.addClass("form__input-block--invalid").append($err)}}else{window.location.reload()}}));return false}));$addOfferForm.find("input").on("change",(function(eventObj){const $inputBlock=$(eventObj.currentTarget).parent();$inputBlock.find(".errorlist").remove();$inputBlock.removeClass("form__input-block--invalid")}));$(".js-deleted-offer-link").on("click",(function(eventObj){eventObj.preventDefault();showNotification("Error","Offer deleted","fail")}));$(".js-update-notifications-seen").on("click",(function(eventObj){const notificationsType=$(this).data("notifications-type");$(this).find("i").remove();$.ajax({url:`/notifications/update-seen/${notificationsType}/`}).then((function(response){if(response.total_unseen_notifications>0){$(".js-total-unseen-notifications").text(response.total_unseen_notifications)}else{$(".js-total-unseen-notifications").remove()}}))}))}));function openPopup($linkEl){$(".popup.active").removeClass("active");const src=$linkEl.attr("data-popup");if(src=="make-offer"){$(".js-wtb-request-pk").val($linkEl.data("wtb-request-pk"))}const $popup=$(`#${src}`);const redirect=$linkEl.data("popup-redirect");if(redirect){$popup.find(".js-confirm-button").data("redirect",redirect)}$popup.addClass("active");if(window.innerWidth>1e3){freeze()}}function closePopup(){$(".popup.active").removeClass("active");setTimeout((function(){unfreeze()}),300)}var scrollbarWidth=window.innerWidth-$("body").width();function freeze(){if($("html").css("position")!="fixed"){var top=$("html").scrollTop()?$("html").scrollTop():$("body").scrollTop();if(window.innerWidth>$("html").width()){$("html").css("overflow-y","hidden")}$(".header").css("right",scrollbarWidth+"px");$("html").css({"padding-right":scrollbarWidth,width:"100%",height:"100%",position:"fixed",top:-top})}}function unfreeze(){if($("html").css("position")=="fixed"){$("html").css("position","static");$("html, body").scrollTop(-parseInt($("html").css("top")));$("html").removeAttr("style");$(".header").removeAttr("style")}}function showNotification(caption,text,type){let offsetBottom=$(window).height()/200;if($(".notification-container").length==0)$("body").append(`<div class="notification-container"></div>`);let id=(new Date).getTime();$(".notification-container").append(`<div class="notification notification_${type}" style="bottom: ${offsetBottom}px" id="notification${id}"><span class="close"></span><span class="icon"></span><span>${caption}</span> ${text}</div>`);if($(".notification").length>0){$(".notification").each((function(){$(this).css("bottom",parseInt($(this)[0].style.bottom)+($(this).next().innerHeight()||$(this).height()/3)+10);if(parseInt($(this)[0].style.bottom,10)>window.innerHeight/2){$(this).fadeOut(300)}}))}$(`#notification${id}`).click((function(){$(this).fadeOut(300)}));setTimeout((()=>{$(`#notification${id}`).fadeOut(300);setTimeout((()=>{$(`#notification${id}`).remove()}),300)}),3e3)}function onClickConfirmDealRules(eventObj){el=$(".js-submit-confirm-deal").get(0);if(el){el.disabled=!this.checked}}
 
-(function(){function r(e,n,t){function o(i,f){if(!n[i]){if(!e[i]){var c="function"==typeof require&&require;if(!f&&c)return c(i,!0);if(u)return u(i,!0);var a=new Error("Cannot find module '"+i+"'");throw a.code="MODULE_NOT_FOUND",a}var p=n[i]={exports:{}};e[i][0].call(p.exports,(function(r){var n=e[i][1][r];return o(n||r)}),p,p.exports,r,e,n,t)}return n[i].exports}for(var u="function"==typeof require&&require,i=0;i<t.length;i++)o(t[i]);return o}return r})()({1:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.getTokenContractAbi=getTokenContractAbi;exports.networkNameFromId=networkNameFromId;exports.networks=void 0;const networks={bnb:{chainId:"0x38",chainName:"BNB Smart Chain Mainnet",nativeCurrency:{name:"BNB",symbol:"BNB",decimals:18},rpcUrls:["https://bsc-dataseed.binance.org"],blockExplorerUrls:["https://bscscan.com"]},arbitrum:{chainId:"0xA4B1",chainName:"Arbitrum Mainnet",nativeCurrency:{name:"ETH",symbol:"ETH",decimals:18},rpcUrls:["https://arb1.arbitrum.io/rpc"],blockExplorerUrls:["https://arbiscan.io"]},optimism:{chainId:"0xA",chainName:"Optimism Mainnet",nativeCurrency:{name:"ETH",symbol:"ETH",decimals:18},rpcUrls:["https://mainnet.optimism.io"],blockExplorerUrls:["https://optimistic.etherscan.io"]}};exports.networks=networks;const bnbBusdAbi=[{inputs:[],stateMutability:"nonpayable",type:"constructor"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"owner",type:"address"},{indexed:true,internalType:"address",name:"spender",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"}],name:"Approval",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"from",type:"address"},{indexed:true,internalType:"address",name:"to",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"}],name:"Transfer",type:"event"},{inputs:[{internalType:"address",name:"owner",type:"address"},{internalType:"address",name:"spender",type:"address"}],name:"allowance",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"approve",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"balanceOf",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[],name:"decimals",outputs:[{internalType:"uint8",name:"",type:"uint8"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"subtractedValue",type:"uint256"}],name:"decreaseAllowance",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"addedValue",type:"uint256"}],name:"increaseAllowance",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"name",outputs:[{internalType:"string",name:"",type:"string"}],stateMutability:"view",type:"function"},{inputs:[],name:"symbol",outputs:[{internalType:"string",name:"",type:"string"}],stateMutability:"view",type:"function"},{inputs:[],name:"totalSupply",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"to",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"transfer",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"from",type:"address"},{internalType:"address",name:"to",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"transferFrom",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"}];const arbitrumUsdcAbi=[{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"owner",type:"address"},{indexed:true,internalType:"address",name:"spender",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"}],name:"Approval",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"account",type:"address"}],name:"Blacklisted",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"newBlacklister",type:"address"}],name:"BlacklisterChanged",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"previousOwner",type:"address"},{indexed:true,internalType:"address",name:"newOwner",type:"address"}],name:"OwnerChanged",type:"event"},{anonymous:false,inputs:[{indexed:false,internalType:"address",name:"pauser",type:"address"}],name:"Paused",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"previousPauser",type:"address"},{indexed:true,internalType:"address",name:"newPauser",type:"address"}],name:"PauserChanged",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"from",type:"address"},{indexed:true,internalType:"address",name:"to",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"},{indexed:false,internalType:"bytes",name:"data",type:"bytes"}],name:"Transfer",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"from",type:"address"},{indexed:true,internalType:"address",name:"to",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"}],name:"Transfer",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"account",type:"address"}],name:"UnBlacklisted",type:"event"},{anonymous:false,inputs:[{indexed:false,internalType:"address",name:"pauser",type:"address"}],name:"Unpaused",type:"event"},{inputs:[],name:"DOMAIN_SEPARATOR",outputs:[{internalType:"bytes32",name:"",type:"bytes32"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"owner",type:"address"},{internalType:"address",name:"spender",type:"address"}],name:"allowance",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"approve",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"balanceOf",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"blacklist",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"blacklister",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"bridgeBurn",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"_l1Address",type:"address"},{internalType:"bytes",name:"_data",type:"bytes"}],name:"bridgeInit",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"bridgeMint",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"changeOwner",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"decimals",outputs:[{internalType:"uint8",name:"",type:"uint8"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"subtractedValue",type:"uint256"}],name:"decreaseAllowance",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"gatewayAddress",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"addedValue",type:"uint256"}],name:"increaseAllowance",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"string",name:"name",type:"string"},{internalType:"string",name:"symbol",type:"string"},{internalType:"uint8",name:"decimals",type:"uint8"}],name:"initialize",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"_gatewayAddress",type:"address"},{internalType:"address",name:"_l1Address",type:"address"},{internalType:"address",name:"owner",type:"address"},{internalType:"string",name:"name",type:"string"},{internalType:"string",name:"symbol",type:"string"},{internalType:"uint8",name:"decimals",type:"uint8"}],name:"initialize",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"isBlacklisted",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"view",type:"function"},{inputs:[],name:"l1Address",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[],name:"name",outputs:[{internalType:"string",name:"",type:"string"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"owner",type:"address"}],name:"nonces",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[],name:"owner",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[],name:"pause",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"paused",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"view",type:"function"},{inputs:[],name:"pauser",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"owner",type:"address"},{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"value",type:"uint256"},{internalType:"uint256",name:"deadline",type:"uint256"},{internalType:"uint8",name:"v",type:"uint8"},{internalType:"bytes32",name:"r",type:"bytes32"},{internalType:"bytes32",name:"s",type:"bytes32"}],name:"permit",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"setPauser",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"symbol",outputs:[{internalType:"string",name:"",type:"string"}],stateMutability:"view",type:"function"},{inputs:[],name:"totalSupply",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"recipient",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"transfer",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"to",type:"address"},{internalType:"uint256",name:"value",type:"uint256"},{internalType:"bytes",name:"data",type:"bytes"}],name:"transferAndCall",outputs:[{internalType:"bool",name:"success",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"sender",type:"address"},{internalType:"address",name:"recipient",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"transferFrom",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"unBlacklist",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"unpause",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"newBlacklister",type:"address"}],name:"updateBlacklister",outputs:[],stateMutability:"nonpayable",type:"function"}];const optimizmUsdcAbi=[{inputs:[{internalType:"address",name:"_l2Bridge",type:"address"},{internalType:"address",name:"_l1Token",type:"address"},{internalType:"address",name:"owner",type:"address"},{internalType:"string",name:"name",type:"string"},{internalType:"string",name:"symbol",type:"string"},{internalType:"uint8",name:"decimals",type:"uint8"}],stateMutability:"nonpayable",type:"constructor"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"owner",type:"address"},{indexed:true,internalType:"address",name:"spender",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"}],name:"Approval",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"account",type:"address"}],name:"Blacklisted",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"newBlacklister",type:"address"}],name:"BlacklisterChanged",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"_account",type:"address"},{indexed:false,internalType:"uint256",name:"_amount",type:"uint256"}],name:"Burn",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"_account",type:"address"},{indexed:false,internalType:"uint256",name:"_amount",type:"uint256"}],name:"Mint",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"previousOwner",type:"address"},{indexed:true,internalType:"address",name:"newOwner",type:"address"}],name:"OwnerChanged",type:"event"},{anonymous:false,inputs:[{indexed:false,internalType:"address",name:"pauser",type:"address"}],name:"Paused",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"previousPauser",type:"address"},{indexed:true,internalType:"address",name:"newPauser",type:"address"}],name:"PauserChanged",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"from",type:"address"},{indexed:true,internalType:"address",name:"to",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"}],name:"Transfer",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"account",type:"address"}],name:"UnBlacklisted",type:"event"},{anonymous:false,inputs:[{indexed:false,internalType:"address",name:"pauser",type:"address"}],name:"Unpaused",type:"event"},{inputs:[{internalType:"address",name:"owner",type:"address"},{internalType:"address",name:"spender",type:"address"}],name:"allowance",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"approve",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"balanceOf",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"blacklist",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"blacklister",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"burn",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"changeOwner",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"decimals",outputs:[{internalType:"uint8",name:"",type:"uint8"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"subtractedValue",type:"uint256"}],name:"decreaseAllowance",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"addedValue",type:"uint256"}],name:"increaseAllowance",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"isBlacklisted",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"view",type:"function"},{inputs:[],name:"l1Token",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[],name:"l2Bridge",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"mint",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"name",outputs:[{internalType:"string",name:"",type:"string"}],stateMutability:"view",type:"function"},{inputs:[],name:"owner",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[],name:"pause",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"paused",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"view",type:"function"},{inputs:[],name:"pauser",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"setPauser",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes4",name:"_interfaceId",type:"bytes4"}],name:"supportsInterface",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"pure",type:"function"},{inputs:[],name:"symbol",outputs:[{internalType:"string",name:"",type:"string"}],stateMutability:"view",type:"function"},{inputs:[],name:"totalSupply",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"recipient",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"transfer",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"sender",type:"address"},{internalType:"address",name:"recipient",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"transferFrom",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"unBlacklist",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"unpause",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"newBlacklister",type:"address"}],name:"updateBlacklister",outputs:[],stateMutability:"nonpayable",type:"function"}];function networkNameFromId(networkId){if(networkId==10){return"optimism"}if(networkId==56){return"bnb"}if(networkId==42161){return"arbitrum"}return"unsupported"}function getTokenContractAbi(networkId){if(networkId==10){return optimizmUsdcAbi}if(networkId==56){return bnbBusdAbi}if(networkId==42161){return arbitrumUsdcAbi}}},{}],2:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.getCookie=getCookie;exports.setCookie=setCookie;function getCookie(name){let cookieValue=null;if(document.cookie&&document.cookie!==""){const cookies=document.cookie.split(";");for(let i=0;i<cookies.length;i++){const cookie=cookies[i].trim();if(cookie.substring(0,name.length+1)===name+"="){cookieValue=decodeURIComponent(cookie.substring(name.length+1));break}}}return cookieValue}function setCookie(name,value,days){const date=new Date;date.setTime(date.getTime()+days*24*60*60*1e3);const expires=date.toGMTString();document.cookie=`${name}=${value}; expires=${expires}; path=/`}},{}],3:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.default=void 0;let $timeEl=null;let endDate=null;function countDownTime(){let diff=Date.now()-endDate;let ns=-1*diff/1e3>>0;let m=ns/60>>0;let s=ns-m*60;let time=m+":"+((""+s).length>1?"":"0")+s;$timeEl.text(time);if(diff<3e5){setTimeout(countDownTime,1e3)}else{if(!window.debugMode){setTimeout((()=>location.reload()),5e3)}}}function initCoutdown(){$timeEl=$(".js-countdown");if(!$timeEl.length)return;endDate=new Date;const leftSeconds=$timeEl.data("seconds");if(leftSeconds<=0){if(!window.debugMode){setTimeout((()=>location.reload()),5e3)}return}endDate.setSeconds(endDate.getSeconds()+leftSeconds);countDownTime()}var _default=initCoutdown;exports.default=_default},{}],4:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.default=void 0;const curry=fn=>{if(typeof fn!=="function"){throw Error("curry: no function provided")}return function curriedFn(...args){if(args.length<fn.length){return function(){return curriedFn.apply(null,args.concat([].slice.call(arguments)))}}return fn.apply(null,args)}};var _default=curry;exports.default=_default},{}],5:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.default=void 0;var _curry=_interopRequireDefault(require("./curry.js"));function _interopRequireDefault(obj){return obj&&obj.__esModule?obj:{default:obj}}async function getDealStage(offerPk,currentDealStage){const url=`/offer/stage/${offerPk}/`;const response=await $.ajax({url:url,cache:false});if(response.stage&&response.stage>currentDealStage){location.reload()}}function initDealStageCheck(){const $el=$(".js-deal");const currentDealStage=$el.data("deal-stage");if(!currentDealStage)return;const offerPk=$el.data("deal-pk");const bindedGetDealStage=getDealStage.bind(null,offerPk,currentDealStage);window.setInterval(bindedGetDealStage,5e3)}var _default=initDealStageCheck;exports.default=_default},{"./curry.js":4}],6:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.initWatchBackendMessages=initWatchBackendMessages;exports.showDjangoMessages=showDjangoMessages;function showDjangoMessages(){if(!window.messagesDjango)return;window.messagesDjango.forEach((messageObj=>{let messageType=messageObj.tags.toLowerCase();if(messageType=="error"){messageType="fail"}showNotification(messageObj.tags,messageObj.message,messageType)}))}async function checkBackendMessages(){const result=await $.ajax({url:"/my-messages/",cache:false});if(result.messages){result.messages.forEach((message=>{showNotification(message.title,message.message,message.tag)}))}}function initWatchBackendMessages(){if(!$(document.body).data("watch-messages")=="1")return;if(window.debugMode){checkBackendMessages()}else{window.setInterval(checkBackendMessages,3e3)}}},{}],7:[function(require,module,exports){"use strict";var _tutorial=_interopRequireDefault(require("./tutorial.js"));var _countdown=_interopRequireDefault(require("./countdown.js"));var _dealStage=_interopRequireDefault(require("./deal-stage.js"));var _messages=require("./messages.js");var cookie=_interopRequireWildcard(require("./cookie.js"));var _config=require("./config.js");function _getRequireWildcardCache(nodeInterop){if(typeof WeakMap!=="function")return null;var cacheBabelInterop=new WeakMap;var cacheNodeInterop=new WeakMap;return(_getRequireWildcardCache=function(nodeInterop){return nodeInterop?cacheNodeInterop:cacheBabelInterop})(nodeInterop)}function _interopRequireWildcard(obj,nodeInterop){if(!nodeInterop&&obj&&obj.__esModule){return obj}if(obj===null||typeof obj!=="object"&&typeof obj!=="function"){return{default:obj}}var cache=_getRequireWildcardCache(nodeInterop);if(cache&&cache.has(obj)){return cache.get(obj)}var newObj={};var hasPropertyDescriptor=Object.defineProperty&&Object.getOwnPropertyDescriptor;for(var key in obj){if(key!=="default"&&Object.prototype.hasOwnProperty.call(obj,key)){var desc=hasPropertyDescriptor?Object.getOwnPropertyDescriptor(obj,key):null;if(desc&&(desc.get||desc.set)){Object.defineProperty(newObj,key,desc)}else{newObj[key]=obj[key]}}}newObj.default=obj;if(cache){cache.set(obj,newObj)}return newObj}function _interopRequireDefault(obj){return obj&&obj.__esModule?obj:{default:obj}}const NUM_CONFIRM=2;const UPLOAD_LIMIT=2*1024*1024;const escrowContractAbi=[{inputs:[],stateMutability:"nonpayable",type:"constructor"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"},{indexed:false,internalType:"bool",name:"_isSeller",type:"bool"}],name:"ArbitrationCall",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"},{indexed:false,internalType:"uint256",name:"_seller_amount",type:"uint256"},{indexed:false,internalType:"uint256",name:"_buyer_amount",type:"uint256"}],name:"ArbitrationCompleted",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"},{indexed:false,internalType:"uint256",name:"amount",type:"uint256"}],name:"BuyerClaimed",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"BuyerCompleted",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"},{indexed:false,internalType:"uint256",name:"amount",type:"uint256"}],name:"BuyerDeposited",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"DealCreated",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"_arbiter",type:"address"}],name:"NewArbiter",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"role",type:"bytes32"},{indexed:true,internalType:"bytes32",name:"previousAdminRole",type:"bytes32"},{indexed:true,internalType:"bytes32",name:"newAdminRole",type:"bytes32"}],name:"RoleAdminChanged",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"role",type:"bytes32"},{indexed:true,internalType:"address",name:"account",type:"address"},{indexed:true,internalType:"address",name:"sender",type:"address"}],name:"RoleGranted",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"role",type:"bytes32"},{indexed:true,internalType:"address",name:"account",type:"address"},{indexed:true,internalType:"address",name:"sender",type:"address"}],name:"RoleRevoked",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"},{indexed:false,internalType:"uint256",name:"amount",type:"uint256"}],name:"SellerClaimed",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"},{indexed:false,internalType:"uint256",name:"amount",type:"uint256"}],name:"SellerDeposited",type:"event"},{inputs:[],name:"ARBITER_ROLE",outputs:[{internalType:"bytes32",name:"",type:"bytes32"}],stateMutability:"view",type:"function"},{inputs:[],name:"DEFAULT_ADMIN_ROLE",outputs:[{internalType:"bytes32",name:"",type:"bytes32"}],stateMutability:"view",type:"function"},{inputs:[],name:"SIGNER_ROLE",outputs:[{internalType:"bytes32",name:"",type:"bytes32"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"buyerClaim",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"buyerComplete",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{components:[{internalType:"address",name:"seller",type:"address"},{internalType:"address",name:"buyer",type:"address"},{internalType:"uint256",name:"price",type:"uint256"},{internalType:"uint256",name:"fee",type:"uint256"},{internalType:"uint256",name:"collateral",type:"uint256"},{internalType:"uint256",name:"timestamp",type:"uint256"},{internalType:"bytes",name:"signature",type:"bytes"}],internalType:"struct EscrowContract.Deal",name:"newdeal",type:"tuple"}],name:"buyerDeposit",outputs:[{internalType:"bytes32",name:"",type:"bytes32"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"callArbitration",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"getChainID",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"getDeal",outputs:[{components:[{internalType:"address",name:"seller",type:"address"},{internalType:"address",name:"buyer",type:"address"},{internalType:"uint256",name:"price",type:"uint256"},{internalType:"uint256",name:"fee",type:"uint256"},{internalType:"uint256",name:"collateral",type:"uint256"},{internalType:"uint256",name:"timestamp",type:"uint256"},{internalType:"uint256",name:"buyer_deposited",type:"uint256"},{internalType:"uint256",name:"seller_deposited",type:"uint256"},{internalType:"uint256",name:"buyer_claim",type:"uint256"},{internalType:"uint256",name:"seller_claim",type:"uint256"},{internalType:"uint256",name:"claim_time",type:"uint256"},{internalType:"bytes",name:"signature",type:"bytes"},{internalType:"bool",name:"exists",type:"bool"},{internalType:"bool",name:"arbitration",type:"bool"},{internalType:"bool",name:"buyer_completed",type:"bool"},{internalType:"bool",name:"closed",type:"bool"}],internalType:"struct EscrowContract.EscrowDeal",name:"_deal",type:"tuple"}],stateMutability:"view",type:"function"},{inputs:[],name:"getDealHashes",outputs:[{internalType:"bytes32[]",name:"",type:"bytes32[]"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"bytes32",name:"role",type:"bytes32"}],name:"getRoleAdmin",outputs:[{internalType:"bytes32",name:"",type:"bytes32"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"bytes32",name:"role",type:"bytes32"},{internalType:"address",name:"account",type:"address"}],name:"grantRole",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"role",type:"bytes32"},{internalType:"address",name:"account",type:"address"}],name:"hasRole",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"view",type:"function"},{inputs:[],name:"owner",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"},{internalType:"uint256",name:"_seller_amount",type:"uint256"},{internalType:"uint256",name:"_buyer_amount",type:"uint256"}],name:"performArbitration",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"role",type:"bytes32"},{internalType:"address",name:"account",type:"address"}],name:"renounceRole",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"role",type:"bytes32"},{internalType:"address",name:"account",type:"address"}],name:"revokeRole",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"sellerClaim",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"sellerDeposit",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"_arbiter",type:"address"}],name:"setArbiter",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"_BUSD",type:"address"}],name:"setBUSD",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"_signer",type:"address"}],name:"setSigner",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes4",name:"interfaceId",type:"bytes4"}],name:"supportsInterface",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"uint256",name:"amount",type:"uint256"}],name:"withdrawFunds",outputs:[],stateMutability:"nonpayable",type:"function"}];function sleep(seconds){return new Promise((resolve=>setTimeout(resolve,seconds*1e3)))}function extractErrorMessage(error){let errorMessage=error;if(error.message){errorMessage=error.message}if(error.error&&error.error.data&&error.error.data.message){errorMessage=error.error.data.message}return errorMessage}function getProviderNetwork(){const provider=new ethers.providers.Web3Provider(window.ethereum);return provider.getNetwork()}async function changeProviderNetwork(provider,selectedNetwork){const selectedNetworkConf=_config.networks[selectedNetwork];let isUnrecognizedChain=false;try{await provider.send("wallet_switchEthereumChain",[{chainId:selectedNetworkConf.chainId}])}catch(error){if(error.code=4902){isUnrecognizedChain=true}}if(isUnrecognizedChain){await provider.send("wallet_addEthereumChain",[selectedNetworkConf])}}async function onClickMetamaskAuth(eventObj){eventObj.preventDefault();const provider=new ethers.providers.Web3Provider(window.ethereum);let selectedNetwork=$(".js-network-select").val();if(selectedNetwork=="unsupported"){selectedNetwork="bnb"}try{await changeProviderNetwork(provider,selectedNetwork);await provider.send("eth_requestAccounts",[]);const signer=provider.getSigner();const address=await signer.getAddress();const nonceData=await $.ajax({url:"/auth/nonce",data:{account:address},cache:false});const signature=await signer.signMessage(nonceData.nonce);const validateData=await $.ajax({method:"post",url:"/auth/validate",data:{account:address,signature:signature,network:selectedNetwork,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});if(validateData.result=="OK"){location.reload()}}catch(error){const errorMessage=extractErrorMessage(error);console.log(errorMessage);showNotification("Error",errorMessage,"fail")}}function onClickUpdateAvatar(eventObj){$(".js-image-input-div input[type=file]").click()}async function onClickBuyerApprove(eventObj){const escrowContractAddr=$(this).data("escrow-addr");const tokenContractAddr=$(this).data("token-addr");const tokenName=$(this).data("token-name");const tokenDecimals=$(this).data("token-decimals");const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const amount=ethers.utils.parseUnits(String($(this).data("amount")),tokenDecimals);const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}$(".js-load-spinner").show();$(this).unbind("click").remove();try{await provider.send("eth_requestAccounts",[]);const tokenContract=new ethers.Contract(tokenContractAddr,(0,_config.getTokenContractAbi)(network.chainId),provider);const signer=provider.getSigner();const buyerTokenContractCall=tokenContract.connect(signer);const approveResult=await buyerTokenContractCall.approve(escrowContractAddr,amount);const result=await $.ajax({method:"post",url:"/offer/approve-token",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const receipt=await approveResult.wait(NUM_CONFIRM);showNotification("Info",`Approved ${tokenName}`,"success")}catch(error){const errorMessage=extractErrorMessage(error);console.log(errorMessage);showNotification("Error",errorMessage,"fail")}await sleep(3);location.reload()}async function onClickBuyerDeposit(eventObj){const escrowContractAddr=$(this).data("escrow-addr");const tokenName=$(this).data("token-name");const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}$(".js-load-spinner").show();$(this).unbind("click").remove();let action="wait";try{await provider.send("eth_requestAccounts",[]);const escrowContract=new ethers.Contract(escrowContractAddr,escrowContractAbi,provider);const signer=provider.getSigner();const signResult=await $.ajax({method:"post",url:"/offer/sign-deal",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const voucher=signResult.deal;const buyerEscrowContractCall=escrowContract.connect(signer);console.log("before");console.log(voucher);const depositResult=await buyerEscrowContractCall.buyerDeposit(voucher);console.log("after");const result=await $.ajax({method:"post",url:"/offer/buyer-deposited",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const depositReceipt=await depositResult.wait(NUM_CONFIRM);action=result.action;if(!result.supress_message){showNotification("Info","Deposit was sent","success")}}catch(error){let errorMessage=extractErrorMessage(error);console.log(errorMessage);let isRetryApprove=false;if(errorMessage.toLowerCase().indexOf("allowance is too low")>0){isRetryApprove=true;errorMessage=`${tokenName} not approved!`}showNotification("Error",errorMessage,"fail");if(isRetryApprove){const result=await $.ajax({method:"post",url:"/offer/retry-approve",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});await sleep(3);location.reload()}$(".js-load-spinner").hide();return}if(action=="reload"){await sleep(3);location.reload()}else{await sleep(20);$(".js-load-spinner").hide();location.reload()}}async function onClickSellerApprove(eventObj){const escrowContractAddr=$(this).data("escrow-addr");const tokenContractAddr=$(this).data("token-addr");const tokenName=$(this).data("token-name");const tokenDecimals=$(this).data("token-decimals");const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const amount=ethers.utils.parseUnits(String($(this).data("amount")),tokenDecimals);const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}$(".js-load-spinner").show();$(this).unbind("click").remove();try{await provider.send("eth_requestAccounts",[]);const tokenContract=new ethers.Contract(tokenContractAddr,(0,_config.getTokenContractAbi)(network.chainId),provider);const signer=provider.getSigner();const sellerTokenContractCall=tokenContract.connect(signer);const approveResult=await sellerTokenContractCall.approve(escrowContractAddr,amount);const result=await $.ajax({method:"post",url:"/offer/approve-token",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const receipt=await approveResult.wait(NUM_CONFIRM);showNotification("Info",`Approved ${tokenName}`,"success")}catch(error){const errorMessage=extractErrorMessage(error);console.log(errorMessage);showNotification("Error",errorMessage,"fail");$(".js-load-spinner").hide();return}await sleep(3);location.reload()}async function onClickSellerCollateral(eventObj){const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const dealHash=$(this).data("deal-hash");const escrowContractAddr=$(this).data("escrow-addr");const tokenName=$(this).data("token-name");const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}$(".js-load-spinner").show();$(this).unbind("click").remove();let action="wait";try{await provider.send("eth_requestAccounts",[]);const escrowContract=new ethers.Contract(escrowContractAddr,escrowContractAbi,provider);const signer=provider.getSigner();const sellerEscrowContractCall=escrowContract.connect(signer);const depositResult=await sellerEscrowContractCall.sellerDeposit(dealHash);const result=await $.ajax({method:"post",url:"/offer/seller-payed-collateral",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const depositReceipt=await depositResult.wait(NUM_CONFIRM);action=result.action;if(!result.supress_message){showNotification("Info","Deposit was sent","success")}}catch(error){let errorMessage=extractErrorMessage(error);console.log(errorMessage);let isRetryApprove=false;if(errorMessage.toLowerCase().indexOf("allowance is too low")>0){isRetryApprove=true;errorMessage=`${tokenName} not approved!`}showNotification("Error",errorMessage,"fail");if(isRetryApprove){const result=await $.ajax({method:"post",url:"/offer/retry-approve",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});await sleep(3);location.reload()}$(".js-load-spinner").hide();return}if(action=="reload"){await sleep(3);location.reload()}else{await sleep(20);$(".js-load-spinner").hide();location.reload()}}async function onClickBuyerComplete(eventObj){$(".js-load-spinner").show();let rating=Number($(".js-feedback-rating").val());if(isNaN(rating)||rating==0){rating=5}const details=$(".js-feedback-details").val();const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const dealHash=$(this).data("deal-hash");const escrowContractAddr=$(this).data("escrow-addr");const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}try{await provider.send("eth_requestAccounts",[]);const escrowContract=new ethers.Contract(escrowContractAddr,escrowContractAbi,provider);const signer=provider.getSigner();const buyerEscrowContractCall=escrowContract.connect(signer);const completeResult=await buyerEscrowContractCall.buyerComplete(dealHash);await $.ajax({method:"post",url:"/offer/buyer-complete",data:{deal:dealId,rating:rating,details:details,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const receipt=await completeResult.wait(NUM_CONFIRM);showNotification("Info","Deal complete","success")}catch(error){const errorMessage=extractErrorMessage(error);console.log(errorMessage);showNotification("Error",errorMessage,"fail");$(".js-load-spinner").hide();return}await sleep(3);$(".js-load-spinner").hide();location.reload()}async function onClickSellerCompleteClaim(eventObj){$(".js-load-spinner").show();$(this).unbind("click").remove();const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const dealHash=$(this).data("deal-hash");const escrowContractAddr=$(this).data("escrow-addr");const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}try{await provider.send("eth_requestAccounts",[]);const escrowContract=new ethers.Contract(escrowContractAddr,escrowContractAbi,provider);const signer=provider.getSigner();const sellerEscrowContractCall=escrowContract.connect(signer);const completeResult=await sellerEscrowContractCall.sellerClaim(dealHash);await $.ajax({method:"post",url:"/offer/confirm-finish",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const receipt=await completeResult.wait(NUM_CONFIRM);showNotification("Info","Money was claimed","success")}catch(error){const errorMessage=extractErrorMessage(error);console.log(errorMessage);showNotification("Error",errorMessage,"fail")}$(".js-load-spinner").hide()}async function claimMoney($el,isSeller,callbackName){let isClaimError=false;$(".js-load-spinner").show();$el.unbind("click").remove();const dealId=$el.data("deal");const chainId=$el.data("chain-id");const dealHash=$el.data("deal-hash");const escrowContractAddr=$el.data("escrow-addr");const tokenName=$el.data("token-name");const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}try{await provider.send("eth_requestAccounts",[]);const escrowContract=new ethers.Contract(escrowContractAddr,escrowContractAbi,provider);const signer=provider.getSigner();const escrowContractCall=escrowContract.connect(signer);let completeResult=null;if(isSeller){completeResult=await escrowContractCall.sellerClaim(dealHash)}else{completeResult=await escrowContractCall.buyerClaim(dealHash)}await $.ajax({method:"post",url:"/offer/"+callbackName,data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const receipt=await completeResult.wait(NUM_CONFIRM);showNotification("Info","Money was claimed","success")}catch(error){const errorMessage=extractErrorMessage(error);if(errorMessage=="execution reverted: Nothing to claim yet"){isClaimError=true}if(!isClaimError){console.log(errorMessage);showNotification("Error",errorMessage,"fail")}}$(".js-load-spinner").hide();if(!isClaimError){await sleep(3);location.reload()}else{showNotification("Error",`${tokenName} already claimed, please wait until deal will be closed!`,"fail")}}async function onClickCallArbitrage(eventObj){const details=$(".js-cancel-details").val();const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const dealHash=$(this).data("deal-hash");const escrowContractAddr=$(this).data("escrow-addr");const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}const reasons=[];$(".js-cancel-reason").each((function(inx,el){if(el.checked){reasons.push(el.value)}}));$(".js-load-spinner").show();try{await provider.send("eth_requestAccounts",[]);const escrowContract=new ethers.Contract(escrowContractAddr,escrowContractAbi,provider);const signer=provider.getSigner();const escrowContractCall=escrowContract.connect(signer);const completeResult=await escrowContractCall.callArbitration(dealHash);await $.ajax({method:"post",url:"/offer/call-arbitration",data:{deal:dealId,reasons:reasons.join(","),details:details,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const receipt=await completeResult.wait(NUM_CONFIRM);showNotification("Info","Deal canceled","success")}catch(error){const errorMessage=error.message||error;console.log(errorMessage);showNotification("Error",errorMessage,"fail");$(".js-load-spinner").hide();return}await sleep(3);$(".js-load-spinner").hide();location.reload()}function onClickBuyerCancelationClaim(eventObj){claimMoney($(this),false,"buyer-claim-after-cancelation")}function onClickBuyerArbitrageClaim(eventObj){claimMoney($(this),false,"buyer-claim-after-arbitrage")}function onClickSellerArbitrageClaim(eventObj){claimMoney($(this),true,"seller-claim-after-arbitrage")}async function onClickShowMoreDeals(eventObj){let page=$(this).data("page");if(!page){page=2}else{page=Number(page)}$(this).data("page",page+1);const result=await $.ajax({url:`/deals/${page}/`,cache:false});$(".js-deals-tbody").append(result.html);if(!result.has_more_deals){$(this).remove()}}async function onClickShowMoreClosedDeals(eventObj){let page=$(this).data("page");if(!page){page=2}else{page=Number(page)}$(this).data("page",page+1);const result=await $.ajax({url:`/closed-deals/${page}/`,cache:false});$(".js-closed-deals-tbody").append(result.html);if(!result.has_more_closed_deals){$(this).remove()}}async function onClickShowMoreLatestDeals(eventObj){let page=$(this).data("page");if(!page){page=2}else{page=Number(page)}$(this).data("page",page+1);const result=await $.ajax({url:`/latest-deals/${page}/`,cache:false});$(".js-latest-deals-tbody").append(result.html);if(!result.has_more_deals){$(this).remove()}}async function onClickShowMoreNotifications(eventObj){let page=$(this).data("page");if(!page){page=2}else{page=Number(page)}$(this).data("page",page+1);const notificationsType=$(this).data("notifications-type");const result=await $.ajax({url:`/notifications/${notificationsType}/${page}/`,cache:false});$(this).prev().append(result.html);if(!result.has_more_notifications){$(this).remove()}}async function onChangeAvatar(eventObj){const elAvatarInput=eventObj.currentTarget;const filesForm=new FormData;let isValid=true;Array.from(elAvatarInput.files).forEach((file=>{if(file.size>UPLOAD_LIMIT){isValid=false}filesForm.append("avatar",file)}));if(!isValid){showNotification("Error","Please choose image less than 2mb","fail");return}const result=await $.ajax({url:"/upload-avatar/",data:filesForm,processData:false,contentType:false,type:"POST"});if(result.error){if(result.error=="filesize"){showNotification("Error","Please choose image less than 2mb","fail")}return}$(".js-thumbnail1").attr("src",result.thumbnail1);$(".js-thumbnail2").attr("src",result.thumbnail2);showNotification("Info","Photo updated!","success")}function initRefName(){const params=new URLSearchParams(document.location.search.substr(1));const refName=params.get("ref");if(refName){cookie.setCookie("refname",refName,180)}}function onClickSelectLanguage(eventObj){eventObj.preventDefault();const langCode=this.dataset.language;const $langInput=$(".js-language-input");$langInput.val(langCode);$langInput.parent().submit()}async function onChangeNetwork(eventObj){const selectedNetwork=eventObj.currentTarget.value;if(selectedNetwork=="unsupported"){return}const provider=new ethers.providers.Web3Provider(window.ethereum);await changeProviderNetwork(provider,selectedNetwork);document.querySelector('[data-value="unsupported"]').classList.add("js--hide")}function init(){getProviderNetwork().then((network=>{const networkName=(0,_config.networkNameFromId)(network.chainId);const elSelectNetwork=document.querySelector(".js-network-select");const elFakeSelect=elSelectNetwork.parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);if(!Object.is(elNetwork,null)){elFakeSelect.querySelector('[data-value="unsupported"]').classList.add("js--hide");$(elNetwork).click();elFakeSelect.classList.remove("active")}elFakeSelect.classList.remove("js--hide");$(elSelectNetwork).on("change",onChangeNetwork);window.ethereum.on("networkChanged",(function(networkId){$(elSelectNetwork).unbind("change");const networkName=(0,_config.networkNameFromId)(networkId);let elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);if(!Object.is(elNetwork,null)){elFakeSelect.querySelector('[data-value="unsupported"]').classList.add("js--hide")}else{elNetwork=elFakeSelect.querySelector('[data-value="unsupported"]');elNetwork.classList.remove("js--hide")}$(elNetwork).click();elFakeSelect.classList.remove("active");$(elSelectNetwork).on("change",onChangeNetwork)}))}));(0,_countdown.default)();(0,_dealStage.default)();initRefName();$(".js-signin-metamask").click(onClickMetamaskAuth);$(".js-buyer-approve").click(onClickBuyerApprove);$(".js-buyer-deposit").click(onClickBuyerDeposit);$(".js-buyer-complete").click(onClickBuyerComplete);$(".js-seller-approve").click(onClickSellerApprove);$(".js-seller-collateral").click(onClickSellerCollateral);$(".js-seller-complete-claim").click(onClickSellerCompleteClaim);$(".js-buyer-cancelation-claim").click(onClickBuyerCancelationClaim);$(".js-buyer-cancel").click(onClickCallArbitrage);$(".js-seller-cancel").click(onClickCallArbitrage);$(".js-buyer-arbitrage-claim").click(onClickBuyerArbitrageClaim);$(".js-seller-arbitrage-claim").click(onClickSellerArbitrageClaim);(0,_tutorial.default)();(0,_messages.showDjangoMessages)();(0,_messages.initWatchBackendMessages)();$(".js-notify-fill-profile").click((function(eventObj){showNotification("Error",'Please fill your <a href="/settings/">profile settings</a> first!',"fail")}));$(".js-notify-blocked").click((function(eventObj){showNotification("Error","Your account was blocked!","fail")}));$(".js-show-more-deals").click(onClickShowMoreDeals);$(".js-show-more-closed-deals").click(onClickShowMoreClosedDeals);$(".js-show-more-latest-deals").click(onClickShowMoreLatestDeals);$(".js-show-more-notifications").on("click",onClickShowMoreNotifications);$(".js-update-avatar-img").click(onClickUpdateAvatar);$(".js-image-input-div input[type=file]").change(onChangeAvatar);$(".js-select-language").click(onClickSelectLanguage)}$(document).ready(init)},{"./config.js":1,"./cookie.js":2,"./countdown.js":3,"./deal-stage.js":5,"./messages.js":6,"./tutorial.js":8}],8:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.default=void 0;var cookie=_interopRequireWildcard(require("./cookie.js"));function _getRequireWildcardCache(nodeInterop){if(typeof WeakMap!=="function")return null;var cacheBabelInterop=new WeakMap;var cacheNodeInterop=new WeakMap;return(_getRequireWildcardCache=function(nodeInterop){return nodeInterop?cacheNodeInterop:cacheBabelInterop})(nodeInterop)}function _interopRequireWildcard(obj,nodeInterop){if(!nodeInterop&&obj&&obj.__esModule){return obj}if(obj===null||typeof obj!=="object"&&typeof obj!=="function"){return{default:obj}}var cache=_getRequireWildcardCache(nodeInterop);if(cache&&cache.has(obj)){return cache.get(obj)}var newObj={};var hasPropertyDescriptor=Object.defineProperty&&Object.getOwnPropertyDescriptor;for(var key in obj){if(key!=="default"&&Object.prototype.hasOwnProperty.call(obj,key)){var desc=hasPropertyDescriptor?Object.getOwnPropertyDescriptor(obj,key):null;if(desc&&(desc.get||desc.set)){Object.defineProperty(newObj,key,desc)}else{newObj[key]=obj[key]}}}newObj.default=obj;if(cache){cache.set(obj,newObj)}return newObj}function onTutorialShown(){cookie.setCookie("tutorial","1",360*100)}function showTutorialPopup(){$(".popup.active").removeClass("active");$("#tutorial").addClass("active")}function initTutorial(){const isTutorialShown=cookie.getCookie("tutorial");if(!Object.is(isTutorialShown,null)&&isTutorialShown=="1")return;$(document).on("tutorial:shown",onTutorialShown);showTutorialPopup()}var _default=initTutorial;exports.default=_default},{"./cookie.js":2}]},{},[7]);
+(function(){function r(e,n,t){function o(i,f){if(!n[i]){if(!e[i]){var c="function"==typeof require&&require;if(!f&&c)return c(i,!0);if(u)return u(i,!0);var a=new Error("Cannot find module '"+i+"'");throw a.code="MODULE_NOT_FOUND",a}var p=n[i]={exports:{}};e[i][0].call(p.exports,(function(r){var n=e[i][1][r];return o(n||r)}),p,p.exports,r,e,n,t)}return n[i].exports}for(var u="function"==typeof require&&require,i=0;i<t.length;i++)o(t[i]);return o}return r})()({1:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.getTokenContractAbi=getTokenContractAbi;exports.networkNameFromId=networkNameFromId;exports.networks=void 0;const networks={bnb:{chainId:"0x38",chainName:"BNB Smart Chain Mainnet",nativeCurrency:{name:"BNB",symbol:"BNB",decimals:18},rpcUrls:["https://bsc-dataseed.binance.org"],blockExplorerUrls:["https://bscscan.com"]},arbitrum:{chainId:"0xA4B1",chainName:"Arbitrum Mainnet",nativeCurrency:{name:"ETH",symbol:"ETH",decimals:18},rpcUrls:["https://arb1.arbitrum.io/rpc"],blockExplorerUrls:["https://arbiscan.io"]},optimism:{chainId:"0xA",chainName:"Optimism Mainnet",nativeCurrency:{name:"ETH",symbol:"ETH",decimals:18},rpcUrls:["https://mainnet.optimism.io"],blockExplorerUrls:["https://optimistic.etherscan.io"]}};exports.networks=networks;const bnbBusdAbi=[{inputs:[],stateMutability:"nonpayable",type:"constructor"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"owner",type:"address"},{indexed:true,internalType:"address",name:"spender",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"}],name:"Approval",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"from",type:"address"},{indexed:true,internalType:"address",name:"to",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"}],name:"Transfer",type:"event"},{inputs:[{internalType:"address",name:"owner",type:"address"},{internalType:"address",name:"spender",type:"address"}],name:"allowance",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"approve",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"balanceOf",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[],name:"decimals",outputs:[{internalType:"uint8",name:"",type:"uint8"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"subtractedValue",type:"uint256"}],name:"decreaseAllowance",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"addedValue",type:"uint256"}],name:"increaseAllowance",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"name",outputs:[{internalType:"string",name:"",type:"string"}],stateMutability:"view",type:"function"},{inputs:[],name:"symbol",outputs:[{internalType:"string",name:"",type:"string"}],stateMutability:"view",type:"function"},{inputs:[],name:"totalSupply",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"to",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"transfer",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"from",type:"address"},{internalType:"address",name:"to",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"transferFrom",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"}];const arbitrumUsdcAbi=[{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"owner",type:"address"},{indexed:true,internalType:"address",name:"spender",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"}],name:"Approval",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"account",type:"address"}],name:"Blacklisted",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"newBlacklister",type:"address"}],name:"BlacklisterChanged",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"previousOwner",type:"address"},{indexed:true,internalType:"address",name:"newOwner",type:"address"}],name:"OwnerChanged",type:"event"},{anonymous:false,inputs:[{indexed:false,internalType:"address",name:"pauser",type:"address"}],name:"Paused",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"previousPauser",type:"address"},{indexed:true,internalType:"address",name:"newPauser",type:"address"}],name:"PauserChanged",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"from",type:"address"},{indexed:true,internalType:"address",name:"to",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"},{indexed:false,internalType:"bytes",name:"data",type:"bytes"}],name:"Transfer",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"from",type:"address"},{indexed:true,internalType:"address",name:"to",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"}],name:"Transfer",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"account",type:"address"}],name:"UnBlacklisted",type:"event"},{anonymous:false,inputs:[{indexed:false,internalType:"address",name:"pauser",type:"address"}],name:"Unpaused",type:"event"},{inputs:[],name:"DOMAIN_SEPARATOR",outputs:[{internalType:"bytes32",name:"",type:"bytes32"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"owner",type:"address"},{internalType:"address",name:"spender",type:"address"}],name:"allowance",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"approve",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"balanceOf",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"blacklist",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"blacklister",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"bridgeBurn",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"_l1Address",type:"address"},{internalType:"bytes",name:"_data",type:"bytes"}],name:"bridgeInit",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"bridgeMint",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"changeOwner",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"decimals",outputs:[{internalType:"uint8",name:"",type:"uint8"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"subtractedValue",type:"uint256"}],name:"decreaseAllowance",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"gatewayAddress",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"addedValue",type:"uint256"}],name:"increaseAllowance",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"string",name:"name",type:"string"},{internalType:"string",name:"symbol",type:"string"},{internalType:"uint8",name:"decimals",type:"uint8"}],name:"initialize",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"_gatewayAddress",type:"address"},{internalType:"address",name:"_l1Address",type:"address"},{internalType:"address",name:"owner",type:"address"},{internalType:"string",name:"name",type:"string"},{internalType:"string",name:"symbol",type:"string"},{internalType:"uint8",name:"decimals",type:"uint8"}],name:"initialize",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"isBlacklisted",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"view",type:"function"},{inputs:[],name:"l1Address",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[],name:"name",outputs:[{internalType:"string",name:"",type:"string"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"owner",type:"address"}],name:"nonces",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[],name:"owner",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[],name:"pause",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"paused",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"view",type:"function"},{inputs:[],name:"pauser",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"owner",type:"address"},{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"value",type:"uint256"},{internalType:"uint256",name:"deadline",type:"uint256"},{internalType:"uint8",name:"v",type:"uint8"},{internalType:"bytes32",name:"r",type:"bytes32"},{internalType:"bytes32",name:"s",type:"bytes32"}],name:"permit",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"setPauser",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"symbol",outputs:[{internalType:"string",name:"",type:"string"}],stateMutability:"view",type:"function"},{inputs:[],name:"totalSupply",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"recipient",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"transfer",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"to",type:"address"},{internalType:"uint256",name:"value",type:"uint256"},{internalType:"bytes",name:"data",type:"bytes"}],name:"transferAndCall",outputs:[{internalType:"bool",name:"success",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"sender",type:"address"},{internalType:"address",name:"recipient",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"transferFrom",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"unBlacklist",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"unpause",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"newBlacklister",type:"address"}],name:"updateBlacklister",outputs:[],stateMutability:"nonpayable",type:"function"}];const optimizmUsdcAbi=[{inputs:[{internalType:"address",name:"_l2Bridge",type:"address"},{internalType:"address",name:"_l1Token",type:"address"},{internalType:"address",name:"owner",type:"address"},{internalType:"string",name:"name",type:"string"},{internalType:"string",name:"symbol",type:"string"},{internalType:"uint8",name:"decimals",type:"uint8"}],stateMutability:"nonpayable",type:"constructor"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"owner",type:"address"},{indexed:true,internalType:"address",name:"spender",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"}],name:"Approval",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"account",type:"address"}],name:"Blacklisted",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"newBlacklister",type:"address"}],name:"BlacklisterChanged",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"_account",type:"address"},{indexed:false,internalType:"uint256",name:"_amount",type:"uint256"}],name:"Burn",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"_account",type:"address"},{indexed:false,internalType:"uint256",name:"_amount",type:"uint256"}],name:"Mint",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"previousOwner",type:"address"},{indexed:true,internalType:"address",name:"newOwner",type:"address"}],name:"OwnerChanged",type:"event"},{anonymous:false,inputs:[{indexed:false,internalType:"address",name:"pauser",type:"address"}],name:"Paused",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"previousPauser",type:"address"},{indexed:true,internalType:"address",name:"newPauser",type:"address"}],name:"PauserChanged",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"from",type:"address"},{indexed:true,internalType:"address",name:"to",type:"address"},{indexed:false,internalType:"uint256",name:"value",type:"uint256"}],name:"Transfer",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"account",type:"address"}],name:"UnBlacklisted",type:"event"},{anonymous:false,inputs:[{indexed:false,internalType:"address",name:"pauser",type:"address"}],name:"Unpaused",type:"event"},{inputs:[{internalType:"address",name:"owner",type:"address"},{internalType:"address",name:"spender",type:"address"}],name:"allowance",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"approve",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"balanceOf",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"blacklist",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"blacklister",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"burn",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"changeOwner",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"decimals",outputs:[{internalType:"uint8",name:"",type:"uint8"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"subtractedValue",type:"uint256"}],name:"decreaseAllowance",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"spender",type:"address"},{internalType:"uint256",name:"addedValue",type:"uint256"}],name:"increaseAllowance",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"isBlacklisted",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"view",type:"function"},{inputs:[],name:"l1Token",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[],name:"l2Bridge",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"mint",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"name",outputs:[{internalType:"string",name:"",type:"string"}],stateMutability:"view",type:"function"},{inputs:[],name:"owner",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[],name:"pause",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"paused",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"view",type:"function"},{inputs:[],name:"pauser",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"setPauser",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes4",name:"_interfaceId",type:"bytes4"}],name:"supportsInterface",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"pure",type:"function"},{inputs:[],name:"symbol",outputs:[{internalType:"string",name:"",type:"string"}],stateMutability:"view",type:"function"},{inputs:[],name:"totalSupply",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"address",name:"recipient",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"transfer",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"sender",type:"address"},{internalType:"address",name:"recipient",type:"address"},{internalType:"uint256",name:"amount",type:"uint256"}],name:"transferFrom",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"account",type:"address"}],name:"unBlacklist",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"unpause",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"newBlacklister",type:"address"}],name:"updateBlacklister",outputs:[],stateMutability:"nonpayable",type:"function"}];function networkNameFromId(networkId){if(networkId==10){return"optimism"}if(networkId==56){return"bnb"}if(networkId==42161){return"arbitrum"}return"unsupported"}function getTokenContractAbi(networkId){if(networkId==10){return optimizmUsdcAbi}if(networkId==56){return bnbBusdAbi}if(networkId==42161){return arbitrumUsdcAbi}}},{}],2:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.getCookie=getCookie;exports.setCookie=setCookie;function getCookie(name){let cookieValue=null;if(document.cookie&&document.cookie!==""){const cookies=document.cookie.split(";");for(let i=0;i<cookies.length;i++){const cookie=cookies[i].trim();if(cookie.substring(0,name.length+1)===name+"="){cookieValue=decodeURIComponent(cookie.substring(name.length+1));break}}}return cookieValue}function setCookie(name,value,days){const date=new Date;date.setTime(date.getTime()+days*24*60*60*1e3);const expires=date.toGMTString();document.cookie=`${name}=${value}; expires=${expires}; path=/`}},{}],3:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.default=void 0;let $timeEl=null;let endDate=null;function countDownTime(){let diff=Date.now()-endDate;let ns=-1*diff/1e3>>0;let m=ns/60>>0;let s=ns-m*60;let time=m+":"+((""+s).length>1?"":"0")+s;$timeEl.text(time);if(diff<3e5){setTimeout(countDownTime,1e3)}else{if(!window.debugMode){setTimeout((()=>location.reload()),5e3)}}}function initCoutdown(){$timeEl=$(".js-countdown");if(!$timeEl.length)return;endDate=new Date;const leftSeconds=$timeEl.data("seconds");if(leftSeconds<=0){if(!window.debugMode){setTimeout((()=>location.reload()),5e3)}return}endDate.setSeconds(endDate.getSeconds()+leftSeconds);countDownTime()}var _default=initCoutdown;exports.default=_default},{}],4:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.default=void 0;const curry=fn=>{if(typeof fn!=="function"){throw Error("curry: no function provided")}return function curriedFn(...args){if(args.length<fn.length){return function(){return curriedFn.apply(null,args.concat([].slice.call(arguments)))}}return fn.apply(null,args)}};var _default=curry;exports.default=_default},{}],5:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.default=void 0;var _curry=_interopRequireDefault(require("./curry.js"));function _interopRequireDefault(obj){return obj&&obj.__esModule?obj:{default:obj}}async function getDealStage(offerPk,currentDealStage){const url=`/offer/stage/${offerPk}/`;const response=await $.ajax({url:url,cache:false});if(response.stage&&response.stage>currentDealStage){location.reload()}}function initDealStageCheck(){const $el=$(".js-deal");const currentDealStage=$el.data("deal-stage");if(!currentDealStage)return;const offerPk=$el.data("deal-pk");const bindedGetDealStage=getDealStage.bind(null,offerPk,currentDealStage);const pushSource=window.getPushSource&&window.getPushSource();if(pushSource){pushSource.addEventListener("deal",(event=>{if(JSON.parse(event.data).offer==offerPk){bindedGetDealStage()}}));window.setInterval(bindedGetDealStage,6e4)}else{window.setInterval(bindedGetDealStage,5e3)}}var _default=initDealStageCheck;exports.default=_default},{"./curry.js":4}],6:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.initWatchBackendMessages=initWatchBackendMessages;exports.initWatchNotifications=initWatchNotifications;exports.showDjangoMessages=showDjangoMessages;function showDjangoMessages(){if(!window.messagesDjango)return;window.messagesDjango.forEach((messageObj=>{let messageType=messageObj.tags.toLowerCase();if(messageType=="error"){messageType="fail"}showNotification(messageObj.tags,messageObj.message,messageType)}))}async function checkBackendMessages(){const result=await $.ajax({url:"/my-messages/",cache:false});if(result.messages){result.messages.forEach((message=>{showNotification(message.title,message.message,message.tag)}))}}function getPushSource(){if(!window.EventSource||$(document.body).data("push")!="1")return null;if(!window.pushSource){window.pushSource=new EventSource("/push/")}return window.pushSource}window.getPushSource=getPushSource;async function loadNotifications(){const $results=$(".js-notifications-results");const result=await $.ajax({url:"/notifications/refresh/",data:{lists:$results.length?1:0},cache:false});const $link=$(".header__notify a");let $counter=$link.find(".js-total-unseen-notifications");if(result.total_unseen_notifications>0){if(!$counter.length){$counter=$('<i class="js-total-unseen-notifications"></i>').appendTo($link)}$counter.text(result.total_unseen_notifications)}else{$counter.remove()}if(result.lists){$results.each((function(){const list=result.lists[$(this).data("notifications-type")];if(!list)return;$(this).html(list.html);$(this).parent().find(".js-show-more-notifications").data("cursor",list.next_cursor).data("page",2).toggle(list.has_more_notifications)}))}}let notificationsRefresh=null;let notificationsPending=false;function refreshNotifications(){if(notificationsRefresh){notificationsPending=true;return}notificationsRefresh=loadNotifications().finally((()=>{notificationsRefresh=null;if(notificationsPending){notificationsPending=false;refreshNotifications()}}))}function initWatchNotifications(){const pushSource=getPushSource();if(pushSource){pushSource.addEventListener("notification",refreshNotifications)}}function initWatchBackendMessages(){if(!$(document.body).data("watch-messages")=="1")return;if(window.debugMode){checkBackendMessages()}else{const pushSource=getPushSource();if(pushSource){pushSource.addEventListener("backend_message",checkBackendMessages);window.setInterval(checkBackendMessages,6e4)}else{window.setInterval(checkBackendMessages,3e3)}}}},{}],7:[function(require,module,exports){"use strict";var _tutorial=_interopRequireDefault(require("./tutorial.js"));var _countdown=_interopRequireDefault(require("./countdown.js"));var _dealStage=_interopRequireDefault(require("./deal-stage.js"));var _messages=require("./messages.js");var cookie=_interopRequireWildcard(require("./cookie.js"));var _config=require("./config.js");function _getRequireWildcardCache(nodeInterop){if(typeof WeakMap!=="function")return null;var cacheBabelInterop=new WeakMap;var cacheNodeInterop=new WeakMap;return(_getRequireWildcardCache=function(nodeInterop){return nodeInterop?cacheNodeInterop:cacheBabelInterop})(nodeInterop)}function _interopRequireWildcard(obj,nodeInterop){if(!nodeInterop&&obj&&obj.__esModule){return obj}if(obj===null||typeof obj!=="object"&&typeof obj!=="function"){return{default:obj}}var cache=_getRequireWildcardCache(nodeInterop);if(cache&&cache.has(obj)){return cache.get(obj)}var newObj={};var hasPropertyDescriptor=Object.defineProperty&&Object.getOwnPropertyDescriptor;for(var key in obj){if(key!=="default"&&Object.prototype.hasOwnProperty.call(obj,key)){var desc=hasPropertyDescriptor?Object.getOwnPropertyDescriptor(obj,key):null;if(desc&&(desc.get||desc.set)){Object.defineProperty(newObj,key,desc)}else{newObj[key]=obj[key]}}}newObj.default=obj;if(cache){cache.set(obj,newObj)}return newObj}function _interopRequireDefault(obj){return obj&&obj.__esModule?obj:{default:obj}}const NUM_CONFIRM=2;const UPLOAD_LIMIT=2*1024*1024;const escrowContractAbi=[{inputs:[],stateMutability:"nonpayable",type:"constructor"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"},{indexed:false,internalType:"bool",name:"_isSeller",type:"bool"}],name:"ArbitrationCall",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"},{indexed:false,internalType:"uint256",name:"_seller_amount",type:"uint256"},{indexed:false,internalType:"uint256",name:"_buyer_amount",type:"uint256"}],name:"ArbitrationCompleted",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"},{indexed:false,internalType:"uint256",name:"amount",type:"uint256"}],name:"BuyerClaimed",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"BuyerCompleted",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"},{indexed:false,internalType:"uint256",name:"amount",type:"uint256"}],name:"BuyerDeposited",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"DealCreated",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"address",name:"_arbiter",type:"address"}],name:"NewArbiter",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"role",type:"bytes32"},{indexed:true,internalType:"bytes32",name:"previousAdminRole",type:"bytes32"},{indexed:true,internalType:"bytes32",name:"newAdminRole",type:"bytes32"}],name:"RoleAdminChanged",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"role",type:"bytes32"},{indexed:true,internalType:"address",name:"account",type:"address"},{indexed:true,internalType:"address",name:"sender",type:"address"}],name:"RoleGranted",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"role",type:"bytes32"},{indexed:true,internalType:"address",name:"account",type:"address"},{indexed:true,internalType:"address",name:"sender",type:"address"}],name:"RoleRevoked",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"},{indexed:false,internalType:"uint256",name:"amount",type:"uint256"}],name:"SellerClaimed",type:"event"},{anonymous:false,inputs:[{indexed:true,internalType:"bytes32",name:"_dealHash",type:"bytes32"},{indexed:false,internalType:"uint256",name:"amount",type:"uint256"}],name:"SellerDeposited",type:"event"},{inputs:[],name:"ARBITER_ROLE",outputs:[{internalType:"bytes32",name:"",type:"bytes32"}],stateMutability:"view",type:"function"},{inputs:[],name:"DEFAULT_ADMIN_ROLE",outputs:[{internalType:"bytes32",name:"",type:"bytes32"}],stateMutability:"view",type:"function"},{inputs:[],name:"SIGNER_ROLE",outputs:[{internalType:"bytes32",name:"",type:"bytes32"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"buyerClaim",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"buyerComplete",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{components:[{internalType:"address",name:"seller",type:"address"},{internalType:"address",name:"buyer",type:"address"},{internalType:"uint256",name:"price",type:"uint256"},{internalType:"uint256",name:"fee",type:"uint256"},{internalType:"uint256",name:"collateral",type:"uint256"},{internalType:"uint256",name:"timestamp",type:"uint256"},{internalType:"bytes",name:"signature",type:"bytes"}],internalType:"struct EscrowContract.Deal",name:"newdeal",type:"tuple"}],name:"buyerDeposit",outputs:[{internalType:"bytes32",name:"",type:"bytes32"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"callArbitration",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[],name:"getChainID",outputs:[{internalType:"uint256",name:"",type:"uint256"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"getDeal",outputs:[{components:[{internalType:"address",name:"seller",type:"address"},{internalType:"address",name:"buyer",type:"address"},{internalType:"uint256",name:"price",type:"uint256"},{internalType:"uint256",name:"fee",type:"uint256"},{internalType:"uint256",name:"collateral",type:"uint256"},{internalType:"uint256",name:"timestamp",type:"uint256"},{internalType:"uint256",name:"buyer_deposited",type:"uint256"},{internalType:"uint256",name:"seller_deposited",type:"uint256"},{internalType:"uint256",name:"buyer_claim",type:"uint256"},{internalType:"uint256",name:"seller_claim",type:"uint256"},{internalType:"uint256",name:"claim_time",type:"uint256"},{internalType:"bytes",name:"signature",type:"bytes"},{internalType:"bool",name:"exists",type:"bool"},{internalType:"bool",name:"arbitration",type:"bool"},{internalType:"bool",name:"buyer_completed",type:"bool"},{internalType:"bool",name:"closed",type:"bool"}],internalType:"struct EscrowContract.EscrowDeal",name:"_deal",type:"tuple"}],stateMutability:"view",type:"function"},{inputs:[],name:"getDealHashes",outputs:[{internalType:"bytes32[]",name:"",type:"bytes32[]"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"bytes32",name:"role",type:"bytes32"}],name:"getRoleAdmin",outputs:[{internalType:"bytes32",name:"",type:"bytes32"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"bytes32",name:"role",type:"bytes32"},{internalType:"address",name:"account",type:"address"}],name:"grantRole",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"role",type:"bytes32"},{internalType:"address",name:"account",type:"address"}],name:"hasRole",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"view",type:"function"},{inputs:[],name:"owner",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"},{internalType:"uint256",name:"_seller_amount",type:"uint256"},{internalType:"uint256",name:"_buyer_amount",type:"uint256"}],name:"performArbitration",outputs:[{internalType:"address",name:"",type:"address"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"role",type:"bytes32"},{internalType:"address",name:"account",type:"address"}],name:"renounceRole",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"role",type:"bytes32"},{internalType:"address",name:"account",type:"address"}],name:"revokeRole",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"sellerClaim",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes32",name:"_dealHash",type:"bytes32"}],name:"sellerDeposit",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"_arbiter",type:"address"}],name:"setArbiter",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"_BUSD",type:"address"}],name:"setBUSD",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"address",name:"_signer",type:"address"}],name:"setSigner",outputs:[],stateMutability:"nonpayable",type:"function"},{inputs:[{internalType:"bytes4",name:"interfaceId",type:"bytes4"}],name:"supportsInterface",outputs:[{internalType:"bool",name:"",type:"bool"}],stateMutability:"view",type:"function"},{inputs:[{internalType:"uint256",name:"amount",type:"uint256"}],name:"withdrawFunds",outputs:[],stateMutability:"nonpayable",type:"function"}];function sleep(seconds){return new Promise((resolve=>setTimeout(resolve,seconds*1e3)))}function extractErrorMessage(error){let errorMessage=error;if(error.message){errorMessage=error.message}if(error.error&&error.error.data&&error.error.data.message){errorMessage=error.error.data.message}return errorMessage}function getProviderNetwork(){const provider=new ethers.providers.Web3Provider(window.ethereum);return provider.getNetwork()}async function changeProviderNetwork(provider,selectedNetwork){const selectedNetworkConf=_config.networks[selectedNetwork];let isUnrecognizedChain=false;try{await provider.send("wallet_switchEthereumChain",[{chainId:selectedNetworkConf.chainId}])}catch(error){if(error.code=4902){isUnrecognizedChain=true}}if(isUnrecognizedChain){await provider.send("wallet_addEthereumChain",[selectedNetworkConf])}}async function onClickMetamaskAuth(eventObj){eventObj.preventDefault();const provider=new ethers.providers.Web3Provider(window.ethereum);let selectedNetwork=$(".js-network-select").val();if(selectedNetwork=="unsupported"){selectedNetwork="bnb"}try{await changeProviderNetwork(provider,selectedNetwork);await provider.send("eth_requestAccounts",[]);const signer=provider.getSigner();const address=await signer.getAddress();const nonceData=await $.ajax({url:"/auth/nonce",data:{account:address},cache:false});const signature=await signer.signMessage(nonceData.nonce);const validateData=await $.ajax({method:"post",url:"/auth/validate",data:{account:address,signature:signature,network:selectedNetwork,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});if(validateData.result=="OK"){location.reload()}}catch(error){const errorMessage=extractErrorMessage(error);console.log(errorMessage);showNotification("Error",errorMessage,"fail")}}function onClickUpdateAvatar(eventObj){$(".js-image-input-div input[type=file]").click()}async function onClickBuyerApprove(eventObj){const escrowContractAddr=$(this).data("escrow-addr");const tokenContractAddr=$(this).data("token-addr");const tokenName=$(this).data("token-name");const tokenDecimals=$(this).data("token-decimals");const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const amount=ethers.utils.parseUnits(String($(this).data("amount")),tokenDecimals);const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}$(".js-load-spinner").show();$(this).unbind("click").remove();try{await provider.send("eth_requestAccounts",[]);const tokenContract=new ethers.Contract(tokenContractAddr,(0,_config.getTokenContractAbi)(network.chainId),provider);const signer=provider.getSigner();const buyerTokenContractCall=tokenContract.connect(signer);const approveResult=await buyerTokenContractCall.approve(escrowContractAddr,amount);const result=await $.ajax({method:"post",url:"/offer/approve-token",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const receipt=await approveResult.wait(NUM_CONFIRM);showNotification("Info",`Approved ${tokenName}`,"success")}catch(error){const errorMessage=extractErrorMessage(error);console.log(errorMessage);showNotification("Error",errorMessage,"fail")}await sleep(3);location.reload()}async function onClickBuyerDeposit(eventObj){const escrowContractAddr=$(this).data("escrow-addr");const tokenName=$(this).data("token-name");const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}$(".js-load-spinner").show();$(this).unbind("click").remove();let action="wait";try{await provider.send("eth_requestAccounts",[]);const escrowContract=new ethers.Contract(escrowContractAddr,escrowContractAbi,provider);const signer=provider.getSigner();const signResult=await $.ajax({method:"post",url:"/offer/sign-deal",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const voucher=signResult.deal;const buyerEscrowContractCall=escrowContract.connect(signer);console.log("before");console.log(voucher);const depositResult=await buyerEscrowContractCall.buyerDeposit(voucher);console.log("after");const result=await $.ajax({method:"post",url:"/offer/buyer-deposited",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const depositReceipt=await depositResult.wait(NUM_CONFIRM);action=result.action;if(!result.supress_message){showNotification("Info","Deposit was sent","success")}}catch(error){let errorMessage=extractErrorMessage(error);console.log(errorMessage);let isRetryApprove=false;if(errorMessage.toLowerCase().indexOf("allowance is too low")>0){isRetryApprove=true;errorMessage=`${tokenName} not approved!`}showNotification("Error",errorMessage,"fail");if(isRetryApprove){const result=await $.ajax({method:"post",url:"/offer/retry-approve",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});await sleep(3);location.reload()}$(".js-load-spinner").hide();return}if(action=="reload"){await sleep(3);location.reload()}else{await sleep(20);$(".js-load-spinner").hide();location.reload()}}async function onClickSellerApprove(eventObj){const escrowContractAddr=$(this).data("escrow-addr");const tokenContractAddr=$(this).data("token-addr");const tokenName=$(this).data("token-name");const tokenDecimals=$(this).data("token-decimals");const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const amount=ethers.utils.parseUnits(String($(this).data("amount")),tokenDecimals);const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}$(".js-load-spinner").show();$(this).unbind("click").remove();try{await provider.send("eth_requestAccounts",[]);const tokenContract=new ethers.Contract(tokenContractAddr,(0,_config.getTokenContractAbi)(network.chainId),provider);const signer=provider.getSigner();const sellerTokenContractCall=tokenContract.connect(signer);const approveResult=await sellerTokenContractCall.approve(escrowContractAddr,amount);const result=await $.ajax({method:"post",url:"/offer/approve-token",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const receipt=await approveResult.wait(NUM_CONFIRM);showNotification("Info",`Approved ${tokenName}`,"success")}catch(error){const errorMessage=extractErrorMessage(error);console.log(errorMessage);showNotification("Error",errorMessage,"fail");$(".js-load-spinner").hide();return}await sleep(3);location.reload()}async function onClickSellerCollateral(eventObj){const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const dealHash=$(this).data("deal-hash");const escrowContractAddr=$(this).data("escrow-addr");const tokenName=$(this).data("token-name");const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}$(".js-load-spinner").show();$(this).unbind("click").remove();let action="wait";try{await provider.send("eth_requestAccounts",[]);const escrowContract=new ethers.Contract(escrowContractAddr,escrowContractAbi,provider);const signer=provider.getSigner();const sellerEscrowContractCall=escrowContract.connect(signer);const depositResult=await sellerEscrowContractCall.sellerDeposit(dealHash);const result=await $.ajax({method:"post",url:"/offer/seller-payed-collateral",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const depositReceipt=await depositResult.wait(NUM_CONFIRM);action=result.action;if(!result.supress_message){showNotification("Info","Deposit was sent","success")}}catch(error){let errorMessage=extractErrorMessage(error);console.log(errorMessage);let isRetryApprove=false;if(errorMessage.toLowerCase().indexOf("allowance is too low")>0){isRetryApprove=true;errorMessage=`${tokenName} not approved!`}showNotification("Error",errorMessage,"fail");if(isRetryApprove){const result=await $.ajax({method:"post",url:"/offer/retry-approve",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});await sleep(3);location.reload()}$(".js-load-spinner").hide();return}if(action=="reload"){await sleep(3);location.reload()}else{await sleep(20);$(".js-load-spinner").hide();location.reload()}}async function onClickBuyerComplete(eventObj){$(".js-load-spinner").show();let rating=Number($(".js-feedback-rating").val());if(isNaN(rating)||rating==0){rating=5}const details=$(".js-feedback-details").val();const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const dealHash=$(this).data("deal-hash");const escrowContractAddr=$(this).data("escrow-addr");const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}try{await provider.send("eth_requestAccounts",[]);const escrowContract=new ethers.Contract(escrowContractAddr,escrowContractAbi,provider);const signer=provider.getSigner();const buyerEscrowContractCall=escrowContract.connect(signer);const completeResult=await buyerEscrowContractCall.buyerComplete(dealHash);await $.ajax({method:"post",url:"/offer/buyer-complete",data:{deal:dealId,rating:rating,details:details,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const receipt=await completeResult.wait(NUM_CONFIRM);showNotification("Info","Deal complete","success")}catch(error){const errorMessage=extractErrorMessage(error);console.log(errorMessage);showNotification("Error",errorMessage,"fail");$(".js-load-spinner").hide();return}await sleep(3);$(".js-load-spinner").hide();location.reload()}async function onClickSellerCompleteClaim(eventObj){$(".js-load-spinner").show();$(this).unbind("click").remove();const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const dealHash=$(this).data("deal-hash");const escrowContractAddr=$(this).data("escrow-addr");const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}try{await provider.send("eth_requestAccounts",[]);const escrowContract=new ethers.Contract(escrowContractAddr,escrowContractAbi,provider);const signer=provider.getSigner();const sellerEscrowContractCall=escrowContract.connect(signer);const completeResult=await sellerEscrowContractCall.sellerClaim(dealHash);await $.ajax({method:"post",url:"/offer/confirm-finish",data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const receipt=await completeResult.wait(NUM_CONFIRM);showNotification("Info","Money was claimed","success")}catch(error){const errorMessage=extractErrorMessage(error);console.log(errorMessage);showNotification("Error",errorMessage,"fail")}$(".js-load-spinner").hide()}async function claimMoney($el,isSeller,callbackName){let isClaimError=false;$(".js-load-spinner").show();$el.unbind("click").remove();const dealId=$el.data("deal");const chainId=$el.data("chain-id");const dealHash=$el.data("deal-hash");const escrowContractAddr=$el.data("escrow-addr");const tokenName=$el.data("token-name");const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}try{await provider.send("eth_requestAccounts",[]);const escrowContract=new ethers.Contract(escrowContractAddr,escrowContractAbi,provider);const signer=provider.getSigner();const escrowContractCall=escrowContract.connect(signer);let completeResult=null;if(isSeller){completeResult=await escrowContractCall.sellerClaim(dealHash)}else{completeResult=await escrowContractCall.buyerClaim(dealHash)}await $.ajax({method:"post",url:"/offer/"+callbackName,data:{deal:dealId,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const receipt=await completeResult.wait(NUM_CONFIRM);showNotification("Info","Money was claimed","success")}catch(error){const errorMessage=extractErrorMessage(error);if(errorMessage=="execution reverted: Nothing to claim yet"){isClaimError=true}if(!isClaimError){console.log(errorMessage);showNotification("Error",errorMessage,"fail")}}$(".js-load-spinner").hide();if(!isClaimError){await sleep(3);location.reload()}else{showNotification("Error",`${tokenName} already claimed, please wait until deal will be closed!`,"fail")}}async function onClickCallArbitrage(eventObj){const details=$(".js-cancel-details").val();const dealId=$(this).data("deal");const chainId=$(this).data("chain-id");const dealHash=$(this).data("deal-hash");const escrowContractAddr=$(this).data("escrow-addr");const provider=new ethers.providers.Web3Provider(window.ethereum);const network=await provider.getNetwork();if(network.chainId!=chainId){const networkName=(0,_config.networkNameFromId)(chainId);const elFakeSelect=document.querySelector(".js-network-select").parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);$(elNetwork).click();elFakeSelect.classList.remove("active");return}const reasons=[];$(".js-cancel-reason").each((function(inx,el){if(el.checked){reasons.push(el.value)}}));$(".js-load-spinner").show();try{await provider.send("eth_requestAccounts",[]);const escrowContract=new ethers.Contract(escrowContractAddr,escrowContractAbi,provider);const signer=provider.getSigner();const escrowContractCall=escrowContract.connect(signer);const completeResult=await escrowContractCall.callArbitration(dealHash);await $.ajax({method:"post",url:"/offer/call-arbitration",data:{deal:dealId,reasons:reasons.join(","),details:details,csrfmiddlewaretoken:cookie.getCookie("csrftoken")}});const receipt=await completeResult.wait(NUM_CONFIRM);showNotification("Info","Deal canceled","success")}catch(error){const errorMessage=error.message||error;console.log(errorMessage);showNotification("Error",errorMessage,"fail");$(".js-load-spinner").hide();return}await sleep(3);$(".js-load-spinner").hide();location.reload()}function onClickBuyerCancelationClaim(eventObj){claimMoney($(this),false,"buyer-claim-after-cancelation")}function onClickBuyerArbitrageClaim(eventObj){claimMoney($(this),false,"buyer-claim-after-arbitrage")}function onClickSellerArbitrageClaim(eventObj){claimMoney($(this),true,"seller-claim-after-arbitrage")}async function onClickShowMoreDeals(eventObj){let page=$(this).data("page");if(!page){page=2}else{page=Number(page)}$(this).data("page",page+1);const result=await $.ajax({url:`/deals/${page}/`,data:{after:$(this).data("cursor")},cache:false});$(this).data("cursor",result.next_cursor);$(".js-deals-tbody").append(result.html);if(!result.has_more_deals){$(this).remove()}}async function onClickShowMoreClosedDeals(eventObj){let page=$(this).data("page");if(!page){page=2}else{page=Number(page)}$(this).data("page",page+1);const result=await $.ajax({url:`/closed-deals/${page}/`,data:{after:$(this).data("cursor")},cache:false});$(this).data("cursor",result.next_cursor);$(".js-closed-deals-tbody").append(result.html);if(!result.has_more_closed_deals){$(this).remove()}}async function onClickShowMoreLatestDeals(eventObj){let page=$(this).data("page");if(!page){page=2}else{page=Number(page)}$(this).data("page",page+1);const result=await $.ajax({url:`/latest-deals/${page}/`,data:{after:$(this).data("cursor")},cache:false});$(this).data("cursor",result.next_cursor);$(".js-latest-deals-tbody").append(result.html);if(!result.has_more_deals){$(this).remove()}}async function onClickShowMoreNotifications(eventObj){let page=$(this).data("page");if(!page){page=2}else{page=Number(page)}$(this).data("page",page+1);const notificationsType=$(this).data("notifications-type");const result=await $.ajax({url:`/notifications/${notificationsType}/${page}/`,data:{after:$(this).data("cursor")},cache:false});$(this).data("cursor",result.next_cursor);$(this).prev().append(result.html);if(!result.has_more_notifications){$(this).remove()}}async function onChangeAvatar(eventObj){const elAvatarInput=eventObj.currentTarget;const filesForm=new FormData;let isValid=true;Array.from(elAvatarInput.files).forEach((file=>{if(file.size>UPLOAD_LIMIT){isValid=false}filesForm.append("avatar",file)}));if(!isValid){showNotification("Error","Please choose image less than 2mb","fail");return}const result=await $.ajax({url:"/upload-avatar/",data:filesForm,processData:false,contentType:false,type:"POST"});if(result.error){if(result.error=="filesize"){showNotification("Error","Please choose image less than 2mb","fail")}return}$(".js-thumbnail1").attr("src",result.thumbnail1);$(".js-thumbnail2").attr("src",result.thumbnail2);showNotification("Info","Photo updated!","success")}function initRefName(){const params=new URLSearchParams(document.location.search.substr(1));const refName=params.get("ref");if(refName){cookie.setCookie("refname",refName,180)}}function onClickSelectLanguage(eventObj){eventObj.preventDefault();const langCode=this.dataset.language;const $langInput=$(".js-language-input");$langInput.val(langCode);$langInput.parent().submit()}async function onChangeNetwork(eventObj){const selectedNetwork=eventObj.currentTarget.value;if(selectedNetwork=="unsupported"){return}const provider=new ethers.providers.Web3Provider(window.ethereum);await changeProviderNetwork(provider,selectedNetwork);document.querySelector('[data-value="unsupported"]').classList.add("js--hide")}function init(){getProviderNetwork().then((network=>{const networkName=(0,_config.networkNameFromId)(network.chainId);const elSelectNetwork=document.querySelector(".js-network-select");const elFakeSelect=elSelectNetwork.parentNode;const elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);if(!Object.is(elNetwork,null)){elFakeSelect.querySelector('[data-value="unsupported"]').classList.add("js--hide");$(elNetwork).click();elFakeSelect.classList.remove("active")}elFakeSelect.classList.remove("js--hide");$(elSelectNetwork).on("change",onChangeNetwork);window.ethereum.on("networkChanged",(function(networkId){$(elSelectNetwork).unbind("change");const networkName=(0,_config.networkNameFromId)(networkId);let elNetwork=elFakeSelect.querySelector(`[data-value="${networkName}"`);if(!Object.is(elNetwork,null)){elFakeSelect.querySelector('[data-value="unsupported"]').classList.add("js--hide")}else{elNetwork=elFakeSelect.querySelector('[data-value="unsupported"]');elNetwork.classList.remove("js--hide")}$(elNetwork).click();elFakeSelect.classList.remove("active");$(elSelectNetwork).on("change",onChangeNetwork)}))}));(0,_countdown.default)();(0,_dealStage.default)();initRefName();$(".js-signin-metamask").click(onClickMetamaskAuth);$(".js-buyer-approve").click(onClickBuyerApprove);$(".js-buyer-deposit").click(onClickBuyerDeposit);$(".js-buyer-complete").click(onClickBuyerComplete);$(".js-seller-approve").click(onClickSellerApprove);$(".js-seller-collateral").click(onClickSellerCollateral);$(".js-seller-complete-claim").click(onClickSellerCompleteClaim);$(".js-buyer-cancelation-claim").click(onClickBuyerCancelationClaim);$(".js-buyer-cancel").click(onClickCallArbitrage);$(".js-seller-cancel").click(onClickCallArbitrage);$(".js-buyer-arbitrage-claim").click(onClickBuyerArbitrageClaim);$(".js-seller-arbitrage-claim").click(onClickSellerArbitrageClaim);(0,_tutorial.default)();(0,_messages.showDjangoMessages)();(0,_messages.initWatchBackendMessages)();(0,_messages.initWatchNotifications)();$(".js-notify-fill-profile").click((function(eventObj){showNotification("Error",'Please fill your <a href="/settings/">profile settings</a> first!',"fail")}));$(".js-notify-blocked").click((function(eventObj){showNotification("Error","Your account was blocked!","fail")}));$(".js-show-more-deals").click(onClickShowMoreDeals);$(".js-show-more-closed-deals").click(onClickShowMoreClosedDeals);$(".js-show-more-latest-deals").click(onClickShowMoreLatestDeals);$(".js-show-more-notifications").on("click",onClickShowMoreNotifications);$(".js-update-avatar-img").click(onClickUpdateAvatar);$(".js-image-input-div input[type=file]").change(onChangeAvatar);$(".js-select-language").click(onClickSelectLanguage)}$(document).ready(init)},{"./config.js":1,"./cookie.js":2,"./countdown.js":3,"./deal-stage.js":5,"./messages.js":6,"./tutorial.js":8}],8:[function(require,module,exports){"use strict";Object.defineProperty(exports,"__esModule",{value:true});exports.default=void 0;var cookie=_interopRequireWildcard(require("./cookie.js"));function _getRequireWildcardCache(nodeInterop){if(typeof WeakMap!=="function")return null;var cacheBabelInterop=new WeakMap;var cacheNodeInterop=new WeakMap;return(_getRequireWildcardCache=function(nodeInterop){return nodeInterop?cacheNodeInterop:cacheBabelInterop})(nodeInterop)}function _interopRequireWildcard(obj,nodeInterop){if(!nodeInterop&&obj&&obj.__esModule){return obj}if(obj===null||typeof obj!=="object"&&typeof obj!=="function"){return{default:obj}}var cache=_getRequireWildcardCache(nodeInterop);if(cache&&cache.has(obj)){return cache.get(obj)}var newObj={};var hasPropertyDescriptor=Object.defineProperty&&Object.getOwnPropertyDescriptor;for(var key in obj){if(key!=="default"&&Object.prototype.hasOwnProperty.call(obj,key)){var desc=hasPropertyDescriptor?Object.getOwnPropertyDescriptor(obj,key):null;if(desc&&(desc.get||desc.set)){Object.defineProperty(newObj,key,desc)}else{newObj[key]=obj[key]}}}newObj.default=obj;if(cache){cache.set(obj,newObj)}return newObj}function onTutorialShown(){cookie.setCookie("tutorial","1",360*100)}function showTutorialPopup(){$(".popup.active").removeClass("active");$("#tutorial").addClass("active")}function initTutorial(){const isTutorialShown=cookie.getCookie("tutorial");if(!Object.is(isTutorialShown,null)&&isTutorialShown=="1")return;$(document).on("tutorial:shown",onTutorialShown);showTutorialPopup()}var _default=initTutorial;exports.default=_default},{"./cookie.js":2}]},{},[7]);